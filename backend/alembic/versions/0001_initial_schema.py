@@ -0,0 +1,153 @@
+"""Initial schema: categories, users, events, event images and tags
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import geoalchemy2
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: str | None = None
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS postgis")
+
+    op.create_table(
+        "categories",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("slug", sa.String(length=100), nullable=False),
+        sa.Column("color_hex", sa.String(length=7), nullable=False),
+        sa.Column("icon_name", sa.String(length=50), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+    )
+    op.create_index("ix_categories_slug", "categories", ["slug"], unique=True)
+
+    op.create_table(
+        "users",
+        sa.Column(
+            "id",
+            postgresql.UUID(as_uuid=True),
+            server_default=sa.func.gen_random_uuid(),
+            nullable=False,
+        ),
+        sa.Column("keycloak_id", sa.String(length=255), nullable=False),
+        sa.Column("display_name", sa.String(length=150), nullable=False),
+        sa.Column("email", sa.String(length=255), nullable=True),
+        sa.Column("avatar_url", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_users_keycloak_id", "users", ["keycloak_id"], unique=True)
+
+    op.create_table(
+        "events",
+        sa.Column(
+            "id",
+            postgresql.UUID(as_uuid=True),
+            server_default=sa.func.gen_random_uuid(),
+            nullable=False,
+        ),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("category_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "location",
+            geoalchemy2.Geography(geometry_type="POINT", srid=4326, spatial_index=False),
+            nullable=False,
+        ),
+        sa.Column("address", sa.String(length=500), nullable=True),
+        sa.Column("city", sa.String(length=150), nullable=True),
+        sa.Column("country", sa.String(length=100), nullable=True),
+        sa.Column("start_date", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("end_date", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("image_url", sa.Text(), nullable=True),
+        sa.Column("ticket_url", sa.Text(), nullable=True),
+        sa.Column("price_min", sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column("price_max", sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column("currency", sa.String(length=3), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("source", sa.String(length=50), nullable=False),
+        sa.Column("external_id", sa.String(length=255), nullable=True),
+        sa.Column("created_by", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("metadata", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.ForeignKeyConstraint(["category_id"], ["categories.id"]),
+        sa.ForeignKeyConstraint(["created_by"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("external_id"),
+    )
+    op.create_index("ix_events_title", "events", ["title"])
+    op.create_index("ix_events_category_id", "events", ["category_id"])
+    op.create_index("ix_events_city", "events", ["city"])
+    op.create_index("ix_events_start_date", "events", ["start_date"])
+    op.create_index("ix_events_status", "events", ["status"])
+    op.create_index("idx_events_location", "events", ["location"], postgresql_using="gist")
+    op.execute(
+        "CREATE INDEX ix_events_location_geom ON events "
+        "USING gist (CAST(location AS geometry(POINT,4326)))"
+    )
+
+    op.create_table(
+        "event_images",
+        sa.Column(
+            "id",
+            postgresql.UUID(as_uuid=True),
+            server_default=sa.func.gen_random_uuid(),
+            nullable=False,
+        ),
+        sa.Column("event_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("image_url", sa.Text(), nullable=False),
+        sa.Column("display_order", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.ForeignKeyConstraint(["event_id"], ["events.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_event_images_event_id", "event_images", ["event_id"])
+
+    op.create_table(
+        "event_tags",
+        sa.Column("event_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("tag", sa.String(length=50), nullable=False),
+        sa.ForeignKeyConstraint(["event_id"], ["events.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("event_id", "tag"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("event_tags")
+    op.drop_index("ix_event_images_event_id", table_name="event_images")
+    op.drop_table("event_images")
+    op.drop_table("events")
+    op.drop_index("ix_users_keycloak_id", table_name="users")
+    op.drop_table("users")
+    op.drop_index("ix_categories_slug", table_name="categories")
+    op.drop_table("categories")
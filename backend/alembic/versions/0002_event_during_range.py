@@ -0,0 +1,69 @@
+"""Add events.during tstzrange and a (location, during, category_id) GiST index
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: str | None = "0001"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Events without an end date are treated as lasting this long.  A trigger
+# (not a generated column) maintains ``during`` because timestamptz +
+# interval is not IMMUTABLE.
+DURING_EXPR = (
+    "tstzrange({row}start_date, "
+    "GREATEST({row}start_date, COALESCE({row}end_date, {row}start_date + interval '3 hours')), "
+    "'[)')"
+)
+
+
+def upgrade() -> None:
+    # btree_gist provides GiST operator classes for scalar columns (category_id).
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+
+    op.add_column("events", sa.Column("during", postgresql.TSTZRANGE(), nullable=True))
+
+    op.execute(
+        f"""
+        CREATE FUNCTION events_set_during() RETURNS trigger AS $$
+        BEGIN
+            NEW.during := {DURING_EXPR.format(row="NEW.")};
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER events_set_during
+            BEFORE INSERT OR UPDATE OF start_date, end_date ON events
+            FOR EACH ROW EXECUTE FUNCTION events_set_during()
+        """
+    )
+    op.execute(f"UPDATE events SET during = {DURING_EXPR.format(row='')}")
+
+    op.create_index(
+        "ix_events_location_during",
+        "events",
+        ["location", "during", "category_id"],
+        postgresql_using="gist",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_events_location_during", table_name="events")
+    op.execute("DROP TRIGGER events_set_during ON events")
+    op.execute("DROP FUNCTION events_set_during()")
+    op.drop_column("events", "during")
@@ -0,0 +1,86 @@
+"""Denormalize event tags into events.tags text[] with a GIN index
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: str | None = "0002"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "events",
+        sa.Column(
+            "tags",
+            postgresql.ARRAY(sa.Text()),
+            server_default=sa.text("'{}'"),
+            nullable=False,
+        ),
+    )
+
+    # event_tags stays the source of truth; every change to it rewrites the
+    # (sorted) array on the owning event and bumps updated_at.
+    op.execute(
+        """
+        CREATE FUNCTION event_tags_sync() RETURNS trigger AS $$
+        DECLARE
+            target uuid;
+        BEGIN
+            FOREACH target IN ARRAY ARRAY[
+                CASE WHEN TG_OP <> 'INSERT' THEN OLD.event_id END,
+                CASE WHEN TG_OP <> 'DELETE' THEN NEW.event_id END
+            ] LOOP
+                CONTINUE WHEN target IS NULL;
+                UPDATE events
+                   SET tags = ARRAY(
+                           SELECT tag FROM event_tags WHERE event_id = target ORDER BY tag
+                       ),
+                       updated_at = now()
+                 WHERE id = target;
+            END LOOP;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER event_tags_sync
+            AFTER INSERT OR UPDATE OR DELETE ON event_tags
+            FOR EACH ROW EXECUTE FUNCTION event_tags_sync()
+        """
+    )
+    op.execute(
+        """
+        UPDATE events e
+           SET tags = t.tags
+          FROM (
+                SELECT event_id, array_agg(tag ORDER BY tag) AS tags
+                  FROM event_tags
+                 GROUP BY event_id
+               ) t
+         WHERE t.event_id = e.id
+        """
+    )
+
+    op.create_index("ix_events_tags", "events", ["tags"], postgresql_using="gin")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_events_tags", table_name="events")
+    op.execute("DROP TRIGGER event_tags_sync ON event_tags")
+    op.execute("DROP FUNCTION event_tags_sync()")
+    op.drop_column("events", "tags")
@@ -0,0 +1,43 @@
+"""Index events.metadata for meta.<key> filters
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: str | None = "0003"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Numeric keys that accept range filters (META_RANGE_KEYS).
+RANGE_KEYS = ("min_age", "venue_capacity")
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_events_metadata",
+        "events",
+        ["metadata"],
+        postgresql_using="gin",
+        postgresql_ops={"metadata": "jsonb_path_ops"},
+    )
+    # Must match app.models.event.metadata_number() exactly to be usable.
+    for key in RANGE_KEYS:
+        op.execute(
+            f"CREATE INDEX ix_events_meta_{key} ON events "
+            f"((CASE WHEN (jsonb_typeof(metadata -> '{key}') = 'number') "
+            f"THEN CAST(metadata ->> '{key}' AS NUMERIC) END))"
+        )
+
+
+def downgrade() -> None:
+    for key in RANGE_KEYS:
+        op.drop_index(f"ix_events_meta_{key}", table_name="events")
+    op.drop_index("ix_events_metadata", table_name="events")
@@ -0,0 +1,25 @@
+"""Index events (updated_at, id) for the change stream
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: str | None = "0004"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_events_updated_at_id", "events", ["updated_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_events_updated_at_id", table_name="events")
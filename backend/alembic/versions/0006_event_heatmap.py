@@ -0,0 +1,63 @@
+"""Add the event_heatmap materialized view (cells x category x week)
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: str | None = "0005"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# (level, cell size in degrees) — mirrors app.services.heatmap.HEATMAP_LEVELS.
+LEVELS = ((0, 2.0), (1, 0.5), (2, 0.1), (3, 0.02))
+
+
+def upgrade() -> None:
+    levels = ", ".join(f"({level}, {size})" for level, size in LEVELS)
+    op.execute(
+        f"""
+        CREATE MATERIALIZED VIEW event_heatmap AS
+        SELECT g.level,
+               floor(ST_X(e.location::geometry) / g.size)::integer AS cell_x,
+               floor(ST_Y(e.location::geometry) / g.size)::integer AS cell_y,
+               e.category_id,
+               date_trunc('week', e.start_date AT TIME ZONE 'UTC')::date AS week,
+               count(*)::integer AS events
+        FROM events AS e
+        CROSS JOIN (VALUES {levels}) AS g (level, size)
+        WHERE e.status = 'active'
+        GROUP BY 1, 2, 3, 4, 5
+        WITH DATA
+        """
+    )
+    # REFRESH ... CONCURRENTLY needs a unique index over plain columns.
+    op.execute(
+        "CREATE UNIQUE INDEX ix_event_heatmap_cell "
+        "ON event_heatmap (level, cell_x, cell_y, category_id, week)"
+    )
+
+    op.create_table(
+        "event_heatmap_refresh",
+        sa.Column("id", sa.SmallInteger(), primary_key=True),
+        sa.Column("refreshed_through", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("refreshed_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.execute(
+        "INSERT INTO event_heatmap_refresh (id, refreshed_through, refreshed_at) "
+        "SELECT 1, max(updated_at), now() FROM events"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("event_heatmap_refresh")
+    op.execute("DROP MATERIALIZED VIEW event_heatmap")
@@ -0,0 +1,123 @@
+"""Add geofenced subscriptions, the notification queue and the matcher cursor
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import geoalchemy2
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: str | None = "0007"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "subscriptions",
+        sa.Column(
+            "id",
+            postgresql.UUID(as_uuid=True),
+            server_default=sa.func.gen_random_uuid(),
+            nullable=False,
+        ),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=True),
+        sa.Column(
+            "location",
+            geoalchemy2.Geography(geometry_type="POINT", srid=4326, spatial_index=False),
+            nullable=False,
+        ),
+        sa.Column("radius_m", sa.Float(), nullable=False),
+        sa.Column(
+            "area",
+            geoalchemy2.Geometry(geometry_type="POLYGON", srid=4326, spatial_index=False),
+            nullable=False,
+        ),
+        sa.Column("category_ids", postgresql.ARRAY(sa.Integer()), nullable=True),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.CheckConstraint("radius_m BETWEEN 100 AND 50000", name="ck_subscriptions_radius"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_subscriptions_user_id", "subscriptions", ["user_id"])
+    op.create_index("ix_subscriptions_area", "subscriptions", ["area"], postgresql_using="gist")
+
+    # ``area`` is the bounding box of the circle, in lng/lat; the geography
+    # buffer keeps the radius in meters at any latitude.
+    op.execute(
+        """
+        CREATE FUNCTION subscriptions_set_area() RETURNS trigger AS $$
+        BEGIN
+            NEW.area := ST_Envelope(ST_Buffer(NEW.location, NEW.radius_m)::geometry);
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER subscriptions_set_area
+            BEFORE INSERT OR UPDATE OF location, radius_m ON subscriptions
+            FOR EACH ROW EXECUTE FUNCTION subscriptions_set_area()
+        """
+    )
+
+    op.create_table(
+        "notification_queue",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("subscription_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("event_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.Column("sent_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["subscription_id"], ["subscriptions.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["event_id"], ["events.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("subscription_id", "event_id", name="uq_notification_queue_match"),
+    )
+    op.create_index("ix_notification_queue_event_id", "notification_queue", ["event_id"])
+    op.create_index(
+        "ix_notification_queue_pending",
+        "notification_queue",
+        ["id"],
+        postgresql_where=sa.text("sent_at IS NULL"),
+    )
+
+    # Start matching from the current end of the event stream: existing
+    # events are not announced.
+    op.create_table(
+        "subscription_match_cursor",
+        sa.Column("id", sa.SmallInteger(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("event_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.execute(
+        "INSERT INTO subscription_match_cursor (id, updated_at, event_id) "
+        "VALUES (1, now(), '00000000-0000-0000-0000-000000000000')"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("subscription_match_cursor")
+    op.drop_index("ix_notification_queue_pending", table_name="notification_queue")
+    op.drop_index("ix_notification_queue_event_id", table_name="notification_queue")
+    op.drop_table("notification_queue")
+    op.execute("DROP TRIGGER subscriptions_set_area ON subscriptions")
+    op.execute("DROP FUNCTION subscriptions_set_area()")
+    op.drop_index("ix_subscriptions_area", table_name="subscriptions")
+    op.drop_index("ix_subscriptions_user_id", table_name="subscriptions")
+    op.drop_table("subscriptions")
@@ -0,0 +1,54 @@
+"""Keep zero-length events in events.during as a single-instant range
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-20 09:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: str | None = "0008"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# ``[start, start)`` is the empty range, which overlaps nothing: events whose
+# end_date is not after their start_date dropped out of every date filter.
+# They now get the closed range ``[start, start]``.
+DURING_EXPR = (
+    "tstzrange({row}start_date, "
+    "GREATEST({row}start_date, COALESCE({row}end_date, {row}start_date + interval '3 hours')), "
+    "CASE WHEN {row}end_date <= {row}start_date THEN '[]' ELSE '[)' END)"
+)
+# As defined by revision 0002.
+OLD_DURING_EXPR = (
+    "tstzrange({row}start_date, "
+    "GREATEST({row}start_date, COALESCE({row}end_date, {row}start_date + interval '3 hours')), "
+    "'[)')"
+)
+
+
+def _set_during(expr: str) -> None:
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION events_set_during() RETURNS trigger AS $$
+        BEGIN
+            NEW.during := {expr.format(row="NEW.")};
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(f"UPDATE events SET during = {expr.format(row='')} WHERE end_date <= start_date")
+
+
+def upgrade() -> None:
+    _set_during(DURING_EXPR)
+
+
+def downgrade() -> None:
+    _set_during(OLD_DURING_EXPR)
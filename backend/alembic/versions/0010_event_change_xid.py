@@ -0,0 +1,86 @@
+"""Stamp events with the id of the transaction that last changed them
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-20 12:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0010"
+down_revision: str | None = "0009"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Existing rows get 0: all of their transactions are long finished.
+    op.add_column(
+        "events",
+        sa.Column("change_xid", sa.BigInteger(), server_default=sa.text("0"), nullable=False),
+    )
+    op.create_index("ix_events_change_xid_id", "events", ["change_xid", "id"])
+
+    # The matcher moves from (updated_at, id) to (change_xid, id).  Events it
+    # has not reached yet get 1, and the cursor is parked after every 0.
+    op.add_column(
+        "subscription_match_cursor",
+        sa.Column("change_xid", sa.BigInteger(), server_default=sa.text("0"), nullable=False),
+    )
+    op.execute(
+        """
+        UPDATE events SET change_xid = 1
+        FROM subscription_match_cursor c
+        WHERE (events.updated_at, events.id) > (c.updated_at, c.event_id)
+        """
+    )
+    op.execute(
+        "UPDATE subscription_match_cursor SET event_id = 'ffffffff-ffff-ffff-ffff-ffffffffffff'"
+    )
+    op.drop_column("subscription_match_cursor", "updated_at")
+
+    op.execute(
+        """
+        CREATE FUNCTION events_set_change_xid() RETURNS trigger AS $$
+        BEGIN
+            NEW.change_xid := pg_current_xact_id()::text::bigint;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER events_set_change_xid
+            BEFORE INSERT OR UPDATE ON events
+            FOR EACH ROW EXECUTE FUNCTION events_set_change_xid()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER events_set_change_xid ON events")
+    op.execute("DROP FUNCTION events_set_change_xid()")
+    # Matching resumes from now, as on a fresh install of revision 0008.
+    op.add_column(
+        "subscription_match_cursor",
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    op.alter_column("subscription_match_cursor", "updated_at", server_default=None)
+    op.execute(
+        "UPDATE subscription_match_cursor SET event_id = '00000000-0000-0000-0000-000000000000'"
+    )
+    op.drop_column("subscription_match_cursor", "change_xid")
+    op.drop_index("ix_events_change_xid_id", table_name="events")
+    op.drop_column("events", "change_xid")
@@ -0,0 +1,69 @@
+"""Record where events moved away from, for the change stream
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-20 14:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import geoalchemy2
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0011"
+down_revision: str | None = "0010"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "event_moves",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("event_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column(
+            "location",
+            geoalchemy2.Geography(geometry_type="POINT", srid=4326, spatial_index=False),
+            nullable=False,
+        ),
+        sa.Column("change_xid", sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(["event_id"], ["events.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_event_moves_event_id_change_xid", "event_moves", ["event_id", "change_xid"]
+    )
+
+    # NEW.change_xid is already stamped by the BEFORE trigger of revision 0010.
+    op.execute(
+        """
+        CREATE FUNCTION events_record_move() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO event_moves (event_id, location, change_xid)
+            VALUES (OLD.id, OLD.location, NEW.change_xid);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER events_record_move
+            AFTER UPDATE OF location ON events
+            FOR EACH ROW
+            WHEN (OLD.location::geometry IS DISTINCT FROM NEW.location::geometry)
+            EXECUTE FUNCTION events_record_move()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER events_record_move ON events")
+    op.execute("DROP FUNCTION events_record_move()")
+    op.drop_index("ix_event_moves_event_id_change_xid", table_name="event_moves")
+    op.drop_table("event_moves")
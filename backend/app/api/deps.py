@@ -1,20 +1,65 @@
 """Shared FastAPI dependencies."""
 
+import time
 from collections.abc import AsyncGenerator
+from typing import Any
 
-from fastapi import Depends
+from fastapi import Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import Settings, get_settings
-from app.database import async_session_factory
+from app.database import (
+    async_session_factory,
+    get_engine,
+    read_from_primary,
+    read_session,
+    statement_timeout_ms,
+)
 
+# Cookie carrying the time (Unix seconds) of the client's last write, for
+# read-your-writes routing.
+LAST_WRITE_COOKIE = "eventbuzz_last_write"
 
-async def get_session() -> AsyncGenerator[AsyncSession, None]:
-    """Yield a transactional async database session.
 
-    Commits on success, rolls back on error.
+def get_settings_dep() -> Settings:
+    """Return the cached application settings."""
+    return get_settings()
+
+
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """Yield a non-transactional session for read-only endpoints.
+
+    Bound to a replica when replicas are configured and healthy, otherwise
+    (or right after the client wrote, see :func:`read_your_writes`) to the
+    primary.  Statements run in autocommit mode, so there is no
+    ``BEGIN``/``COMMIT`` round trip and the pooled connection is released as
+    soon as the session closes.  A replica that fails mid-request is taken
+    out of rotation so that subsequent reads go elsewhere.
     """
-    async with async_session_factory() as session:
+    async with read_session() as session:
+        yield session
+
+
+async def get_write_session(
+    response: Response, settings: Settings = Depends(get_settings_dep)
+) -> AsyncGenerator[AsyncSession, None]:
+    """Yield a transactional, primary-pinned session for admin writes.
+
+    Commits on success, rolls back on error.  When read-your-writes
+    stickiness is enabled, the response sets :data:`LAST_WRITE_COOKIE` so
+    that this client's next reads go to the primary.  The cookie is set
+    up front because the response headers are built before the commit
+    runs; error responses do not carry it.
+    """
+    if settings.DB_READ_YOUR_WRITES_SECONDS:
+        response.set_cookie(
+            LAST_WRITE_COOKIE,
+            f"{time.time():.3f}",
+            max_age=settings.DB_READ_YOUR_WRITES_SECONDS,
+            httponly=True,
+            samesite="lax",
+        )
+    async with async_session_factory(bind=get_engine()) as session:
         try:
             yield session
             await session.commit()
@@ -23,11 +68,45 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
             raise
 
 
-def get_settings_dep() -> Settings:
-    """Return the cached application settings."""
-    return get_settings()
+async def read_your_writes(
+    request: Request, settings: Settings = Depends(get_settings_dep)
+) -> AsyncGenerator[None, None]:
+    """Send the reads of a client that wrote recently to the primary.
+
+    The client is recognised by :data:`LAST_WRITE_COOKIE`: if it is less
+    than ``DB_READ_YOUR_WRITES_SECONDS`` old, :data:`~app.database.read_from_primary`
+    is set for the request.  Other clients keep reading from the replicas.
+    """
+    try:
+        written_at = float(request.cookies.get(LAST_WRITE_COOKIE, "-inf"))
+    except ValueError:
+        written_at = float("-inf")
+    recent = time.time() - written_at < settings.DB_READ_YOUR_WRITES_SECONDS
+    token = read_from_primary.set(recent)
+    try:
+        yield
+    finally:
+        read_from_primary.reset(token)
+
+
+def statement_timeout(setting: str) -> Any:
+    """Route dependency giving the request's reads the budget in *setting* (ms).
+
+    Use in the route decorator (``dependencies=[statement_timeout(...)]``),
+    which FastAPI resolves before the endpoint's own session dependencies.
+    """
+
+    async def apply(settings: Settings = Depends(get_settings_dep)) -> AsyncGenerator[None, None]:
+        token = statement_timeout_ms.set(getattr(settings, setting) or None)
+        try:
+            yield
+        finally:
+            statement_timeout_ms.reset(token)
+
+    return Depends(apply)
 
 
 # Type aliases for use in route signatures
-SessionDep = Depends(get_session)
+ReadSessionDep = Depends(get_read_session)
+WriteSessionDep = Depends(get_write_session)
 SettingsDep = Depends(get_settings_dep)
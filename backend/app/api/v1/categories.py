@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_session
+from app.api.deps import get_read_session
 from app.models.category import Category
 from app.schemas.category import CategoryOut
 
@@ -17,7 +17,7 @@ router = APIRouter(prefix="/categories", tags=["categories"])
     summary="List all event categories",
 )
 async def list_categories(
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ) -> list[CategoryOut]:
     """Return every category, ordered by name."""
     result = await session.execute(select(Category).order_by(Category.name))
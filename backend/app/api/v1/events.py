@@ -1,26 +1,156 @@
 """Event endpoints — the primary API surface of EventBuzz."""
 
 import math
+from datetime import UTC, date, datetime, time
 from uuid import UUID
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_session
+from app.api.deps import get_read_session, get_write_session, statement_timeout
+from app.core import bubble_codec
+from app.core.http_cache import (
+    AREA_CACHE_CONTROL,
+    DETAIL_CACHE_CONTROL,
+    is_fresh,
+    make_etag,
+    not_modified,
+    query_fingerprint,
+    set_cache_headers,
+)
 from app.core.security import get_current_user, require_admin
 from app.schemas.event import (
+    BBOX_VIEWPORT_TILES,
+    MAX_HEATMAP_WEEKS,
+    MAX_MULTI_GET_IDS,
+    MAX_TAG_FILTERS,
+    BoundingBox,
+    ChangeCursor,
     EventBubble,
+    EventChanges,
     EventCreate,
     EventDetail,
+    EventFacets,
+    EventHeatmap,
     EventListItem,
     EventsNearbyParams,
     EventUpdate,
+    MetaFilters,
+    NearbyPage,
+    NearbySort,
     PaginatedResponse,
+    TagMatch,
+    TimePreset,
+    max_bbox_span,
+)
+from app.services.event_service import (
+    SEARCH_RADIUS,
+    EventService,
+    coalesced_read,
+    snap_to_grid,
+    time_window,
 )
-from app.services.event_service import EventService
+from app.services.event_stats import record_ticket_click, record_view, trending_window
+from app.services.heatmap import week_start
 
 router = APIRouter(prefix="/events", tags=["events"])
 
+VIEWPORT_DESCRIPTION = (
+    "Viewport as minLng,minLat,maxLng,maxLat (minLng > maxLng crosses the antimeridian)."
+)
+BBOX_DESCRIPTION = f"{VIEWPORT_DESCRIPTION} Replaces the lat/lng/radius filter."
+META_DESCRIPTION = (
+    "Metadata filters are passed as extra query parameters: meta.<key>=value for an exact "
+    "match, meta.<key>.gte / meta.<key>.lte for numeric ranges. Only allow-listed keys "
+    "are accepted."
+)
+WHEN_DESCRIPTION = (
+    "Named time window, cut in tz: now, today, tonight (18:00-04:00) or weekend "
+    "(Friday 18:00 to Sunday midnight). Replaces date_from/date_to."
+)
+
+
+def _zone(tz: str) -> ZoneInfo:
+    """Parse an IANA time zone name.  Raises 422 when unknown."""
+    try:
+        return ZoneInfo(tz)
+    except (ZoneInfoNotFoundError, ValueError) as exc:
+        raise HTTPException(status_code=422, detail=f"Unknown time zone: {tz}") from exc
+
+
+def _resolve_window(
+    when: TimePreset | None, tz: str, date_from: datetime | None, date_to: datetime | None
+) -> tuple[datetime | None, datetime | None]:
+    """Return the ``(date_from, date_to)`` window, expanding the *when* preset.
+
+    Raises 422 when a preset is combined with explicit dates or the range is
+    reversed.
+    """
+    if when is not None:
+        if date_from is not None or date_to is not None:
+            raise HTTPException(
+                status_code=422, detail="when cannot be combined with date_from/date_to"
+            )
+        return time_window(when, _zone(tz))
+    if date_from is not None and date_to is not None and date_from > date_to:
+        raise HTTPException(status_code=422, detail="date_from must not be after date_to")
+    return date_from, date_to
+
+
+def _tag_filters(tags: list[str] | None) -> list[str] | None:
+    """Drop blank ``tags=`` values.  Raises 422 when more than MAX_TAG_FILTERS remain."""
+    cleaned = [tag.strip() for tag in tags or [] if tag.strip()]
+    if len(cleaned) > MAX_TAG_FILTERS:
+        raise HTTPException(
+            status_code=422, detail=f"At most {MAX_TAG_FILTERS} tags can be filtered on"
+        )
+    return cleaned or None
+
+
+def _meta_filters(request: Request) -> MetaFilters:
+    """Parse the ``meta.*`` query parameters.  Raises 422 on unknown keys or bad values."""
+    try:
+        return MetaFilters.from_query(request.query_params.multi_items())
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+
+def _resolve_viewport(
+    lat: float | None, lng: float | None, bbox: str | None, zoom: int | None
+) -> BoundingBox | None:
+    """Validate the spatial query parameters and parse *bbox*.
+
+    Raises 422 when neither a center nor a bbox is given, when the bbox is
+    malformed, or when it is larger than a viewport at *zoom*.
+    """
+    if bbox is None:
+        if lat is None or lng is None:
+            raise HTTPException(
+                status_code=422,
+                detail="Provide lat and lng, or bbox",
+            )
+        return None
+    return _parse_bbox(bbox, max_bbox_span(zoom), zoom)
+
+
+def _parse_bbox(bbox: str, limit: float, zoom: int | None) -> BoundingBox:
+    """Parse *bbox*.  Raises 422 when malformed or wider than *limit* degrees."""
+    try:
+        box = BoundingBox.from_query(bbox)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=422,
+            detail="bbox must be minLng,minLat,maxLng,maxLat with valid coordinates",
+        ) from exc
+
+    if box.lng_span > limit or box.lat_span > limit:
+        raise HTTPException(
+            status_code=422,
+            detail=f"bbox too large for zoom {zoom}: max span is {limit:g} degrees",
+        )
+    return box
+
 
 # ---------------------------------------------------------------------------
 # Public read endpoints
@@ -29,75 +159,323 @@ router = APIRouter(prefix="/events", tags=["events"])
 
 @router.get(
     "/nearby",
-    response_model=PaginatedResponse[EventListItem],
+    dependencies=[statement_timeout("DB_TIMEOUT_MAP_MS")],
+    response_model=NearbyPage,
     summary="Get events near a location",
+    description=META_DESCRIPTION,
 )
 async def get_nearby_events(
-    lat: float = Query(..., ge=-90, le=90),
-    lng: float = Query(..., ge=-180, le=180),
+    request: Request,
+    response: Response,
+    lat: float | None = Query(None, ge=-90, le=90),
+    lng: float | None = Query(None, ge=-180, le=180),
     radius: float = Query(5000, ge=100, le=50000, description="Radius in meters"),
+    bbox: str | None = Query(None, description=BBOX_DESCRIPTION),
+    zoom: int | None = Query(None, ge=0, le=22, description="Map zoom level (bounds bbox size)"),
     category_id: int | None = Query(None),
     status_filter: str = Query("active", alias="status"),
-    date_from: str | None = Query(None),
-    date_to: str | None = Query(None),
+    date_from: datetime | None = Query(None, description="Events still running at this time"),
+    date_to: datetime | None = Query(None, description="Events starting at or before this time"),
+    when: TimePreset | None = Query(None, description=WHEN_DESCRIPTION),
+    tz: str = Query("UTC", description="IANA time zone used to cut the when window"),
+    tags: list[str] | None = Query(None, description="Filter by tag; repeat for several"),
+    tags_match: TagMatch = Query("any", description="Match events with any or all of the tags"),
+    min_results: int | None = Query(
+        None,
+        ge=1,
+        le=100,
+        description="Widen the radius in rings (up to 50 km) until this many events match",
+    ),
+    sort: NearbySort = Query(
+        "default", description="default (distance, or start date without a center) or trending"
+    ),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    session: AsyncSession = Depends(get_session),
-) -> PaginatedResponse[EventListItem]:
-    """Return paginated events within *radius* meters of the given point."""
+) -> NearbyPage:
+    """Return paginated events within *radius* meters of the given point, or inside *bbox*.
+
+    Identical concurrent requests share one execution of each query.  With
+    ``sort=trending`` the ETag also changes every ``TRENDING_ETAG_SECONDS``,
+    as scores move without the events changing.
+    """
+    viewport = _resolve_viewport(lat, lng, bbox, zoom)
+    if min_results is not None and viewport is not None:
+        raise HTTPException(status_code=422, detail="min_results cannot be combined with bbox")
+    date_from, date_to = _resolve_window(when, tz, date_from, date_to)
     params = EventsNearbyParams(
         lat=lat,
         lng=lng,
         radius=radius,
+        bbox=viewport,
         category_id=category_id,
         status=status_filter,
+        date_from=date_from,
+        date_to=date_to,
+        tags=_tag_filters(tags),
+        tags_match=tags_match,
+        meta=_meta_filters(request),
+        min_results=min_results,
+        sort=sort,
         page=page,
         page_size=page_size,
     )
-    items, total = await EventService.get_nearby_events(session, params)
+    if min_results is not None:
+        params.radius = await coalesced_read(EventService.expand_radius, params)
+
+    window = trending_window() if sort == "trending" else None
+    fingerprint = query_fingerprint(request)
+
+    def area_etag(last_modified: datetime | None, count: int) -> str:
+        return make_etag(
+            fingerprint, params.radius, date_from, date_to, last_modified, count, window
+        )
+
+    # The version aggregate is only worth running to answer a revalidation;
+    # otherwise the page's count query yields the same version.  No
+    # Last-Modified: the newest updated_at does not move when an event
+    # leaves the list, so only the ETag (which includes the count) validates.
+    if "if-none-match" in request.headers:
+        etag = area_etag(*await coalesced_read(EventService.get_area_version, params))
+        if is_fresh(request, etag):
+            return not_modified(etag, AREA_CACHE_CONTROL)
+
+    items, total, last_modified = await coalesced_read(EventService.get_nearby_events, params)
+    set_cache_headers(response, area_etag(last_modified, total), AREA_CACHE_CONTROL)
     pages = math.ceil(total / page_size) if total else 0
-    return PaginatedResponse(
+    return NearbyPage(
         items=items,
         total=total,
         page=page,
         page_size=page_size,
         pages=pages,
+        radius=params.radius if viewport is None else None,
     )
 
 
 @router.get(
     "/bubbles",
+    dependencies=[statement_timeout("DB_TIMEOUT_MAP_MS")],
     response_model=list[EventBubble],
     summary="Minimal event data for map markers",
+    responses={
+        200: {
+            "content": {
+                bubble_codec.COLUMNAR_JSON: {},
+                bubble_codec.MSGPACK: {},
+            },
+            "description": "Bubble list; columnar JSON or MessagePack when requested via Accept",
+        }
+    },
 )
 async def get_event_bubbles(
-    lat: float = Query(..., ge=-90, le=90),
-    lng: float = Query(..., ge=-180, le=180),
+    request: Request,
+    response: Response,
+    lat: float | None = Query(None, ge=-90, le=90),
+    lng: float | None = Query(None, ge=-180, le=180),
     radius: float = Query(5000, ge=100, le=50000),
+    bbox: str | None = Query(None, description=BBOX_DESCRIPTION),
+    zoom: int | None = Query(None, ge=0, le=22, description="Map zoom level (bounds bbox size)"),
     category_id: int | None = Query(None),
-    session: AsyncSession = Depends(get_session),
+    date_from: datetime | None = Query(None, description="Events still running at this time"),
+    date_to: datetime | None = Query(None, description="Events starting at or before this time"),
+    when: TimePreset | None = Query(None, description=WHEN_DESCRIPTION),
+    tz: str = Query("UTC", description="IANA time zone used to cut the when window"),
 ) -> list[EventBubble]:
-    """Return lightweight event bubbles for rendering map markers."""
-    return await EventService.get_event_bubbles(
-        session, lat=lat, lng=lng, radius=radius, category_id=category_id
+    """Return lightweight event bubbles for rendering map markers.
+
+    Carries an ETag over the area's data version; revalidation of an
+    unchanged area returns 304 without building the bubble list.  Clients
+    sending ``Accept: application/vnd.eventbuzz.bubbles+json`` or
+    ``application/msgpack`` get the compact columnar layout described in
+    :mod:`app.core.bubble_codec`.  Identical concurrent requests share one
+    execution of each query.
+    """
+    viewport = _resolve_viewport(lat, lng, bbox, zoom)
+    date_from, date_to = _resolve_window(when, tz, date_from, date_to)
+    media_type = bubble_codec.negotiate(request.headers.get("accept"))
+
+    filters = {
+        "lat": lat,
+        "lng": lng,
+        "radius": radius,
+        "bbox": viewport,
+        "category_id": category_id,
+        "date_from": date_from,
+        "date_to": date_to,
+    }
+    fingerprint = query_fingerprint(request)
+
+    def bubbles_etag(watermark: datetime | None, count: int) -> str:
+        return make_etag(fingerprint, media_type, date_from, date_to, watermark, count)
+
+    # As for /nearby: the version is only queried to answer a revalidation,
+    # and the ETag alone validates.
+    if "if-none-match" in request.headers:
+        etag = bubbles_etag(*await coalesced_read(EventService.get_bubbles_version, **filters))
+        if is_fresh(request, etag):
+            return not_modified(etag, AREA_CACHE_CONTROL)
+
+    bubbles, watermark, count = await coalesced_read(EventService.get_event_bubbles, **filters)
+    etag = bubbles_etag(watermark, count)
+    set_cache_headers(response, etag, AREA_CACHE_CONTROL)
+    if media_type == bubble_codec.JSON:
+        return bubbles
+    encoded = Response(bubble_codec.encode(bubbles, media_type), media_type=media_type)
+    set_cache_headers(encoded, etag, AREA_CACHE_CONTROL)
+    return encoded
+
+
+@router.get(
+    "/facets",
+    dependencies=[statement_timeout("DB_TIMEOUT_MAP_MS")],
+    response_model=EventFacets,
+    summary="Per-category and per-day event counts for an area",
+)
+async def get_event_facets(
+    response: Response,
+    lat: float | None = Query(None, ge=-90, le=90),
+    lng: float | None = Query(None, ge=-180, le=180),
+    radius: float = Query(5000, ge=100, le=50000),
+    bbox: str | None = Query(None, description=BBOX_DESCRIPTION),
+    zoom: int | None = Query(None, ge=0, le=22, description="Map zoom level (bounds bbox size)"),
+    status_filter: str = Query("active", alias="status"),
+    date_from: date | None = Query(None, description="First day of the window (default: today)"),
+    days: int = Query(7, ge=1, le=31, description="Number of daily buckets"),
+    tz: str = Query("UTC", description="IANA time zone used to cut days"),
+    session: AsyncSession = Depends(get_read_session),
+) -> EventFacets:
+    """Return category counts and a daily histogram for the filter sheet.
+
+    The center is snapped to a grid proportional to *radius* so that
+    requests from nearby positions share one cacheable result.
+    """
+    viewport = _resolve_viewport(lat, lng, bbox, zoom)
+    zone = _zone(tz)
+
+    if viewport is None:
+        lat, lng = snap_to_grid(lat, lng, radius)
+    first_day = date_from or datetime.now(zone).date()
+    window_start = datetime.combine(first_day, time.min, tzinfo=zone)
+
+    params = EventsNearbyParams(
+        lat=lat, lng=lng, radius=radius, bbox=viewport, status=status_filter
+    )
+    facets = await EventService.get_event_facets(
+        session, params, window_start=window_start, days=days, tz=tz
+    )
+    if viewport is None:
+        facets.latitude, facets.longitude = lat, lng
+    response.headers["Cache-Control"] = "public, max-age=300"
+    return facets
+
+
+@router.get(
+    "/heatmap",
+    dependencies=[statement_timeout("DB_TIMEOUT_MAP_MS")],
+    response_model=EventHeatmap,
+    summary="Event density per grid cell for a heatmap overlay",
+)
+async def get_event_heatmap(
+    response: Response,
+    bbox: str = Query(..., description=VIEWPORT_DESCRIPTION),
+    zoom: int = Query(..., ge=0, le=22, description="Map zoom level (picks the cell size)"),
+    category_id: int | None = Query(None),
+    week: date | None = Query(None, description="A day in the first week (default: this week)"),
+    weeks: int = Query(1, ge=1, le=MAX_HEATMAP_WEEKS, description="Number of weeks counted"),
+    session: AsyncSession = Depends(get_read_session),
+) -> EventHeatmap:
+    """Return event counts per grid cell, by start week (Monday to Sunday, UTC).
+
+    Served from a precomputed aggregate, so the cost does not grow with the
+    number of events; counts lag writes by up to one refresh interval.
+    Unlike the other map endpoints the viewport may span the whole world at
+    low zooms, because the cell size grows with it.
+    """
+    viewport = _parse_bbox(bbox, BBOX_VIEWPORT_TILES * 360 / 2**zoom, zoom)
+    week_from = week_start(week or datetime.now(UTC).date())
+    heatmap = await EventService.get_heatmap(
+        session,
+        bbox=viewport,
+        zoom=zoom,
+        week_from=week_from,
+        weeks=weeks,
+        category_id=category_id,
     )
+    response.headers["Cache-Control"] = "public, max-age=300"
+    return heatmap
+
+
+@router.get(
+    "/changes",
+    dependencies=[statement_timeout("DB_TIMEOUT_MAP_MS")],
+    response_model=EventChanges,
+    summary="Events created, updated or deleted since a sync token",
+)
+async def get_event_changes(
+    bbox: str = Query(..., description=BBOX_DESCRIPTION),
+    zoom: int | None = Query(None, ge=0, le=22, description="Map zoom level (bounds bbox size)"),
+    since: str | None = Query(None, description="next_token from the previous call"),
+    limit: int = Query(500, ge=1, le=1000),
+    session: AsyncSession = Depends(get_read_session),
+) -> EventChanges:
+    """Return the delta for an offline cache of *bbox*, in commit order.
+
+    Start without *since* for a full snapshot, then keep passing back
+    ``next_token``; call again immediately while ``has_more`` is true.
+    Items with ``status == "deleted"`` or ``moved_out`` must be removed from
+    the cache.
+    """
+    viewport = _resolve_viewport(None, None, bbox, zoom)
+    try:
+        cursor = ChangeCursor.decode(since) if since is not None else None
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    return await EventService.get_changes(session, bbox=viewport, since=cursor, limit=limit)
 
 
 @router.get(
     "/search",
+    dependencies=[statement_timeout("DB_TIMEOUT_SEARCH_MS")],
     response_model=PaginatedResponse[EventListItem],
     summary="Search events by text",
+    description=META_DESCRIPTION,
 )
 async def search_events(
+    request: Request,
     q: str = Query(..., min_length=1, max_length=200),
     category_id: int | None = Query(None),
+    tags: list[str] | None = Query(None, description="Filter by tag; repeat for several"),
+    tags_match: TagMatch = Query("any", description="Match events with any or all of the tags"),
+    lat: float | None = Query(None, ge=-90, le=90, description="Rank results near this point"),
+    lng: float | None = Query(None, ge=-180, le=180),
+    radius: float = Query(
+        SEARCH_RADIUS, ge=100, le=50000, description="Search radius in meters (with lat/lng)"
+    ),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ) -> PaginatedResponse[EventListItem]:
-    """Full-text search over events (falls back to ILIKE when Meilisearch is unavailable)."""
+    """Full-text search over events (falls back to ILIKE when Meilisearch is unavailable).
+
+    With *lat*/*lng*, only events within *radius* are searched and results
+    are ranked by text relevance, distance and how soon the event takes
+    place, nearest matches first among equals; items carry
+    ``distance_meters``.
+    """
+    if (lat is None) != (lng is None):
+        raise HTTPException(status_code=422, detail="Provide both lat and lng, or neither")
     items, total = await EventService.search_events(
-        session, query=q, category_id=category_id, page=page, page_size=page_size
+        session,
+        query=q,
+        category_id=category_id,
+        tags=_tag_filters(tags),
+        tags_match=tags_match,
+        meta=_meta_filters(request),
+        lat=lat,
+        lng=lng,
+        radius=radius,
+        page=page,
+        page_size=page_size,
     )
     pages = math.ceil(total / page_size) if total else 0
     return PaginatedResponse(
@@ -109,6 +487,33 @@ async def search_events(
     )
 
 
+@router.get(
+    "",
+    response_model=list[EventDetail],
+    summary="Get several events by id",
+)
+async def get_events(
+    ids: str = Query(
+        ...,
+        description=f"Comma-separated event ids (at most {MAX_MULTI_GET_IDS})",
+    ),
+    session: AsyncSession = Depends(get_read_session),
+) -> list[EventDetail]:
+    """Return the details of several events in one request, for client prefetching.
+
+    Results follow the order of *ids*; unknown ids are left out.
+    """
+    try:
+        event_ids = [UUID(part) for part in ids.split(",") if part.strip()]
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail="ids must be comma-separated UUIDs") from exc
+    if not event_ids or len(event_ids) > MAX_MULTI_GET_IDS:
+        raise HTTPException(
+            status_code=422, detail=f"Provide between 1 and {MAX_MULTI_GET_IDS} ids"
+        )
+    return await EventService.get_events_by_ids(session, event_ids)
+
+
 @router.get(
     "/{event_id}",
     response_model=EventDetail,
@@ -117,15 +522,47 @@ async def search_events(
 )
 async def get_event(
     event_id: UUID,
-    session: AsyncSession = Depends(get_session),
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_read_session),
 ) -> EventDetail:
-    """Return the full detail of a single event."""
+    """Return the full detail of a single event.
+
+    Conditional requests are checked against ``updated_at`` with a primary
+    key lookup first, so revalidating an unchanged event skips the detail
+    query and returns an empty 304.
+    """
+    if "if-none-match" in request.headers or "if-modified-since" in request.headers:
+        updated_at = await EventService.get_event_version(session, event_id)
+        if updated_at is not None:
+            etag = make_etag(event_id, updated_at)
+            if is_fresh(request, etag, updated_at):
+                record_view(event_id)
+                return not_modified(etag, DETAIL_CACHE_CONTROL, updated_at)
+
     event = await EventService.get_event_by_id(session, event_id)
     if event is None:
         raise HTTPException(status_code=404, detail="Event not found")
+    record_view(event_id)
+    etag = make_etag(event.id, event.updated_at)
+    set_cache_headers(response, etag, DETAIL_CACHE_CONTROL, event.updated_at)
     return event
 
 
+@router.post(
+    "/{event_id}/ticket-click",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Record a click on the event's ticket link",
+)
+async def record_event_ticket_click(event_id: UUID) -> None:
+    """Count a ticket click towards the event's trending score.
+
+    Buffered in memory and written in batches, so this never waits on the
+    database; clicks on unknown events are dropped when the batch is written.
+    """
+    record_ticket_click(event_id)
+
+
 # ---------------------------------------------------------------------------
 # Admin write endpoints
 # ---------------------------------------------------------------------------
@@ -139,7 +576,7 @@ async def get_event(
 )
 async def create_event(
     data: EventCreate,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_write_session),
     current_user: dict = Depends(require_admin),
 ) -> EventDetail:
     """Create an event. Requires admin role."""
@@ -155,7 +592,7 @@ async def create_event(
 async def update_event(
     event_id: UUID,
     data: EventUpdate,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_write_session),
     current_user: dict = Depends(require_admin),
 ) -> EventDetail:
     """Update an existing event. Requires admin role."""
@@ -173,7 +610,7 @@ async def update_event(
 )
 async def delete_event(
     event_id: UUID,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_write_session),
     current_user: dict = Depends(require_admin),
 ) -> None:
     """Soft-delete an event by setting status to 'deleted'. Requires admin role."""
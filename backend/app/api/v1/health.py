@@ -1,11 +1,12 @@
 """Health and readiness endpoints."""
 
-from fastapi import APIRouter, Depends
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.exc import SQLAlchemyError
 
-from app.api.deps import get_session, get_settings_dep
+from app.api.deps import get_settings_dep
 from app.config import Settings
+from app.core import metrics
+from app.database import ping_primary
 from app.schemas.common import ErrorResponse, HealthResponse, ReadyResponse
 
 router = APIRouter(prefix="/health", tags=["health"])
@@ -33,9 +34,32 @@ async def health(
     responses={503: {"model": ErrorResponse}},
     summary="Readiness probe — verifies database connectivity",
 )
-async def readiness(
-    session: AsyncSession = Depends(get_session),
-) -> ReadyResponse:
-    """Check that the database is reachable."""
-    await session.execute(text("SELECT 1"))
+async def readiness(request: Request) -> ReadyResponse:
+    """Check that startup warmup has finished and the primary database is reachable.
+
+    The primary is probed directly: a read session could be answered by a
+    replica while the primary, which every write needs, is down.
+    """
+    if not getattr(request.app.state, "db_warm", False):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database warmup in progress",
+        )
+    try:
+        await ping_primary()
+    except (SQLAlchemyError, OSError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database unreachable",
+        ) from exc
     return ReadyResponse(status="ok", database="connected")
+
+
+@router.get(
+    "/metrics",
+    response_class=Response,
+    summary="Process metrics in the Prometheus text format",
+)
+async def get_metrics() -> Response:
+    """Return this worker's counters (request coalescing, ...)."""
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
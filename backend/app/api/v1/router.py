@@ -1,15 +1,18 @@
 """Aggregate router for API v1.
 
-Includes all v1 sub-routers with their prefixes.
+Includes all v1 sub-routers with their prefixes.  Every route resolves
+:func:`~app.api.deps.read_your_writes`, so the reads of a client that has
+just written go to the primary.
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
+from app.api.deps import read_your_writes
 from app.api.v1.categories import router as categories_router
 from app.api.v1.events import router as events_router
 from app.api.v1.health import router as health_router
 
-api_v1_router = APIRouter()
+api_v1_router = APIRouter(dependencies=[Depends(read_your_writes)])
 
 api_v1_router.include_router(health_router)
 api_v1_router.include_router(events_router)
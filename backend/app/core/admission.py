@@ -0,0 +1,167 @@
+"""Admission control: keep map traffic from starving detail reads and writes.
+
+Every request is put in a route class:
+
+* ``write``  — admin writes (any non-GET/HEAD/OPTIONS method);
+* ``detail`` — ``GET /api/v1/events/{id}``;
+* ``map``    — every other read under ``/api/v1/events`` (nearby, bubbles,
+  facets, changes, search, multi-get);
+* ``other``  — health checks, categories, docs.
+
+Only ``map`` requests are gated.  Each worker admits at most ``limit`` of
+them at a time — its pool capacity (``DB_POOL_SIZE + DB_MAX_OVERFLOW``)
+minus ``ADMISSION_RESERVED_CONNECTIONS``, divided by the connections one
+read may hold (``DB_READ_FANOUT``) — and only while the read pool itself
+has more than ``reserved`` idle connections.  The second check sees every
+real checkout: detail reads, writes and background tasks use the same
+pool, so when they saturate it map reads are held back even if map slots
+are free.  Under a map-traffic peak the reserved connections thus stay
+free for detail reads and writes instead of the whole pool queueing behind
+map queries.  Excess map requests wait for a slot and an idle connection
+at most ``ADMISSION_MAX_WAIT`` seconds and are then shed: a
+conditional request (the client already holds a copy) gets ``304`` so it
+keeps showing its cached result; anything else gets ``503`` with
+``Retry-After``.  Failing fast leaves the client free to retry, while
+queueing inside the pool would only time everyone out.
+
+Metrics: ``eventbuzz_admission_requests_total{route_class, outcome}``
+(admitted, queued, shed, stale), ``eventbuzz_admission_wait_seconds_total``
+and ``eventbuzz_requests_in_flight{route_class}``.
+"""
+
+import asyncio
+import re
+import time
+from collections.abc import Callable
+
+from starlette.responses import JSONResponse, Response
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.metrics import Counter, Gauge
+
+ADMISSION_REQUESTS = Counter(
+    "eventbuzz_admission_requests_total",
+    "Gated requests by outcome: admitted at once, queued then admitted, shed, stale 304.",
+    ("route_class", "outcome"),
+)
+ADMISSION_WAIT = Counter(
+    "eventbuzz_admission_wait_seconds_total",
+    "Time gated requests spent waiting for an admission slot.",
+    ("route_class",),
+)
+IN_FLIGHT = Gauge(
+    "eventbuzz_requests_in_flight",
+    "Requests being processed, by route class.",
+    ("route_class",),
+)
+
+# How often a waiting map request re-checks the pool for idle connections.
+POOL_POLL_SECONDS = 0.01
+
+_READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+_EVENTS_PREFIX = "/api/v1/events"
+_EVENT_DETAIL = re.compile(r"^/api/v1/events/[0-9a-fA-F-]{32,36}/?$")
+
+
+def classify(method: str, path: str) -> str:
+    """Return the route class (write, detail, map or other) of a request."""
+    if method not in _READ_METHODS:
+        return "write"
+    if _EVENT_DETAIL.match(path):
+        return "detail"
+    if path == _EVENTS_PREFIX or path.startswith(f"{_EVENTS_PREFIX}/"):
+        return "map"
+    return "other"
+
+
+class AdmissionControl:
+    """ASGI middleware limiting concurrent ``map`` requests per worker.
+
+    *idle_connections* returns the idle connections left in the read pool
+    (see :func:`app.database.idle_read_connections`); a map request is only
+    admitted while it exceeds *reserved*.  Without it only *limit* applies.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        limit: int,
+        max_wait: float,
+        retry_after: int,
+        idle_connections: Callable[[], int] | None = None,
+        reserved: int = 0,
+    ) -> None:
+        self.app = app
+        self.limit = limit
+        self.max_wait = max_wait
+        self.retry_after = retry_after
+        self.idle_connections = idle_connections
+        self.reserved = reserved
+        self._slots = asyncio.Semaphore(limit)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route_class = classify(scope["method"], scope["path"])
+        gated = route_class == "map"
+        if gated and not await self._admit(route_class):
+            await self._shed(scope, route_class)(scope, receive, send)
+            return
+
+        IN_FLIGHT.inc(route_class=route_class)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            IN_FLIGHT.dec(route_class=route_class)
+            if gated:
+                self._slots.release()
+
+    def _pool_has_room(self) -> bool:
+        return self.idle_connections is None or self.idle_connections() > self.reserved
+
+    async def _admit(self, route_class: str) -> bool:
+        if not self._slots.locked() and self._pool_has_room():
+            await self._slots.acquire()  # does not block
+            ADMISSION_REQUESTS.inc(route_class=route_class, outcome="admitted")
+            return True
+
+        start = time.monotonic()
+        try:
+            async with asyncio.timeout(self.max_wait):
+                await self._slots.acquire()
+                try:
+                    while not self._pool_has_room():
+                        await asyncio.sleep(POOL_POLL_SECONDS)
+                except BaseException:
+                    self._slots.release()
+                    raise
+        except TimeoutError:
+            admitted = False
+        else:
+            admitted = True
+            ADMISSION_REQUESTS.inc(route_class=route_class, outcome="queued")
+        finally:
+            ADMISSION_WAIT.inc(time.monotonic() - start, route_class=route_class)
+        return admitted
+
+    def _shed(self, scope: Scope, route_class: str) -> Response:
+        headers = dict(scope["headers"])
+        if_none_match = headers.get(b"if-none-match")
+        if if_none_match and scope["method"] in ("GET", "HEAD"):
+            # Let the client keep its cached copy rather than show an error.
+            ADMISSION_REQUESTS.inc(route_class=route_class, outcome="stale")
+            etag = if_none_match.decode("latin-1").split(",")[0].strip()
+            return Response(
+                status_code=304,
+                headers={"ETag": etag, "Cache-Control": f"max-age={self.retry_after}"},
+            )
+
+        ADMISSION_REQUESTS.inc(route_class=route_class, outcome="shed")
+        return JSONResponse(
+            {"detail": "Server busy, retry later"},
+            status_code=503,
+            headers={"Retry-After": str(self.retry_after)},
+        )
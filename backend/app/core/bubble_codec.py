@@ -0,0 +1,115 @@
+"""Compact encodings of map bubbles, selected by the ``Accept`` header.
+
+``application/json`` (the default) is the plain list of :class:`EventBubble`
+objects.  The two compact representations share one columnar layout:
+
+* ``application/vnd.eventbuzz.bubbles+json`` — columnar JSON;
+* ``application/msgpack`` (or ``application/x-msgpack``) — the same
+  document in MessagePack, with ids packed into one binary blob.
+
+Columnar document::
+
+    {
+      "v": 1,
+      "n": 3,                           # number of bubbles
+      "scale": 100000,                  # coordinate units per degree (~1.1 m)
+      "origin": [lat0, lng0],           # in scaled units
+      "palette": [[category_id, "#RRGGBB"], ...],
+      "id": ["uuid", ...],              # msgpack: 16 * n bytes
+      "title": ["...", ...],
+      "lat": [dlat, ...],               # latitude  = (lat0 + dlat) / scale
+      "lng": [dlng, ...],               # longitude = (lng0 + dlng) / scale
+      "cat": [palette_index, ...],
+      "start": [unix_seconds, ...]
+    }
+
+Keys are sent once instead of per marker, colours once per category, and
+coordinates as small integers.
+"""
+
+import importlib.util
+import json
+from typing import Any
+
+from app.schemas.event import EventBubble
+
+JSON = "application/json"
+COLUMNAR_JSON = "application/vnd.eventbuzz.bubbles+json"
+MSGPACK = "application/msgpack"
+
+# Accepted spellings of each representation.
+BUBBLE_MEDIA_TYPES = {
+    MSGPACK: MSGPACK,
+    "application/x-msgpack": MSGPACK,
+    "application/vnd.msgpack": MSGPACK,
+    COLUMNAR_JSON: COLUMNAR_JSON,
+    JSON: JSON,
+}
+
+COORD_SCALE = 100_000
+
+# Without the msgpack package, binary requests fall back to the next choice.
+MSGPACK_AVAILABLE = importlib.util.find_spec("msgpack") is not None
+
+
+def negotiate(accept: str | None) -> str:
+    """Return the bubble media type to send for an ``Accept`` header.
+
+    The highest q-value wins (the first listed on ties); wildcards, unknown
+    types and a missing header fall back to plain JSON.
+    """
+    best, best_q = JSON, 0.0
+    for entry in (accept or "").split(","):
+        media_type, *params = (part.strip() for part in entry.split(";"))
+        chosen = BUBBLE_MEDIA_TYPES.get(media_type.lower())
+        if chosen is None or (chosen == MSGPACK and not MSGPACK_AVAILABLE):
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > best_q:
+            best, best_q = chosen, q
+    return best
+
+
+def to_columns(bubbles: list[EventBubble]) -> dict[str, Any]:
+    """Build the columnar document for *bubbles* (ids left as UUID objects)."""
+    lats = [round(b.latitude * COORD_SCALE) for b in bubbles]
+    lngs = [round(b.longitude * COORD_SCALE) for b in bubbles]
+    lat0 = min(lats, default=0)
+    lng0 = min(lngs, default=0)
+
+    palette: dict[tuple[int, str], int] = {}
+    cat = [palette.setdefault((b.category_id, b.color_hex), len(palette)) for b in bubbles]
+
+    return {
+        "v": 1,
+        "n": len(bubbles),
+        "scale": COORD_SCALE,
+        "origin": [lat0, lng0],
+        "palette": [list(key) for key in palette],
+        "id": [b.id for b in bubbles],
+        "title": [b.title for b in bubbles],
+        "lat": [lat - lat0 for lat in lats],
+        "lng": [lng - lng0 for lng in lngs],
+        "cat": cat,
+        "start": [int(b.start_date.timestamp()) for b in bubbles],
+    }
+
+
+def encode(bubbles: list[EventBubble], media_type: str) -> bytes:
+    """Serialize *bubbles* as *media_type* (``COLUMNAR_JSON`` or ``MSGPACK``)."""
+    columns = to_columns(bubbles)
+    if media_type == MSGPACK:
+        import msgpack
+
+        columns["id"] = b"".join(event_id.bytes for event_id in columns["id"])
+        return msgpack.packb(columns, use_bin_type=True)
+
+    columns["id"] = [str(event_id) for event_id in columns["id"]]
+    return json.dumps(columns, ensure_ascii=False, separators=(",", ":")).encode()
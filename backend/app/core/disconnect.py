@@ -0,0 +1,80 @@
+"""Stop work for clients that have gone away.
+
+Uvicorn keeps running a request handler after its client disconnects, so
+a slow query issued for a mobile client that lost signal runs to the end.
+:class:`CancelOnDisconnect` watches the connection during read requests
+and cancels the handler when the client leaves.  The cancellation reaches
+the database: asyncpg answers a cancelled query by sending the server a
+cancel request (what ``pg_cancel_backend`` does), and a coalesced query is
+only cancelled once none of the clients sharing it remain (see
+:mod:`app.core.single_flight`).
+
+Writes are never cancelled; they run to their commit or rollback.
+"""
+
+import asyncio
+import contextlib
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.admission import classify
+from app.core.metrics import Counter
+
+REQUESTS_CANCELLED = Counter(
+    "eventbuzz_requests_cancelled_total",
+    "Read requests cancelled because the client disconnected.",
+    ("route_class",),
+)
+
+
+class CancelOnDisconnect:
+    """ASGI middleware cancelling GET/HEAD handlers when the client disconnects."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        # Read the (normally empty) body up front; afterwards the only
+        # message left to receive is the disconnect.
+        body: list[Message] = []
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            body.append(message)
+            if not message.get("more_body"):
+                break
+
+        disconnected = asyncio.Event()
+
+        async def app_receive() -> Message:
+            if body:
+                return body.pop(0)
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def watch() -> None:
+            while (await receive())["type"] != "http.disconnect":
+                pass
+            disconnected.set()
+
+        handler = asyncio.create_task(self.app(scope, app_receive, send))
+        watcher = asyncio.create_task(watch())
+        try:
+            await asyncio.wait({handler, watcher}, return_when=asyncio.FIRST_COMPLETED)
+            if not handler.done():
+                handler.cancel()
+                REQUESTS_CANCELLED.inc(route_class=classify(scope["method"], scope["path"]))
+                with contextlib.suppress(asyncio.CancelledError):
+                    await handler
+                return
+            await handler
+        except asyncio.CancelledError:
+            handler.cancel()
+            raise
+        finally:
+            watcher.cancel()
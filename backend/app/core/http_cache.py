@@ -0,0 +1,85 @@
+"""HTTP validators and cache headers for read endpoints.
+
+Endpoints compute a cheap *version* of what they are about to return (an
+event's ``updated_at``, or the newest ``updated_at`` and row count in an
+area), turn it into a weak ETag, and answer ``304 Not Modified`` when the
+client already holds that version — before running the expensive query.
+
+Only detail responses carry ``Last-Modified``.  An area's newest
+``updated_at`` stays put when an event is deleted or moves out of it, so
+``If-Modified-Since`` alone would keep answering 304 with a stale list;
+area responses are validated by their ETag, which includes the row count
+or version.
+"""
+
+import hashlib
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response
+
+# Detail pages change rarely; area results change as events are added, so
+# they are kept fresh for a shorter time.  Clients revalidate afterwards.
+DETAIL_CACHE_CONTROL = "public, max-age=60, stale-while-revalidate=300"
+AREA_CACHE_CONTROL = "public, max-age=15, stale-while-revalidate=60"
+VARY = "Accept, Accept-Encoding"
+
+
+def make_etag(*parts: object) -> str:
+    """Return a weak ETag derived from *parts*."""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def query_fingerprint(request: Request) -> str:
+    """The request path and sorted query string, so each filter set gets its own ETag."""
+    return f"{request.url.path}?{sorted(request.query_params.multi_items())}"
+
+
+def _http_date(value: datetime) -> str:
+    return format_datetime(value.astimezone(UTC).replace(microsecond=0), usegmt=True)
+
+
+def is_fresh(request: Request, etag: str, last_modified: datetime | None = None) -> bool:
+    """Whether the client's cached copy matches *etag* (or *last_modified*).
+
+    ``If-None-Match`` takes precedence; ETags are compared weakly.
+    ``If-Modified-Since`` is only consulted when no ``If-None-Match`` was sent;
+    a date without a zone (``-0000``) is taken as UTC.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag.removeprefix("W/") in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=UTC)
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def set_cache_headers(
+    response: Response,
+    etag: str,
+    cache_control: str,
+    last_modified: datetime | None = None,
+) -> None:
+    """Attach ``ETag``/``Last-Modified``/``Cache-Control``/``Vary`` to *response*."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    response.headers["Vary"] = VARY
+    if last_modified is not None:
+        response.headers["Last-Modified"] = _http_date(last_modified)
+
+
+def not_modified(etag: str, cache_control: str, last_modified: datetime | None = None) -> Response:
+    """An empty ``304 Not Modified`` response carrying the current validators."""
+    response = Response(status_code=304)
+    set_cache_headers(response, etag, cache_control, last_modified)
+    return response
@@ -0,0 +1,53 @@
+"""Minimal in-process metrics, exposed in the Prometheus text format.
+
+Counters and gauges live in this worker's memory; with several API workers each one
+reports its own values (scrape them per worker, or sum in the query).
+"""
+
+from collections import defaultdict
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_REGISTRY: list["Counter"] = []  # gauges included
+
+
+class Counter:
+    """A monotonically increasing value per combination of label values."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: defaultdict[tuple[str, ...], float] = defaultdict(float)
+        _REGISTRY.append(self)
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        self._values[tuple(labels[name] for name in self.labelnames)] += amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(tuple(labels[name] for name in self.labelnames), 0.0)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, amount in sorted(self._values.items()):
+            pairs = zip(self.labelnames, values, strict=True)
+            labels = ",".join(f'{name}="{value}"' for name, value in pairs)
+            series = f"{self.name}{{{labels}}}" if labels else self.name
+            lines.append(f"{series} {amount:g}")
+        return lines
+
+
+class Gauge(Counter):
+    """A value that goes up and down (in-flight requests, ...)."""
+
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+
+def render() -> str:
+    """All registered metrics in the Prometheus text exposition format."""
+    return "".join(f"{line}\n" for metric in _REGISTRY for line in metric.render())
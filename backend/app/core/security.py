@@ -13,7 +13,6 @@ TODO: Replace stub with full Keycloak JWKS validation:
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import JWTError, jwt
 
 from app.config import Settings, get_settings
 
@@ -35,6 +34,10 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    # Imported lazily: python-jose pulls in the cryptography backends, which
+    # is a noticeable share of API import time and only needed on admin routes.
+    from jose import JWTError, jwt
+
     token = credentials.credentials
 
     try:
@@ -0,0 +1,88 @@
+"""Request coalescing: one execution for identical concurrent calls.
+
+When many clients ask for the same thing at the same moment (a push
+notification sends everyone to one venue), :class:`SingleFlight` runs the
+first call as a task and lets every caller that arrives with the same key
+while it is in flight await that task instead of starting its own.  The
+result — or the exception — is shared; nothing is cached once the task
+finishes.
+
+Cancellation: each caller awaits the shared task through
+:func:`asyncio.shield`, so a caller that goes away (client disconnect,
+timeout) does not cancel the work the others are waiting for.  When the
+last caller goes away, the task is cancelled.  The shared function must
+therefore not depend on any one caller's resources, such as its request's
+database session.
+
+``eventbuzz_single_flight_calls_total{group, role}`` counts executions
+(``role="leader"``) and calls served by another's execution
+(``role="follower"``); the coalescing ratio is followers / (leaders +
+followers).
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import TypeVar
+
+from app.core.metrics import Counter
+
+T = TypeVar("T")
+
+SINGLE_FLIGHT_CALLS = Counter(
+    "eventbuzz_single_flight_calls_total",
+    "Coalescable calls by group; followers shared a leader's in-flight execution.",
+    ("group", "role"),
+)
+
+
+class _Call:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task) -> None:
+        self.task = task
+        self.waiters = 0
+
+
+def _consume(task: asyncio.Task) -> None:
+    # Mark the exception as retrieved even if every caller has gone away.
+    if not task.cancelled():
+        task.exception()
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into one execution."""
+
+    def __init__(self, group: str) -> None:
+        self.group = group
+        self._calls: dict[Hashable, _Call] = {}
+
+    def __len__(self) -> int:
+        """Number of executions in flight."""
+        return len(self._calls)
+
+    def _forget(self, key: Hashable, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    async def run(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Return ``await fn()``, shared with concurrent callers passing the same *key*."""
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            call.task.add_done_callback(_consume)
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+            self._calls[key] = call
+            SINGLE_FLIGHT_CALLS.inc(group=self.group, role="leader")
+        else:
+            SINGLE_FLIGHT_CALLS.inc(group=self.group, role="follower")
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if not call.waiters and not call.task.done():
+                # Every caller was cancelled: stop the work, and let the
+                # next caller start afresh rather than join a dying task.
+                call.task.cancel()
+                self._forget(key, call)
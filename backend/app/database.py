@@ -1,52 +1,402 @@
-"""Database engine, session factory, and declarative base.
+"""Database engine, session factories, and declarative base.
 
-Provides the async engine, an async session maker, and a FastAPI
-dependency that yields a session per request.
+Provides the async engine and two session makers: a transactional one for
+writes and a read-only one whose sessions run on autocommit connections, so
+read requests never send ``BEGIN``/``COMMIT``.  The per-request FastAPI
+dependencies built on top of them live in :mod:`app.api.deps`.
+
+Reads can optionally be served by replicas: ``DATABASE_REPLICA_URLS``
+configures one engine (and pool) per replica, and :func:`get_replica_router`
+hands them out round-robin, skipping replicas that failed their last
+health check and falling back to the primary when none are usable.
+Reads of a client that has just written go to the primary instead (see
+:data:`read_from_primary`).
 """
 
-from collections.abc import AsyncGenerator
+import asyncio
+import logging
+import uuid
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from functools import cache, partial
+from typing import Any
 
+from sqlalchemy import event, text
+from sqlalchemy.exc import DBAPIError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
 from sqlalchemy.orm import DeclarativeBase
 
-from app.config import get_settings
+from app.config import Settings, get_settings
+from app.core.metrics import Counter
+
+logger = logging.getLogger(__name__)
 
 
 class Base(DeclarativeBase):
     """Declarative base for all SQLAlchemy ORM models."""
 
 
-settings = get_settings()
+def _connect_args(settings: Settings) -> dict[str, Any]:
+    """asyncpg connection arguments controlling prepared-statement caching.
+
+    Behind PgBouncer (transaction pooling) a prepared statement may land on
+    a different server connection than the one it was prepared on, so both
+    caches are disabled and every statement gets a unique name.
+    """
+    if settings.DB_PGBOUNCER_MODE:
+        return {
+            "prepared_statement_cache_size": 0,
+            "statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+    return {"prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE}
+
+
+def _engine_kwargs(settings: Settings) -> dict[str, Any]:
+    """Pool / logging options shared by the primary and replica engines."""
+    return {
+        "echo": not settings.is_production,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_pre_ping": True,
+        "connect_args": _connect_args(settings),
+    }
+
+
+async def _set_postgis_codecs(conn: Any) -> None:
+    """Register text codecs for the PostGIS types on a raw asyncpg connection.
+
+    Doing this at connect time means the per-connection type introspection
+    happens once, up front, instead of inside the first request that touches
+    a geography column.
+    """
+    for typename in ("geography", "geometry"):
+        try:
+            await conn.set_type_codec(
+                typename, schema="public", encoder=str, decoder=str, format="text"
+            )
+        except ValueError:
+            # PostGIS is not installed in this database.
+            pass
+
+
+def _register_postgis_codecs(dbapi_connection: Any, _connection_record: Any) -> None:
+    dbapi_connection.run_async(_set_postgis_codecs)
+
+
+def _reset_statement_timeout(dbapi_connection: Any, connection_record: Any, state: Any) -> None:
+    """Drop a read's session-level ``statement_timeout`` as its connection is returned.
+
+    Only connections that had a budget applied (see :func:`read_session`)
+    pay for the ``RESET``; should it fail, the pool discards the connection.
+    """
+    if connection_record is None or not connection_record.info.pop("statement_timeout", None):
+        return
+    if state.asyncio_safe and not state.terminate_only:
+        dbapi_connection.run_async(lambda conn: conn.execute("RESET statement_timeout"))
+
+
+# Every engine created so far, so that shutdown can dispose all their pools.
+_engines: list[AsyncEngine] = []
+
+
+def _create_engine(url: str, settings: Settings, **overrides: Any) -> AsyncEngine:
+    bind = create_async_engine(url, **{**_engine_kwargs(settings), **overrides})
+    event.listen(bind.sync_engine, "connect", _register_postgis_codecs)
+    event.listen(bind.sync_engine.pool, "reset", _reset_statement_timeout)
+    _engines.append(bind)
+    return bind
 
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=(not settings.is_production),
-    pool_size=settings.DB_POOL_SIZE,
-    max_overflow=settings.DB_MAX_OVERFLOW,
-    pool_recycle=settings.DB_POOL_RECYCLE,
-    pool_pre_ping=True,
-)
 
+@cache
+def get_engine() -> AsyncEngine:
+    """Return the primary engine, creating it on first use.
+
+    Construction is deferred (normally to the app lifespan) so that
+    importing this module — as every model does — stays cheap and does not
+    load the asyncpg driver.
+    """
+    return _create_engine(get_settings().DATABASE_URL, get_settings())
+
+
+@cache
+def get_background_engine() -> AsyncEngine:
+    """Return the engine of the background tasks: the primary, with a pool of its own.
+
+    Its ``DB_BACKGROUND_POOL_SIZE`` connections are counted apart from the
+    request pools (see ``app.serve.pool_budget``) and never overflow.
+    """
+    settings = get_settings()
+    return _create_engine(
+        settings.DATABASE_URL,
+        settings,
+        pool_size=settings.DB_BACKGROUND_POOL_SIZE,
+        max_overflow=0,
+    )
+
+
+@cache
+def get_replica_engines() -> tuple[AsyncEngine, ...]:
+    """Return one engine per configured read replica, creating them on first use."""
+    settings = get_settings()
+    return tuple(_create_engine(url, settings) for url in settings.DATABASE_REPLICA_URLS)
+
+
+# Sessions are bound per use: ``async_session_factory(bind=get_engine())``.
 async_session_factory = async_sessionmaker(
-    bind=engine,
     class_=AsyncSession,
     expire_on_commit=False,
 )
 
+# Read-only sessions never flush: pending ORM changes are discarded on close
+# instead of being written through an autocommit connection.
+read_session_factory = async_sessionmaker(
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autoflush=False,
+)
+
+
+@cache
+def autocommit_engine(bind: AsyncEngine) -> AsyncEngine:
+    """Return a view of *bind* whose connections run in autocommit mode.
+
+    The view shares *bind*'s pool; only the isolation level applied on
+    checkout differs, so no ``BEGIN``/``COMMIT`` round trips are issued.
+    """
+    return bind.execution_options(isolation_level="AUTOCOMMIT")
+
+
+class ReplicaRouter:
+    """Pick the engine that should serve a read.
+
+    Healthy replicas are handed out round-robin and the primary is used
+    when none are available.  A replica is taken out of rotation when a
+    query against it fails or a health probe does not answer, and is put
+    back once a later probe succeeds.
+    """
+
+    def __init__(self, primary: AsyncEngine, replicas: Sequence[AsyncEngine]) -> None:
+        self.primary = primary
+        self.replicas = replicas
+        self._cursor = 0
+        self._down: set[int] = set()
+
+    def mark_down(self, replica: AsyncEngine) -> None:
+        """Take *replica* out of rotation until a health probe succeeds."""
+        self._down.add(id(replica))
+
+    def mark_up(self, replica: AsyncEngine) -> None:
+        """Return *replica* to the rotation."""
+        self._down.discard(id(replica))
+
+    def in_rotation(self) -> list[AsyncEngine]:
+        """Return the engines :meth:`pick` currently chooses from."""
+        up = [replica for replica in self.replicas if id(replica) not in self._down]
+        return up or [self.primary]
+
+    def pick(self) -> AsyncEngine:
+        """Return the engine for the next read."""
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[self._cursor]
+            self._cursor = (self._cursor + 1) % len(self.replicas)
+            if id(replica) not in self._down:
+                return replica
+        return self.primary
+
+    async def check_health(self) -> None:
+        """Probe every replica with ``SELECT 1`` and update the rotation.
+
+        Any failure to answer, including a pool checkout timing out, takes
+        the replica out of rotation.
+        """
+        for replica in self.replicas:
+            try:
+                async with replica.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+            except (SQLAlchemyError, OSError) as exc:
+                logger.warning("Replica health check failed: %r", exc)
+                self.mark_down(replica)
+            else:
+                self.mark_up(replica)
+
+    async def run_health_checks(self, interval: float) -> None:
+        """Re-probe the replicas every *interval* seconds, forever."""
+        while True:
+            try:
+                await self.check_health()
+            except Exception:
+                logger.exception("Replica health checks failed")
+            await asyncio.sleep(interval)
+
+
+@cache
+def get_replica_router() -> ReplicaRouter:
+    """Return the process-wide router over the primary and replica engines."""
+    return ReplicaRouter(get_engine(), get_replica_engines())
+
+
+def idle_read_connections() -> int:
+    """Return how many connections the next read is sure to find idle.
+
+    Reads go round-robin to the replicas in rotation (else the primary), so
+    the next one may land on the busiest of those pools: this is the
+    smallest number of free connections among them, not their sum.  Every
+    checkout counts — map and detail reads, writes and warmup alike —
+    against ``DB_POOL_SIZE + DB_MAX_OVERFLOW`` per pool; background tasks
+    have a pool of their own (:func:`get_background_engine`).
+    """
+    settings = get_settings()
+    capacity = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    pools = [engine.pool for engine in get_replica_router().in_rotation()]
+    return min(capacity - pool.checkedout() for pool in pools)
+
+
+# Statement budget (ms) for the reads of the current request, set by the
+# ``statement_timeout`` route dependency.  None keeps the server default.
+statement_timeout_ms: ContextVar[int | None] = ContextVar("statement_timeout_ms", default=None)
+
+# True while serving a client that wrote within DB_READ_YOUR_WRITES_SECONDS,
+# set by the ``read_your_writes`` dependency: its reads bypass the replicas
+# so that it sees its own writes despite replication lag.
+read_from_primary: ContextVar[bool] = ContextVar("read_from_primary", default=False)
+
+STATEMENTS_ABORTED = Counter(
+    "eventbuzz_db_statements_aborted_total",
+    "Reads stopped by their statement_timeout, or cancelled while holding a connection.",
+    ("reason",),
+)
+
+_QUERY_CANCELED = "57014"  # SQLSTATE for statement_timeout and cancel requests
+
+
+# Set while warm_up() primes a connection: the reads of that request must all
+# run on the session they were given instead of checking out more
+# connections from a pool that warmup is already holding in full.
+reads_pinned: ContextVar[bool] = ContextVar("reads_pinned", default=False)
+
 
-async def get_session() -> AsyncGenerator[AsyncSession, None]:
-    """FastAPI dependency that provides a transactional async session.
+class StatementTimeoutError(Exception):
+    """A read exceeded its route's ``statement_timeout`` budget."""
 
-    The session is committed on success and rolled back on error.
+
+def _set_session_timeout(ms: int, session: Any, transaction: Any, connection: Any) -> None:
+    connection.exec_driver_sql(f"SET statement_timeout = {int(ms)}")
+    connection.info["statement_timeout"] = ms  # RESET on return to the pool
+
+
+def _set_local_timeout(ms: int, session: Any, transaction: Any, connection: Any) -> None:
+    connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(ms)}")
+
+
+@asynccontextmanager
+async def read_session() -> AsyncIterator[AsyncSession]:
+    """Open a read session on the engine the router picks.
+
+    While :data:`read_from_primary` is set the session uses the primary.
+    Sessions are non-transactional.  When the request has a statement
+    budget, ``SET statement_timeout`` is issued with the first query and
+    undone by a ``RESET`` as the connection goes back to the pool.  Behind
+    PgBouncer a session-level setting would leak to other clients of the
+    server connection, so there budgeted reads run in a transaction with
+    ``SET LOCAL`` instead.  A read over budget raises
+    :class:`StatementTimeoutError`.  A replica that fails while the session
+    is in use is taken out of rotation so that subsequent reads go
+    elsewhere.  If the caller is cancelled mid-query, asyncpg sends the
+    server a cancel request for the running statement.
     """
-    async with async_session_factory() as session:
+    router = get_replica_router()
+    bind = router.primary if read_from_primary.get() else router.pick()
+    timeout = statement_timeout_ms.get()
+    if timeout and get_settings().DB_PGBOUNCER_MODE:
+        session = read_session_factory(bind=bind)
+        event.listen(session.sync_session, "after_begin", partial(_set_local_timeout, timeout))
+    else:
+        session = read_session_factory(bind=autocommit_engine(bind))
+        if timeout:
+            set_timeout = partial(_set_session_timeout, timeout)
+            event.listen(session.sync_session, "after_begin", set_timeout)
+
+    async with session:
         try:
             yield session
-            await session.commit()
-        except Exception:
-            await session.rollback()
+        except asyncio.CancelledError:
+            if session.in_transaction():
+                STATEMENTS_ABORTED.inc(reason="cancelled")
+            raise
+        except DBAPIError as exc:
+            if getattr(exc.orig, "sqlstate", None) == _QUERY_CANCELED:
+                STATEMENTS_ABORTED.inc(reason="timeout")
+                raise StatementTimeoutError("Read exceeded its statement_timeout") from exc
+            if bind is not router.primary:
+                router.mark_down(bind)
+            raise
+        except OSError:
+            if bind is not router.primary:
+                router.mark_down(bind)
             raise
+
+
+async def ping_primary() -> None:
+    """Run ``SELECT 1`` on the primary, raising if it cannot be reached.
+
+    Unlike a read session, this never lands on a replica: writes, and reads
+    once every replica is down, depend on the primary alone.
+    """
+    async with autocommit_engine(get_engine()).connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def warm_up(
+    bind: AsyncEngine,
+    size: int,
+    prepare: Callable[[AsyncSession], Awaitable[None]] | None = None,
+) -> None:
+    """Fill *bind*'s pool with *size* connections and optionally prime them.
+
+    All connections are checked out at once so that the pool really grows
+    to *size*; each is then handed to *prepare* (wrapped in a read-only
+    session) so hot statements land in its prepared-statement cache.  With
+    the pool fully checked out there is nothing left to fan reads out to,
+    so :data:`reads_pinned` keeps them on the connection being primed.
+    """
+    view = autocommit_engine(bind)
+
+    async def prime(conn: AsyncConnection) -> None:
+        if prepare is None:
+            await conn.execute(text("SELECT 1"))
+            return
+        token = reads_pinned.set(True)
+        try:
+            async with read_session_factory(bind=conn) as session:
+                await prepare(session)
+        finally:
+            reads_pinned.reset(token)
+
+    results = await asyncio.gather(
+        *(view.connect().start() for _ in range(size)), return_exceptions=True
+    )
+    conns = [c for c in results if isinstance(c, AsyncConnection)]
+    try:
+        failed = [r for r in results if isinstance(r, BaseException)]
+        if failed:
+            raise failed[0]
+        await asyncio.gather(*(prime(conn) for conn in conns))
+    finally:
+        for conn in conns:
+            await conn.close()
+
+
+async def dispose_engines() -> None:
+    """Dispose the connection pools of every engine created so far."""
+    for bind in _engines:
+        await bind.dispose()
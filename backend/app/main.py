@@ -2,27 +2,143 @@
 
 Creates the app instance, configures middleware, includes routers,
 and manages the application lifespan (startup / shutdown).
+
+Importing this module is deliberately cheap: the app is built by
+:func:`create_app` (``uvicorn --factory app.main:create_app``), and the
+database engines are created in the lifespan rather than at import time.
+``app.main:app`` still works and builds the app on first access.
 """
 
+import asyncio
+import contextlib
+import logging
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+
+from app.config import Settings, get_settings
+from app.database import (
+    StatementTimeoutError,
+    dispose_engines,
+    get_engine,
+    get_replica_engines,
+    get_replica_router,
+    idle_read_connections,
+    warm_up,
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def _warm_up_pools(app: FastAPI, settings: Settings) -> None:
+    """Warm the primary and replica pools, then flag the app as ready.
+
+    Warmup only opens each request pool's own ``DB_POOL_SIZE`` connections,
+    so it stays inside the budget of ``app.serve.pool_budget``.
+    Prepared-statement priming is skipped in PgBouncer mode, where statements
+    do not outlive the transaction that prepared them.  A failed warmup is
+    logged and readiness falls back to the live database check.
+    """
+    from app.services.event_service import EventService
 
-from app.config import get_settings
-from app.database import engine
+    prepare = None if settings.DB_PGBOUNCER_MODE else EventService.prepare_hot_statements
+    binds = [get_engine(), *get_replica_engines()]
+    results = await asyncio.gather(
+        *(warm_up(bind, settings.DB_POOL_SIZE, prepare) for bind in binds),
+        return_exceptions=True,
+    )
+    for bind, result in zip(binds, results, strict=True):
+        if isinstance(result, BaseException):
+            logger.warning("Database warmup failed for %s: %r", bind.url, result)
+    app.state.db_warm = True
+
+
+async def _statement_timeout_handler(request: Request, exc: Exception) -> JSONResponse:
+    """Answer reads that ran over their route's statement_timeout with 503."""
+    return JSONResponse(
+        {"detail": "Query took too long; narrow the request"},
+        status_code=503,
+        headers={"Retry-After": str(get_settings().ADMISSION_RETRY_AFTER)},
+    )
+
+
+async def _cancel(task: asyncio.Task | None) -> None:
+    if task is not None:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage startup and shutdown lifecycle events.
 
-    On startup:  nothing extra needed — engine is created at import time.
-    On shutdown: dispose the engine connection pool gracefully.
+    On startup:  create the engines, warm the connection pools in the
+                 background (``/health/ready`` reports 503 until that
+                 finishes) and start the replica health-check loop when
+                 replicas are configured, and the bubble snapshot and
+                 heatmap refreshers, the event stats flusher and the
+                 subscription matcher when enabled.
+    On shutdown: flush buffered event stats, then dispose the primary and
+                 replica connection pools gracefully.
     """
+    settings = get_settings()
+    router = get_replica_router()
+
+    app.state.db_warm = not settings.DB_WARMUP_ON_STARTUP
+    warmup_task = None
+    if settings.DB_WARMUP_ON_STARTUP:
+        warmup_task = asyncio.create_task(_warm_up_pools(app, settings))
+
+    health_task = None
+    if router.replicas:
+        interval = settings.DB_REPLICA_HEALTH_INTERVAL
+        health_task = asyncio.create_task(router.run_health_checks(interval))
+
+    snapshot_task = None
+    if settings.BUBBLE_SNAPSHOT_ENABLED and settings.BUBBLE_SNAPSHOT_DIR:
+        from app.services.snapshot_file import run_shared_snapshot
+
+        snapshot_task = asyncio.create_task(run_shared_snapshot(settings))
+    elif settings.BUBBLE_SNAPSHOT_ENABLED:
+        from app.services.snapshot import run_snapshot_refresher
+
+        snapshot_task = asyncio.create_task(run_snapshot_refresher(settings))
+
+    heatmap_task = None
+    if settings.HEATMAP_REFRESH_ENABLED:
+        from app.services.heatmap import run_heatmap_refresher
+
+        heatmap_task = asyncio.create_task(run_heatmap_refresher(settings))
+
+    stats_task = None
+    if settings.EVENT_STATS_ENABLED:
+        from app.services.event_stats import run_stats_flusher
+
+        stats_task = asyncio.create_task(run_stats_flusher(settings))
+
+    matcher_task = None
+    if settings.SUBSCRIPTION_MATCHING_ENABLED:
+        from app.services.subscriptions import run_subscription_matcher
+
+        matcher_task = asyncio.create_task(run_subscription_matcher(settings))
+
     yield
-    # Shutdown: dispose the async engine pool
-    await engine.dispose()
+
+    await _cancel(warmup_task)
+    await _cancel(health_task)
+    await _cancel(snapshot_task)
+    await _cancel(heatmap_task)
+    await _cancel(matcher_task)
+    if stats_task is not None:
+        from app.services.event_stats import flush_pending_stats
+
+        await _cancel(stats_task)
+        await flush_pending_stats(settings)
+    # Shutdown: dispose the async engine pools
+    await dispose_engines()
 
 
 def create_app() -> FastAPI:
@@ -41,6 +157,28 @@ def create_app() -> FastAPI:
         redoc_url="/redoc" if not settings.is_production else None,
     )
 
+    # -- Cancel reads of departed clients (innermost, inside admission) --
+    if settings.CANCEL_ON_DISCONNECT:
+        from app.core.disconnect import CancelOnDisconnect
+
+        app.add_middleware(CancelOnDisconnect)
+
+    # -- Admission control (inside CORS, so shed responses carry CORS headers) --
+    if settings.ADMISSION_CONTROL_ENABLED:
+        from app.core.admission import AdmissionControl
+
+        # A list read may hold DB_READ_FANOUT connections at once.
+        capacity = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+        shared = capacity - settings.ADMISSION_RESERVED_CONNECTIONS
+        app.add_middleware(
+            AdmissionControl,
+            limit=max(1, shared // max(1, settings.DB_READ_FANOUT)),
+            max_wait=settings.ADMISSION_MAX_WAIT,
+            retry_after=settings.ADMISSION_RETRY_AFTER,
+            idle_connections=idle_read_connections,
+            reserved=settings.ADMISSION_RESERVED_CONNECTIONS,
+        )
+
     # -- CORS middleware --
     app.add_middleware(
         CORSMiddleware,
@@ -50,6 +188,8 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    app.add_exception_handler(StatementTimeoutError, _statement_timeout_handler)
+
     # -- Include API routers --
     from app.api.v1.router import api_v1_router
 
@@ -58,4 +198,10 @@ def create_app() -> FastAPI:
     return app
 
 
-app = create_app()
+def __getattr__(name: str) -> FastAPI:
+    # Module-level ``app`` for ``uvicorn app.main:app``, built on first access.
+    if name == "app":
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
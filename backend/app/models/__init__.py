@@ -7,8 +7,12 @@ All models are imported here so that Alembic's ``target_metadata``
 from app.database import Base
 from app.models.category import Category
 from app.models.event import Event
+from app.models.event_heatmap import HeatmapRefresh
 from app.models.event_image import EventImage
+from app.models.event_move import EventMove
+from app.models.event_stats import EventStats
 from app.models.event_tag import EventTag
+from app.models.subscription import Notification, Subscription, SubscriptionMatchCursor
 from app.models.user import User
 
 __all__ = [
@@ -16,6 +20,12 @@ __all__ = [
     "Category",
     "Event",
     "EventImage",
+    "EventMove",
+    "EventStats",
     "EventTag",
+    "HeatmapRefresh",
+    "Notification",
+    "Subscription",
+    "SubscriptionMatchCursor",
     "User",
 ]
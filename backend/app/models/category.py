@@ -22,8 +22,9 @@ class Category(Base):
     )
 
     # -- Relationships --
+    # Never loaded implicitly: a category can own thousands of events.
     events: Mapped[list["Event"]] = relationship(  # noqa: F821
-        "Event", back_populates="category", lazy="selectin"
+        "Event", back_populates="category", lazy="raise"
     )
 
     def __repr__(self) -> str:
@@ -3,18 +3,25 @@
 import uuid
 from datetime import datetime
 
-from geoalchemy2 import Geography
+from geoalchemy2 import Geography, Geometry
 from sqlalchemy import (
+    BigInteger,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
     Text,
+    case,
+    cast,
     func,
+    literal,
+    text,
 )
-from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSTZRANGE, UUID, Range
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.schema import FetchedValue
 
 from app.database import Base
 from app.models.category import Category  # noqa: F401 — keep for relationship resolution
@@ -59,6 +66,15 @@ class Event(Base):
     end_date: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True), nullable=True
     )
+    # ``[start_date, end_date)`` — maintained by the ``events_set_during``
+    # trigger; open-ended events are treated as lasting three hours, and
+    # events ending at (or before) their start get ``[start_date, start_date]``.
+    during: Mapped[Range[datetime] | None] = mapped_column(
+        TSTZRANGE,
+        nullable=True,
+        server_default=FetchedValue(),
+        server_onupdate=FetchedValue(),
+    )
 
     # -- Media / links --
     image_url: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -81,6 +97,16 @@ class Event(Base):
         UUID(as_uuid=True), ForeignKey("users.id"), nullable=True
     )
 
+    # -- Tags --
+    # Read-side copy of ``event_tags`` (sorted), maintained by the
+    # ``event_tags_sync`` trigger; write tags through ``tag_links``.
+    tags: Mapped[list[str]] = mapped_column(
+        ARRAY(Text),
+        nullable=False,
+        server_default=text("'{}'"),
+        server_onupdate=FetchedValue(),
+    )
+
     # -- Flexible data --
     metadata_: Mapped[dict | None] = mapped_column(
         "metadata", JSONB, nullable=True, default=dict
@@ -96,13 +122,22 @@ class Event(Base):
         onupdate=func.now(),
         nullable=False,
     )
+    # Id of the transaction that last wrote the row — set by the
+    # ``events_set_change_xid`` trigger.  Unlike ``updated_at`` (the time the
+    # transaction started), it orders changes safely: see ``change_horizon``.
+    change_xid: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        server_default=text("0"),
+        server_onupdate=FetchedValue(),
+    )
 
     # -- Relationships --
     category: Mapped["Category"] = relationship(
         "Category", back_populates="events", lazy="selectin"
     )
     creator: Mapped["User | None"] = relationship(
-        "User", back_populates="events", lazy="selectin"
+        "User", back_populates="events", lazy="raise"
     )
     images: Mapped[list["EventImage"]] = relationship(
         "EventImage",
@@ -111,11 +146,79 @@ class Event(Base):
         cascade="all, delete-orphan",
         order_by="EventImage.display_order",
     )
-    tags: Mapped[list["EventTag"]] = relationship(
+    # Write-only: never loaded, so reads take ``tags`` from the array column.
+    tag_links: Mapped[list["EventTag"]] = relationship(
         "EventTag",
-        lazy="selectin",
+        lazy="raise",
         cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
     def __repr__(self) -> str:
         return f"<Event {self.title!r} ({self.id})>"
+
+
+# Planar GiST index backing viewport (bbox) queries: ``location::geometry && envelope``.
+# The geography index created for ``location`` cannot serve that expression.
+Index(
+    "ix_events_location_geom",
+    cast(Event.location, Geometry(geometry_type="POINT", srid=4326)),
+    postgresql_using="gist",
+)
+
+# Spatio-temporal GiST index (needs btree_gist for ``category_id``): one index
+# scan answers "near here, during this window, in this category".
+Index(
+    "ix_events_location_during",
+    Event.location,
+    Event.during,
+    Event.category_id,
+    postgresql_using="gist",
+)
+
+# Tag filters: ``tags && ARRAY[...]`` (any) and ``tags @> ARRAY[...]`` (all).
+Index("ix_events_tags", Event.tags, postgresql_using="gin")
+
+# ``max(updated_at)`` versions and watermarks, newest first.
+Index("ix_events_updated_at_id", Event.updated_at, Event.id)
+
+# Keyset pagination of /events/changes and the subscription matcher:
+# ``(change_xid, id) > (...)``.
+Index("ix_events_change_xid_id", Event.change_xid, Event.id)
+
+
+def change_horizon():
+    """Lowest transaction id that may still be running, as of this statement.
+
+    Every change with ``change_xid`` below it has committed (or rolled back)
+    and is visible, and no later commit can add one: a follower that reads
+    ``(change_xid, id) > cursor AND change_xid < change_horizon()`` in order
+    never skips a change, however long the writing transaction ran.  Changes
+    wait until every transaction that started before them has finished.
+    """
+    snapshot_xmin = func.pg_snapshot_xmin(func.pg_current_snapshot())
+    return cast(cast(snapshot_xmin, Text), BigInteger)
+
+
+def metadata_number(key: str):
+    """``metadata ->> key`` as numeric, or NULL when the value is not a JSON number.
+
+    The key is inlined (not bound) so that queries render the exact
+    expression of the ``ix_events_meta_<key>`` indexes below.
+    """
+    value = Event.metadata_.op("->")(literal(key, literal_execute=True))
+    as_text = Event.metadata_.op("->>")(literal(key, literal_execute=True))
+    is_number = func.jsonb_typeof(value) == literal("number", literal_execute=True)
+    return case((is_number, cast(as_text, Numeric)))
+
+
+# ``meta.<key>=value`` filters compile to ``metadata @> '{"key": value}'``.
+Index(
+    "ix_events_metadata",
+    Event.metadata_,
+    postgresql_using="gin",
+    postgresql_ops={"metadata": "jsonb_path_ops"},
+)
+# Range filters on the hottest numeric keys (``META_RANGE_KEYS``).
+Index("ix_events_meta_min_age", metadata_number("min_age"))
+Index("ix_events_meta_venue_capacity", metadata_number("venue_capacity"))
@@ -0,0 +1,41 @@
+"""Event density heatmap — a materialized aggregate of active events.
+
+``event_heatmap`` is a materialized view (migration 0006) counting active
+events per grid cell, category and ISO week at several cell sizes.  It is
+not part of ``Base.metadata``; queries use the lightweight :data:`event_heatmap`
+table construct.  :class:`HeatmapRefresh` records how far the view has
+been refreshed.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import Date, DateTime, Integer, SmallInteger, column, table
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+event_heatmap = table(
+    "event_heatmap",
+    column("level", SmallInteger),
+    column("cell_x", Integer),
+    column("cell_y", Integer),
+    column("category_id", Integer),
+    column("week", Date),
+    column("events", Integer),
+)
+
+
+class HeatmapRefresh(Base):
+    """Single-row bookkeeping for ``event_heatmap`` refreshes."""
+
+    __tablename__ = "event_heatmap_refresh"
+
+    id: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    # Largest events.updated_at covered by the last refresh.
+    refreshed_through: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    refreshed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<HeatmapRefresh through={self.refreshed_through}>"
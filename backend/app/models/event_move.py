@@ -0,0 +1,40 @@
+"""EventMove model — where an event was before it was moved.
+
+Written by the ``events_record_move`` trigger whenever an event's location
+changes, so the change stream can tell a client caching the old area that
+the event has left it.
+"""
+
+import uuid
+
+from geoalchemy2 import Geography
+from sqlalchemy import BigInteger, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class EventMove(Base):
+    __tablename__ = "event_moves"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    event_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("events.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    # The location the event moved away from.
+    location: Mapped[str] = mapped_column(
+        Geography(geometry_type="POINT", srid=4326, spatial_index=False),
+        nullable=False,
+    )
+    # ``events.change_xid`` of the move.
+    change_xid: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<EventMove event_id={self.event_id} xid={self.change_xid}>"
+
+
+# The change stream probes the moves of one event since the client's cursor.
+Index("ix_event_moves_event_id_change_xid", EventMove.event_id, EventMove.change_xid)
@@ -0,0 +1,34 @@
+"""EventStats model — per-event popularity counters and trending score."""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Float, ForeignKey, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class EventStats(Base):
+    """Written only by the buffered flusher in :mod:`app.services.event_stats`."""
+
+    __tablename__ = "event_stats"
+
+    event_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("events.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    views: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+    ticket_clicks: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0, server_default="0"
+    )
+    # Forward-decayed popularity, in log space; see app.services.event_stats.
+    trending: Mapped[float] = mapped_column(Float, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f"<EventStats event_id={self.event_id} views={self.views}>"
@@ -0,0 +1,135 @@
+"""Subscription model — a user's saved place, alerted about new events nearby.
+
+Matching is done in batches by :mod:`app.services.subscriptions`; matches
+are queued in ``notification_queue`` for delivery.
+"""
+
+import uuid
+from datetime import datetime
+
+from geoalchemy2 import Geography, Geometry
+from sqlalchemy import (
+    BigInteger,
+    CheckConstraint,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    SmallInteger,
+    String,
+    UniqueConstraint,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.schema import FetchedValue
+
+from app.database import Base
+
+SUBSCRIPTION_MIN_RADIUS = 100
+SUBSCRIPTION_MAX_RADIUS = 50_000
+
+
+class Subscription(Base):
+    __tablename__ = "subscriptions"
+    __table_args__ = (
+        CheckConstraint(
+            f"radius_m BETWEEN {SUBSCRIPTION_MIN_RADIUS} AND {SUBSCRIPTION_MAX_RADIUS}",
+            name="ck_subscriptions_radius",
+        ),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+        server_default=func.gen_random_uuid(),
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    name: Mapped[str | None] = mapped_column(String(100), nullable=True)
+
+    # -- Circle --
+    location: Mapped[str] = mapped_column(
+        Geography(geometry_type="POINT", srid=4326, spatial_index=False),
+        nullable=False,
+    )
+    radius_m: Mapped[float] = mapped_column(Float, nullable=False)
+    # Bounding box of the circle — maintained by the ``subscriptions_set_area``
+    # trigger.  Its GiST index finds the subscriptions around an event point.
+    area: Mapped[str] = mapped_column(
+        Geometry(geometry_type="POLYGON", srid=4326, spatial_index=False),
+        nullable=False,
+        server_default=FetchedValue(),
+        server_onupdate=FetchedValue(),
+    )
+
+    # ``None`` matches events of every category.
+    category_ids: Mapped[list[int] | None] = mapped_column(ARRAY(Integer), nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f"<Subscription {self.id} user={self.user_id} radius={self.radius_m:g}m>"
+
+
+Index("ix_subscriptions_area", Subscription.area, postgresql_using="gist")
+
+
+class Notification(Base):
+    """A match waiting in (or delivered from) the notification queue."""
+
+    __tablename__ = "notification_queue"
+    __table_args__ = (
+        # An event updated again is not announced twice to the same subscription.
+        UniqueConstraint("subscription_id", "event_id", name="uq_notification_queue_match"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    subscription_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("subscriptions.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    event_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("events.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<Notification {self.id} event={self.event_id}>"
+
+
+# Delivery polls the pending rows in queue order.
+Index(
+    "ix_notification_queue_pending",
+    Notification.id,
+    postgresql_where=text("sent_at IS NULL"),
+)
+
+
+class SubscriptionMatchCursor(Base):
+    """Single-row position of the matcher in the ``(change_xid, id)`` event stream."""
+
+    __tablename__ = "subscription_match_cursor"
+
+    id: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    change_xid: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default=text("0"))
+    event_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<SubscriptionMatchCursor {self.change_xid} {self.event_id}>"
@@ -37,8 +37,9 @@ class User(Base):
     )
 
     # -- Relationships --
+    # Never loaded implicitly: a user can own thousands of events.
     events: Mapped[list["Event"]] = relationship(  # noqa: F821
-        "Event", back_populates="creator", lazy="selectin"
+        "Event", back_populates="creator", lazy="raise"
     )
 
     def __repr__(self) -> str:
@@ -4,16 +4,58 @@ Includes minimal (bubble), list, detail, create/update, query-param,
 and generic paginated-response models.
 """
 
-from datetime import datetime
-from typing import Generic, TypeVar
+import base64
+import json
+from datetime import date, datetime
+from typing import Generic, Literal, TypeVar
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 from app.schemas.category import CategoryOut
 
 T = TypeVar("T")
 
+# Viewport (bbox) limits: a phone screen shows about four to six 256 px map
+# tiles across, so a box wider than BBOX_VIEWPORT_TILES tiles at the
+# requested zoom is not a viewport.  Zooms below BBOX_MIN_ZOOM are clamped so
+# marker queries never cover more than a region.
+BBOX_VIEWPORT_TILES = 6
+BBOX_MIN_ZOOM = 8
+BBOX_DEFAULT_ZOOM = 11
+
+# Named time windows accepted by ``when=`` on the list and map endpoints.
+TimePreset = Literal["now", "today", "tonight", "weekend"]
+
+# How ``tags=`` filters combine: events with any of the tags, or with all of them.
+TagMatch = Literal["any", "all"]
+
+# ``/events/nearby`` ordering: by distance (or start date without a center),
+# or by the trending score.
+NearbySort = Literal["default", "trending"]
+MAX_TAG_FILTERS = 10
+
+# Largest ``GET /events?ids=...`` batch.
+MAX_MULTI_GET_IDS = 50
+
+# Longest ``GET /events/heatmap`` window, in weeks.
+MAX_HEATMAP_WEEKS = 12
+
+# ``meta.<key>=value`` filters: metadata keys that may be filtered on, with the
+# JSON type of their values.  Keys in META_RANGE_KEYS also accept
+# ``meta.<key>.gte`` / ``meta.<key>.lte`` and have a numeric expression index
+# (see ``app.models.event``).
+META_FILTER_KEYS: dict[str, type] = {
+    "min_age": int,
+    "venue_capacity": int,
+    "wheelchair_accessible": bool,
+    "family_friendly": bool,
+    "indoor": bool,
+    "language": str,
+}
+META_RANGE_KEYS = ("min_age", "venue_capacity")
+META_RANGE_OPS = ("gte", "lte")
+
 
 # ---------------------------------------------------------------------------
 # Read schemas
@@ -34,6 +76,12 @@ class EventBubble(BaseModel):
     start_date: datetime
 
 
+class EventTagOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    tag: str
+
+
 class EventListItem(BaseModel):
     """Card-level representation for event lists."""
 
@@ -55,9 +103,62 @@ class EventListItem(BaseModel):
     price_max: float | None = None
     currency: str = "USD"
     status: str = "active"
+    tags: list[EventTagOut] = []
     distance_meters: float | None = None
 
 
+class EventChange(EventListItem):
+    """A created, updated, moved or soft-deleted event in a delta sync.
+
+    ``status == "deleted"`` or ``moved_out`` tells the client to drop its
+    cached copy.
+    """
+
+    updated_at: datetime
+    moved_out: bool = Field(False, description="The event moved out of the synced area")
+
+
+class CategoryFacet(BaseModel):
+    """Number of matching events in one category."""
+
+    category_id: int
+    count: int
+
+
+class DateFacet(BaseModel):
+    """Number of matching events starting on one (local) day."""
+
+    date: date
+    count: int
+
+
+class EventFacets(BaseModel):
+    """Per-category and per-day event counts for an area and time window."""
+
+    total: int
+    categories: list[CategoryFacet]
+    dates: list[DateFacet]
+    latitude: float | None = Field(None, description="Snapped search center latitude")
+    longitude: float | None = Field(None, description="Snapped search center longitude")
+
+
+class HeatmapCell(BaseModel):
+    """Number of events in one grid cell, located by the cell center."""
+
+    latitude: float
+    longitude: float
+    count: int
+
+
+class EventHeatmap(BaseModel):
+    """Event density over a viewport, from the precomputed heatmap aggregate."""
+
+    cell_size: float = Field(..., description="Cell edge length in degrees")
+    week_from: date = Field(..., description="Monday of the first week counted")
+    weeks: int
+    cells: list[HeatmapCell]
+
+
 class EventImageOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -66,19 +167,12 @@ class EventImageOut(BaseModel):
     display_order: int
 
 
-class EventTagOut(BaseModel):
-    model_config = ConfigDict(from_attributes=True)
-
-    tag: str
-
-
 class EventDetail(EventListItem):
-    """Full event detail — extends list item with tags, images, and metadata."""
+    """Full event detail — extends list item with images and metadata."""
 
     ticket_url: str | None = None
     source: str = "manual"
     external_id: str | None = None
-    tags: list[EventTagOut] = []
     images: list[EventImageOut] = []
     metadata_: dict | None = Field(None, alias="metadata_")
     created_at: datetime
@@ -136,26 +230,171 @@ class EventUpdate(BaseModel):
 
 
 # ---------------------------------------------------------------------------
-# Query-param schema
+# Query-param schemas
 # ---------------------------------------------------------------------------
 
 
+def max_bbox_span(zoom: int | None) -> float:
+    """Largest longitude/latitude span, in degrees, accepted at *zoom*."""
+    zoom = BBOX_DEFAULT_ZOOM if zoom is None else max(zoom, BBOX_MIN_ZOOM)
+    return BBOX_VIEWPORT_TILES * 360 / 2**zoom
+
+
+class BoundingBox(BaseModel):
+    """Map viewport given as ``minLng,minLat,maxLng,maxLat``.
+
+    ``min_lng > max_lng`` denotes a box that crosses the antimeridian.
+    """
+
+    min_lng: float = Field(..., ge=-180, le=180)
+    min_lat: float = Field(..., ge=-90, le=90)
+    max_lng: float = Field(..., ge=-180, le=180)
+    max_lat: float = Field(..., ge=-90, le=90)
+
+    @model_validator(mode="after")
+    def _check_lat_order(self) -> "BoundingBox":
+        if self.min_lat > self.max_lat:
+            raise ValueError("minLat must not exceed maxLat")
+        return self
+
+    @classmethod
+    def from_query(cls, value: str) -> "BoundingBox":
+        """Parse the ``bbox`` query parameter.  Raises ``ValueError`` when malformed."""
+        parts = value.split(",")
+        if len(parts) != 4:
+            raise ValueError("bbox must be minLng,minLat,maxLng,maxLat")
+        min_lng, min_lat, max_lng, max_lat = (float(p) for p in parts)
+        return cls(min_lng=min_lng, min_lat=min_lat, max_lng=max_lng, max_lat=max_lat)
+
+    @property
+    def crosses_antimeridian(self) -> bool:
+        return self.min_lng > self.max_lng
+
+    @property
+    def lng_span(self) -> float:
+        span = self.max_lng - self.min_lng
+        return span + 360 if span < 0 else span
+
+    @property
+    def lat_span(self) -> float:
+        return self.max_lat - self.min_lat
+
+    def envelopes(self) -> list[tuple[float, float, float, float]]:
+        """Return ``(min_lng, min_lat, max_lng, max_lat)`` boxes that do not cross ±180°."""
+        if self.crosses_antimeridian:
+            return [
+                (self.min_lng, self.min_lat, 180.0, self.max_lat),
+                (-180.0, self.min_lat, self.max_lng, self.max_lat),
+            ]
+        return [(self.min_lng, self.min_lat, self.max_lng, self.max_lat)]
+
+
+def _parse_meta_value(key: str, raw: str) -> str | int | bool:
+    kind = META_FILTER_KEYS[key]
+    if kind is bool:
+        if raw.lower() not in ("true", "false"):
+            raise ValueError(f"meta.{key} must be true or false")
+        return raw.lower() == "true"
+    if kind is int:
+        try:
+            return int(raw)
+        except ValueError:
+            raise ValueError(f"meta.{key} must be an integer") from None
+    return raw
+
+
+class MetaFilters(BaseModel):
+    """Parsed ``meta.*`` query parameters.
+
+    ``equals`` holds exact matches (one containment document); ``ranges``
+    holds ``(key, op, bound)`` tuples for numeric keys.
+    """
+
+    equals: dict[str, str | int | bool] = {}
+    ranges: list[tuple[str, str, float]] = []
+
+    @classmethod
+    def from_query(cls, items: list[tuple[str, str]]) -> "MetaFilters":
+        """Collect ``meta.*`` pairs from query *items*.  Raises ``ValueError`` when invalid."""
+        equals: dict[str, str | int | bool] = {}
+        ranges: list[tuple[str, str, float]] = []
+        for name, raw in items:
+            if not name.startswith("meta."):
+                continue
+            key, _, op = name.removeprefix("meta.").partition(".")
+            if key not in META_FILTER_KEYS:
+                raise ValueError(f"Unknown metadata filter: meta.{key}")
+            if not op:
+                equals[key] = _parse_meta_value(key, raw)
+                continue
+            if key not in META_RANGE_KEYS or op not in META_RANGE_OPS:
+                raise ValueError(f"Unsupported metadata filter: {name}")
+            try:
+                ranges.append((key, op, float(raw)))
+            except ValueError:
+                raise ValueError(f"{name} must be a number") from None
+        return cls(equals=equals, ranges=ranges)
+
+    def __bool__(self) -> bool:
+        return bool(self.equals or self.ranges)
+
+
 class EventsNearbyParams(BaseModel):
-    """Validated query parameters for the nearby-events endpoint."""
+    """Validated query parameters for the nearby-events endpoint.
 
-    lat: float = Field(..., ge=-90, le=90, description="Latitude of the search center")
-    lng: float = Field(..., ge=-180, le=180, description="Longitude of the search center")
-    radius: float = Field(
-        5000, ge=100, le=50000, description="Search radius in meters"
-    )
+    Either a center (*lat*/*lng* with *radius*) or a *bbox* is required.
+    With a bbox, the box is the spatial filter and the center, if given,
+    only orders results by distance.
+    """
+
+    lat: float | None = Field(None, ge=-90, le=90, description="Latitude of the search center")
+    lng: float | None = Field(None, ge=-180, le=180, description="Longitude of search center")
+    radius: float = Field(5000, ge=100, le=50000, description="Search radius in meters")
+    bbox: BoundingBox | None = Field(None, description="Viewport to search instead of a radius")
     category_id: int | None = Field(None, description="Filter by category")
     status: str = Field("active", description="Filter by event status")
-    date_from: datetime | None = Field(None, description="Events starting from this date")
-    date_to: datetime | None = Field(None, description="Events starting before this date")
+    date_from: datetime | None = Field(None, description="Events still running at this time")
+    date_to: datetime | None = Field(None, description="Events starting at or before this time")
+    tags: list[str] | None = Field(
+        None, max_length=MAX_TAG_FILTERS, description="Filter by tag (see tags_match)"
+    )
+    tags_match: TagMatch = Field("any", description="Require any or all of the tags")
+    meta: MetaFilters = Field(default_factory=MetaFilters, description="meta.<key> filters")
+    min_results: int | None = Field(
+        None, ge=1, le=100, description="Widen the radius until at least this many events match"
+    )
+    sort: NearbySort = Field("default", description="Result order")
     page: int = Field(1, ge=1, description="Page number")
     page_size: int = Field(20, ge=1, le=100, description="Items per page")
 
 
+class ChangeCursor(BaseModel):
+    """Position in the ``(change_xid, id)`` change stream, exchanged as an opaque token."""
+
+    change_xid: int = Field(..., ge=0)
+    id: UUID
+
+    def encode(self) -> str:
+        payload = json.dumps([self.change_xid, str(self.id)])
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "ChangeCursor":
+        """Parse a token from :meth:`encode`.  Raises ``ValueError`` when malformed.
+
+        Tokens of the former ``(updated_at, id)`` stream are malformed too:
+        their clients have to sync again from scratch.
+        """
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            change_xid, event_id = json.loads(raw)
+            if not isinstance(change_xid, int):
+                raise TypeError("change_xid")
+            return cls(change_xid=change_xid, id=event_id)
+        except (TypeError, ValueError) as exc:  # includes binascii / pydantic errors
+            raise ValueError("Invalid change token") from exc
+
+
 # ---------------------------------------------------------------------------
 # Generic paginated response
 # ---------------------------------------------------------------------------
@@ -169,3 +408,19 @@ class PaginatedResponse(BaseModel, Generic[T]):
     page: int
     page_size: int
     pages: int
+
+
+class NearbyPage(PaginatedResponse[EventListItem]):
+    """Paginated nearby results, with the radius actually searched."""
+
+    radius: float | None = Field(None, description="Effective search radius in meters")
+
+
+class EventChanges(BaseModel):
+    """One page of the change stream for an area."""
+
+    items: list[EventChange]
+    next_token: str | None = Field(
+        None, description="Pass as since= to continue; unchanged when nothing is new"
+    )
+    has_more: bool = Field(False, description="More changes are ready; fetch again now")
@@ -8,7 +8,7 @@ import asyncio
 
 from sqlalchemy import select
 
-from app.database import async_session_factory, engine
+from app.database import async_session_factory, get_engine
 from app.models.category import Category
 
 DEFAULT_CATEGORIES: list[dict] = [
@@ -27,7 +27,7 @@ DEFAULT_CATEGORIES: list[dict] = [
 
 async def seed() -> None:
     """Insert default categories if they do not already exist."""
-    async with async_session_factory() as session:
+    async with async_session_factory(bind=get_engine()) as session:
         existing = (await session.execute(select(Category.slug))).scalars().all()
         existing_slugs = set(existing)
 
@@ -40,7 +40,7 @@ async def seed() -> None:
         await session.commit()
         print(f"Seeded {added} categories ({len(existing_slugs)} already existed).")
 
-    await engine.dispose()
+    await get_engine().dispose()
 
 
 def main() -> None:
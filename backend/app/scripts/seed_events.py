@@ -13,7 +13,7 @@ from datetime import datetime, timedelta, timezone
 
 from sqlalchemy import func, select
 
-from app.database import async_session_factory, engine
+from app.database import async_session_factory, get_engine
 from app.models.category import Category
 from app.models.event import Event
 from app.models.event_tag import EventTag
@@ -179,7 +179,7 @@ def _random_point() -> str:
 
 async def seed() -> None:
     """Insert 50 sample events spread across all categories."""
-    async with async_session_factory() as session:
+    async with async_session_factory(bind=get_engine()) as session:
         # Fetch categories
         result = await session.execute(select(Category))
         categories = result.scalars().all()
@@ -242,7 +242,7 @@ async def seed() -> None:
                 tag_pool = TAGS_POOL.get(slug, [])
                 chosen_tags = random.sample(tag_pool, k=min(random.randint(1, 3), len(tag_pool)))
                 for t in chosen_tags:
-                    event.tags.append(EventTag(tag=t))
+                    event.tag_links.append(EventTag(tag=t))
 
                 session.add(event)
                 created += 1
@@ -250,7 +250,7 @@ async def seed() -> None:
         await session.commit()
         print(f"Seeded {created} events across {len(EVENTS_BY_SLUG)} categories.")
 
-    await engine.dispose()
+    await get_engine().dispose()
 
 
 def main() -> None:
@@ -0,0 +1,108 @@
+"""Production server entry point.
+
+Run with:
+    python -m app.serve [--workers N] [--port 8000]
+
+Starts uvicorn with one worker per available CPU (``API_WORKERS`` or
+``--workers`` override), uvloop/httptools when they are installed, and
+per-worker connection pools sized so that all workers together — request
+and background pools alike — stay within ``DB_MAX_CONNECTIONS``.
+
+Graceful reload: send ``SIGHUP`` to the server process to restart the
+workers one by one without dropping the listening socket.  ``SIGTTIN`` /
+``SIGTTOU`` add or remove a worker; pools are sized once, at startup, for
+``API_MAX_WORKERS``, so adding workers beyond that count (or beyond the
+starting count when it is 0) exceeds ``DB_MAX_CONNECTIONS`` — restart with
+a new ``--workers`` instead.
+"""
+
+import argparse
+import importlib.util
+import os
+from pathlib import Path
+
+import uvicorn
+
+from app.config import Settings, get_settings
+
+
+def available_cpus() -> int:
+    """Return the CPUs this process may use, honouring affinity and cgroup quotas."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS
+        cpus = os.cpu_count() or 1
+
+    # cgroup v2 CPU quota, e.g. "200000 100000" for ``docker run --cpus=2``.
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()
+    except (OSError, ValueError):
+        return cpus
+    if quota == "max":
+        return cpus
+    return max(1, min(cpus, int(quota) // int(period)))
+
+
+def pool_budget(settings: Settings, workers: int) -> tuple[int, int]:
+    """Return the request pool's ``(pool_size, max_overflow)`` for each worker.
+
+    The budget is shared by ``max(workers, API_MAX_WORKERS)`` processes, and
+    each first sets ``DB_BACKGROUND_POOL_SIZE`` connections aside for its
+    background pool.  The configured ``DB_POOL_SIZE`` / ``DB_MAX_OVERFLOW``
+    are upper bounds; both shrink so that ``(pool_size + max_overflow +
+    DB_BACKGROUND_POOL_SIZE) * workers`` fits in ``DB_MAX_CONNECTIONS``.
+    Every worker keeps at least one request connection.
+    """
+    workers = max(workers, settings.API_MAX_WORKERS)
+    share = settings.DB_MAX_CONNECTIONS // workers
+    per_worker = max(1, share - settings.DB_BACKGROUND_POOL_SIZE)
+    pool_size = min(settings.DB_POOL_SIZE, per_worker)
+    max_overflow = min(settings.DB_MAX_OVERFLOW, per_worker - pool_size)
+    return pool_size, max_overflow
+
+
+def _has(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def main() -> None:
+    settings = get_settings()
+
+    parser = argparse.ArgumentParser(description="Run the EventBuzz API server.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.API_WORKERS or available_cpus(),
+        help="Worker processes (default: API_WORKERS, or one per available CPU)",
+    )
+    parser.add_argument("--log-level", default=os.environ.get("LOG_LEVEL", "info"))
+    parser.add_argument("--reload", action="store_true", help="Auto-reload on code changes (dev)")
+    args = parser.parse_args()
+
+    workers = 1 if args.reload else max(1, args.workers)
+
+    # Workers are separate processes that read their settings from the
+    # environment, so the per-worker pool sizes are handed down that way.
+    pool_size, max_overflow = pool_budget(settings, workers)
+    os.environ["DB_POOL_SIZE"] = str(pool_size)
+    os.environ["DB_MAX_OVERFLOW"] = str(max_overflow)
+    get_settings.cache_clear()
+
+    uvicorn.run(
+        "app.main:create_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        reload=args.reload,
+        loop="uvloop" if _has("uvloop") else "asyncio",
+        http="httptools" if _has("httptools") else "h11",
+        log_level=args.log_level,
+        timeout_graceful_shutdown=settings.GRACEFUL_SHUTDOWN_TIMEOUT,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Supervision of the periodic tasks the lifespan runs in the background.
+
+The bubble snapshot and heatmap refreshers, the event stats flusher and
+the subscription matcher are all one *step* repeated forever by
+:func:`run_periodically`.  A step that fails is logged and counted, and the
+loop carries on after the usual interval: database outages and pool
+timeouts are expected and logged as warnings; anything else is a bug and
+logged with its traceback, but the task is not left dead in the meantime.
+Only cancellation (at shutdown) ends the loop.
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+BACKGROUND_FAILURES = Counter(
+    "eventbuzz_background_failures_total",
+    "Failed steps of background tasks, by task and kind (database or unexpected).",
+    ("task", "kind"),
+)
+
+
+async def run_periodically(
+    name: str,
+    step: Callable[[], Awaitable[object]],
+    interval: float,
+    *,
+    wait_first: bool = False,
+) -> None:
+    """Await *step* every *interval* seconds, forever.
+
+    A step returning a truthy value is run again at once (more work is
+    ready); *wait_first* sleeps before the first step.  *name* labels the
+    logs and ``eventbuzz_background_failures_total``.
+    """
+    if wait_first:
+        await asyncio.sleep(interval)
+    while True:
+        again = False
+        try:
+            again = await step()
+        except (SQLAlchemyError, OSError) as exc:
+            BACKGROUND_FAILURES.inc(task=name, kind="database")
+            logger.warning("%s failed: %r", name, exc)
+        except Exception:
+            BACKGROUND_FAILURES.inc(task=name, kind="unexpected")
+            logger.exception("%s failed unexpectedly; retrying in %gs", name, interval)
+        if not again:
+            await asyncio.sleep(interval)
@@ -3,24 +3,195 @@
 All PostGIS spatial queries live here so that API routes remain thin.
 """
 
-from uuid import UUID
+import asyncio
+import math
+from collections.abc import Awaitable, Callable
+from datetime import date, datetime, time, timedelta
+from functools import partial
+from typing import Any
+from uuid import UUID, uuid4
+from zoneinfo import ZoneInfo
 
-from geoalchemy2 import func as geo_func
-from sqlalchemy import func, select
+from geoalchemy2 import Geometry
+from pydantic import BaseModel
+from sqlalchemy import (
+    JSON,
+    Date,
+    DateTime,
+    Float,
+    case,
+    cast,
+    delete,
+    func,
+    literal,
+    null,
+    or_,
+    select,
+    tuple_,
+    type_coerce,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
 
-from app.models.event import Event
+from app.config import get_settings
+from app.core.single_flight import SingleFlight
+from app.database import read_from_primary, read_session, reads_pinned
+from app.models.category import Category
+from app.models.event import Event, change_horizon, metadata_number
+from app.models.event_heatmap import event_heatmap
+from app.models.event_image import EventImage
+from app.models.event_move import EventMove
+from app.models.event_stats import EventStats
 from app.models.event_tag import EventTag
 from app.schemas.event import (
+    BoundingBox,
+    CategoryFacet,
+    ChangeCursor,
+    DateFacet,
     EventBubble,
+    EventChange,
+    EventChanges,
     EventCreate,
     EventDetail,
+    EventFacets,
+    EventHeatmap,
     EventImageOut,
     EventListItem,
     EventsNearbyParams,
     EventTagOut,
     EventUpdate,
+    HeatmapCell,
+    MetaFilters,
+    TagMatch,
+    TimePreset,
 )
+from app.services.heatmap import HEATMAP_LEVELS, heatmap_level
+
+# In-memory bubble snapshot (app.services.snapshot), installed by its refresher
+# when BUBBLE_SNAPSHOT_ENABLED is set.  Typed loosely so numpy is only
+# imported when the feature is on.
+_bubble_snapshot = None
+
+
+def set_bubble_snapshot(snapshot) -> None:
+    """Install (or with ``None`` remove) the snapshot used for bubble queries."""
+    global _bubble_snapshot
+    _bubble_snapshot = snapshot
+
+
+def _serving_snapshot(date_from: datetime | None):
+    snapshot = _bubble_snapshot
+    if snapshot is not None and snapshot.can_serve(date_from):
+        return snapshot
+    return None
+
+
+# Identical concurrent reads (same method, same normalized arguments) share
+# one execution; see coalesced_read().
+_read_flights = SingleFlight("event_reads")
+
+
+def _freeze(value: Any) -> Any:
+    """A hashable stand-in for a call argument, equal for equal arguments."""
+    if isinstance(value, BaseModel):
+        return type(value).__name__, value.model_dump_json()
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, list | tuple | set | frozenset):
+        items = (_freeze(item) for item in value)
+        return tuple(sorted(items)) if isinstance(value, set | frozenset) else tuple(items)
+    return value
+
+
+async def coalesced_read(
+    method: Callable[..., Awaitable[Any]], /, *args: Any, **kwargs: Any
+) -> Any:
+    """Run the read-only ``EventService`` *method* once for identical concurrent calls.
+
+    ``method(session, *args, **kwargs)`` runs in a read session of its own,
+    so no caller's request session outlives or is shared with the others;
+    callers arriving while it is in flight await the same result.  Results
+    are shared objects and must not be mutated.  Reads of clients pinned to
+    the primary (read-your-writes) are only shared among themselves.
+    """
+    key = (method.__qualname__, _freeze(args), _freeze(kwargs), read_from_primary.get())
+
+    async def call() -> Any:
+        async with read_session() as session:
+            return await method(session, *args, **kwargs)
+
+    return await _read_flights.run(key, call)
+
+
+async def gather_reads(
+    session: AsyncSession, *reads: Callable[[AsyncSession], Awaitable[Any]]
+) -> list[Any]:
+    """Run independent *reads* concurrently and return their results in order.
+
+    The first read runs on *session*, so ORM objects it loads belong to the
+    caller; each other read gets a pooled read session of its own.  At most
+    ``DB_READ_FANOUT`` connections are used at once (*session*'s included):
+    extra reads queue for a free slot, and with a fan-out of 1 all reads run
+    in sequence on *session*, as they do while warmup is priming it (see
+    :data:`~app.database.reads_pinned`).  The reads see separate snapshots,
+    as they already did in autocommit mode, and share the request's
+    statement budget.  If one read fails, the others are cancelled and its
+    error is raised as is — not wrapped in an ``ExceptionGroup`` — so that
+    a :class:`~app.database.StatementTimeoutError` still becomes a 503 and
+    :func:`~app.database.read_session` still sees driver errors.
+    """
+    fanout = get_settings().DB_READ_FANOUT
+    if fanout <= 1 or len(reads) <= 1 or reads_pinned.get():
+        return [await read(session) for read in reads]
+
+    slots = asyncio.Semaphore(fanout - 1)
+
+    async def on_own_session(read: Callable[[AsyncSession], Awaitable[Any]]) -> Any:
+        async with slots, read_session() as own:
+            return await read(own)
+
+    first, *rest = reads
+    try:
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(first(session))]
+            tasks += [group.create_task(on_own_session(read)) for read in rest]
+    except BaseExceptionGroup as failed:
+        raise failed.exceptions[0] from None
+    return [task.result() for task in tasks]
+
+
+async def _fetch_all(statement, session: AsyncSession) -> list:
+    return (await session.execute(statement)).all()
+
+
+async def _fetch_scalar(statement, session: AsyncSession) -> Any:
+    return (await session.execute(statement)).scalar_one()
+
+
+async def _fetch_one(statement, session: AsyncSession) -> Any:
+    return (await session.execute(statement)).one()
+
+
+# Search rings (meters) used when expanding the radius to reach ``min_results``.
+RADIUS_RINGS = (1_000, 2_000, 5_000, 10_000, 20_000, 50_000)
+
+# Location-aware text search: default radius (meters), number of nearest
+# matches ranked, and the half-lives of the distance and time factors of the
+# score (see _search_score()).
+SEARCH_RADIUS = 25_000
+SEARCH_MAX_CANDIDATES = 500
+SEARCH_DISTANCE_HALF_M = 5_000
+SEARCH_TIME_HALF_HOURS = 72
+
+
+# Evening window for ``when=tonight``: from this local hour until EVENING_END
+# the next morning.  The weekend starts Friday evening.
+EVENING_START = time(18)
+EVENING_END = time(4)
+
+# Date windows are inclusive, so presets end one tick before the next boundary.
+_TICK = timedelta(microseconds=1)
 
 
 def _point_wkt(lng: float, lat: float) -> str:
@@ -28,30 +199,293 @@ def _point_wkt(lng: float, lat: float) -> str:
     return f"SRID=4326;POINT({lng} {lat})"
 
 
-def _event_to_list_item(row, distance: float | None = None) -> EventListItem:
-    """Map an ORM Event (with joined category) to an EventListItem schema."""
-    event: Event = row[0] if hasattr(row, "__getitem__") else row
-    dist = row[1] if hasattr(row, "__getitem__") and len(row) > 1 else distance
+def snap_to_grid(lat: float, lng: float, radius: float) -> tuple[float, float]:
+    """Snap a search center to a grid of about ``radius / 20`` (at least 50 m).
+
+    Nearby clients then send — and caches then see — identical coordinates,
+    while the shifted circle still covers all but a sliver of the original.
+    """
+    step = max(radius / 20, 50.0) / 111_320  # meters -> degrees of latitude
+    snapped_lat = round(round(lat / step) * step, 6)
+    # Widen the longitude step with latitude; derived from the snapped
+    # latitude so every point in a row shares the same longitude grid.
+    lng_step = step / max(math.cos(math.radians(snapped_lat)), 0.01)
+    return snapped_lat, round(round(lng / lng_step) * lng_step, 6)
+
+
+def time_window(
+    preset: TimePreset, tz: ZoneInfo, now: datetime | None = None
+) -> tuple[datetime, datetime]:
+    """Return the inclusive ``(start, end)`` window for a named *preset*.
+
+    Windows are cut in the client's time zone *tz* and never start in the
+    past: "tonight" at 21:00 means 21:00 until 04:00, so an event that
+    started at 19:00 and is still running matches while one that ended at
+    20:00 does not.
+
+    * ``now`` — the current instant.
+    * ``today`` — until local midnight.
+    * ``tonight`` — 18:00 until 04:00 the next morning (before 04:00, the
+      rest of the current night).
+    * ``weekend`` — Friday 18:00 until Sunday midnight (the coming one on
+      weekdays).
+    """
+    # Whole minutes, so that repeated requests share a window (and an ETag).
+    now = (now or datetime.now(tz)).astimezone(tz).replace(second=0, microsecond=0)
+    today = now.date()
+
+    def at(day: date, clock: time) -> datetime:
+        return datetime.combine(day, clock, tzinfo=tz)
+
+    if preset == "now":
+        return now, now
+    if preset == "today":
+        return now, at(today + timedelta(days=1), time.min) - _TICK
+    if preset == "tonight":
+        if now.time() < EVENING_END:
+            return now, at(today, EVENING_END) - _TICK
+        start = at(today, EVENING_START)
+        return max(now, start), at(today + timedelta(days=1), EVENING_END) - _TICK
+
+    # weekend: the coming Friday, or the one just past on Saturday/Sunday
+    friday = today + timedelta(days=(4 - today.weekday()) % 7)
+    if today.weekday() >= 5:
+        friday -= timedelta(days=7)
+    return max(now, at(friday, EVENING_START)), at(friday + timedelta(days=3), time.min) - _TICK
+
+
+def _location_geometry():
+    """``Event.location`` as planar geometry — matches ``ix_events_location_geom``."""
+    return cast(Event.location, Geometry(geometry_type="POINT", srid=4326))
+
+
+def _lng_lat_columns():
+    """Return labelled ``(longitude, latitude)`` columns extracted from ``Event.location``."""
+    point = _location_geometry()
+    return func.ST_X(point).label("longitude"), func.ST_Y(point).label("latitude")
 
-    return EventListItem(
+
+def _bbox_clause(bbox: BoundingBox, location=Event.location):
+    """Index-assisted ``&&`` test of the event point against the viewport.
+
+    A box crossing the antimeridian is split in two envelopes so each side
+    stays a plain rectangle in lng/lat space.  *location* may be another
+    geography point column (``EventMove.location``).
+    """
+    point = cast(location, Geometry(geometry_type="POINT", srid=4326))
+    return or_(*(point.op("&&")(func.ST_MakeEnvelope(*env, 4326)) for env in bbox.envelopes()))
+
+
+def _event_to_list_item(
+    event: Event,
+    lng: float,
+    lat: float,
+    distance: float | None = None,
+    *,
+    schema: type[EventListItem] = EventListItem,
+    **extra: Any,
+) -> EventListItem:
+    """Map an ORM Event (with joined category) and its coordinates to a list item.
+
+    *schema* may be a subclass of EventListItem whose own fields are given
+    in *extra* (``EventChange`` takes ``updated_at``).
+    """
+    return schema(
         id=event.id,
         title=event.title,
         description=event.description,
         category=event.category,
-        latitude=0.0,  # filled below
-        longitude=0.0,
+        latitude=lat,
+        longitude=lng,
+        address=event.address,
+        city=event.city,
+        country=event.country,
+        start_date=event.start_date,
+        end_date=event.end_date,
+        image_url=event.image_url,
+        price_min=float(event.price_min) if event.price_min is not None else None,
+        price_max=float(event.price_max) if event.price_max is not None else None,
+        currency=event.currency,
+        status=event.status,
+        tags=_tag_out(event.tags),
+        distance_meters=float(distance) if distance is not None else None,
+        **extra,
+    )
+
+
+def _detail_query():
+    """``SELECT`` for :class:`EventDetail` rows: event, category, lng, lat, images.
+
+    The category is joined and images are aggregated into a JSON array by a
+    correlated subquery, so a detail needs a single round trip.  Relationship
+    loaders are switched off (``raiseload``) so nothing is fetched lazily.
+    """
+    images = (
+        select(
+            func.coalesce(
+                func.json_agg(
+                    aggregate_order_by(
+                        func.json_build_object(
+                            "id",
+                            EventImage.id,
+                            "image_url",
+                            EventImage.image_url,
+                            "display_order",
+                            EventImage.display_order,
+                        ),
+                        EventImage.display_order,
+                    )
+                ),
+                func.json_build_array(),
+            )
+        )
+        .where(EventImage.event_id == Event.id)
+        .scalar_subquery()
+    )
+    lng_col, lat_col = _lng_lat_columns()
+    return (
+        select(Event, Category, lng_col, lat_col, type_coerce(images, JSON).label("images"))
+        .join(Category, Category.id == Event.category_id)
+        .options(raiseload("*"))
+    )
+
+
+def _event_to_detail(row) -> EventDetail:
+    """Map a :func:`_detail_query` row to an EventDetail schema."""
+    event, category, lng_val, lat_val, images = row
+    return EventDetail(
+        id=event.id,
+        title=event.title,
+        description=event.description,
+        category=category,
+        latitude=lat_val,
+        longitude=lng_val,
         address=event.address,
         city=event.city,
         country=event.country,
         start_date=event.start_date,
         end_date=event.end_date,
         image_url=event.image_url,
+        ticket_url=event.ticket_url,
         price_min=float(event.price_min) if event.price_min is not None else None,
         price_max=float(event.price_max) if event.price_max is not None else None,
         currency=event.currency,
         status=event.status,
-        distance_meters=float(dist) if dist is not None else None,
+        source=event.source,
+        external_id=event.external_id,
+        tags=_tag_out(event.tags),
+        images=[EventImageOut.model_validate(image) for image in images],
+        metadata_=event.metadata_,
+        created_at=event.created_at,
+        updated_at=event.updated_at,
+    )
+
+
+def _spatial_filter(params: EventsNearbyParams):
+    """The bbox ``&&`` test when a viewport is given, else ``ST_DWithin`` of the center."""
+    if params.bbox is not None:
+        return _bbox_clause(params.bbox)
+    ref_point = func.ST_GeogFromText(_point_wkt(params.lng, params.lat))
+    return func.ST_DWithin(Event.location, ref_point, params.radius)
+
+
+def _search_score(query: str, distance):
+    """Ranking score of a search match *distance* meters away, in ``(0, 1]``.
+
+    The product of three factors:
+
+    * text relevance — 1 when the title starts with *query*, 0.8 when it
+      contains it, 0.4 for a match in the description only;
+    * distance decay — halves every ``SEARCH_DISTANCE_HALF_M`` meters;
+    * time proximity — 1 while the event runs, halving every
+      ``SEARCH_TIME_HALF_HOURS`` hours before its start or after its end.
+    """
+    relevance = case(
+        (Event.title.ilike(f"{query}%"), 1.0),
+        (Event.title.ilike(f"%{query}%"), 0.8),
+        else_=0.4,
     )
+    distance_decay = func.power(0.5, distance / SEARCH_DISTANCE_HALF_M)
+    ends = func.coalesce(Event.end_date, Event.start_date)
+    seconds_away = func.greatest(
+        func.extract("epoch", Event.start_date - func.now()),
+        func.extract("epoch", func.now() - ends),
+        0,
+    )
+    time_decay = func.power(0.5, cast(seconds_away, Float) / (SEARCH_TIME_HALF_HOURS * 3600))
+    return relevance * distance_decay * time_decay
+
+
+def _bubble_filters(
+    *,
+    lat: float | None = None,
+    lng: float | None = None,
+    radius: float = 5000,
+    bbox: BoundingBox | None = None,
+    category_id: int | None = None,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+) -> list:
+    """``WHERE`` clauses of a bubble query (see ``EventService.get_event_bubbles``)."""
+    if bbox is not None:
+        spatial = _bbox_clause(bbox)
+    else:
+        ref_point = func.ST_GeogFromText(_point_wkt(lng, lat))
+        spatial = func.ST_DWithin(Event.location, ref_point, radius)
+    filters = [spatial, Event.status == "active"]
+    if category_id is not None:
+        filters.append(Event.category_id == category_id)
+    if date_from is not None or date_to is not None:
+        filters.append(_during_overlaps(date_from, date_to))
+    return filters
+
+
+def _during_overlaps(date_from: datetime | None, date_to: datetime | None):
+    """Events whose ``during`` range overlaps ``[date_from, date_to]``.
+
+    Either bound may be ``None`` (unbounded).  ``&&`` is served by the
+    ``(location, during, category_id)`` GiST index together with the
+    spatial filter, and — unlike a ``start_date`` test — also matches events
+    that started earlier and are still running.
+    """
+
+    def bound(value: datetime | None):
+        return null() if value is None else literal(value, DateTime(timezone=True))
+
+    return Event.during.op("&&")(func.tstzrange(bound(date_from), bound(date_to), "[]"))
+
+
+def _tag_filter(tags: list[str], match: TagMatch):
+    """GIN-indexed test of ``Event.tags``: overlap (``&&``) for any, ``@>`` for all."""
+    return Event.tags.contains(tags) if match == "all" else Event.tags.overlap(tags)
+
+
+def _meta_filters(meta: MetaFilters) -> list:
+    """``metadata @> {...}`` for exact matches plus indexed numeric range tests."""
+    filters = []
+    if meta.equals:
+        filters.append(Event.metadata_.contains(meta.equals))
+    for key, op, bound in meta.ranges:
+        value = metadata_number(key)
+        filters.append(value >= bound if op == "gte" else value <= bound)
+    return filters
+
+
+def _tag_out(tags: list[str]) -> list[EventTagOut]:
+    return [EventTagOut(tag=tag) for tag in tags]
+
+
+def _attribute_filters(params: EventsNearbyParams) -> list:
+    """Non-spatial WHERE clauses shared by the nearby queries."""
+    filters = [Event.status == params.status]
+    if params.category_id is not None:
+        filters.append(Event.category_id == params.category_id)
+    if params.date_from is not None or params.date_to is not None:
+        filters.append(_during_overlaps(params.date_from, params.date_to))
+    if params.tags:
+        filters.append(_tag_filter(params.tags, params.tags_match))
+    filters.extend(_meta_filters(params.meta))
+    return filters
 
 
 class EventService:
@@ -62,73 +496,88 @@ class EventService:
     # ------------------------------------------------------------------
 
     @staticmethod
-    async def get_nearby_events(
+    async def expand_radius(
         session: AsyncSession,
         params: EventsNearbyParams,
-    ) -> tuple[list[EventListItem], int]:
-        """Return events within *params.radius* meters, ordered by distance."""
-        ref_point = func.ST_GeogFromText(_point_wkt(params.lng, params.lat))
+    ) -> float:
+        """Return the smallest search ring holding at least *params.min_results* events.
 
-        distance_col = func.ST_Distance(Event.location, ref_point).label("distance")
-        lng_col = func.ST_X(func.ST_GeomFromWKB(Event.location.cast_to_geometry())).label(
-            "longitude"
-        )
-        lat_col = func.ST_Y(func.ST_GeomFromWKB(Event.location.cast_to_geometry())).label(
-            "latitude"
-        )
-
-        base = (
-            select(Event, distance_col, lng_col, lat_col)
+        One KNN probe finds the distance to the N-th nearest matching event
+        (within ``RADIUS_RINGS[-1]``); the result is the first ring at least
+        that far out and no smaller than *params.radius*.  Snapping to fixed
+        rings keeps the effective radius — and so response caching — stable
+        as the client moves.  Falls back to the outermost ring when fewer
+        than N events exist within it.
+        """
+        ref_point = func.ST_GeogFromText(_point_wkt(params.lng, params.lat))
+        probe = (
+            select(func.ST_Distance(Event.location, ref_point))
             .where(
-                func.ST_DWithin(Event.location, ref_point, params.radius),
-                Event.status == params.status,
+                func.ST_DWithin(Event.location, ref_point, RADIUS_RINGS[-1]),
+                *_attribute_filters(params),
             )
+            .order_by(Event.location.op("<->")(ref_point))
+            .offset(params.min_results - 1)
+            .limit(1)
         )
+        nth_distance = (await session.execute(probe)).scalar_one_or_none()
+        if nth_distance is None:
+            return RADIUS_RINGS[-1]
 
-        if params.category_id is not None:
-            base = base.where(Event.category_id == params.category_id)
-        if params.date_from is not None:
-            base = base.where(Event.start_date >= params.date_from)
-        if params.date_to is not None:
-            base = base.where(Event.start_date <= params.date_to)
+        needed = max(params.radius, nth_distance)
+        return next((ring for ring in RADIUS_RINGS if ring >= needed), RADIUS_RINGS[-1])
 
-        # Count
-        count_q = select(func.count()).select_from(base.subquery())
-        total = (await session.execute(count_q)).scalar_one()
+    @staticmethod
+    async def get_nearby_events(
+        session: AsyncSession,
+        params: EventsNearbyParams,
+    ) -> tuple[list[EventListItem], int, datetime | None]:
+        """Return events within *params.radius* meters, ordered by distance.
 
-        # Paginated data
-        offset = (params.page - 1) * params.page_size
-        rows = (
-            await session.execute(
-                base.order_by("distance").offset(offset).limit(params.page_size)
-            )
-        ).all()
+        The result is ``(items, total, last_modified)``: ``(last_modified,
+        total)`` is the list's version as :meth:`get_area_version` computes
+        it, taken from the count query at no extra cost.
 
-        items: list[EventListItem] = []
-        for row in rows:
-            event, dist, lng, lat = row
-            item = EventListItem(
-                id=event.id,
-                title=event.title,
-                description=event.description,
-                category=event.category,
-                latitude=lat,
-                longitude=lng,
-                address=event.address,
-                city=event.city,
-                country=event.country,
-                start_date=event.start_date,
-                end_date=event.end_date,
-                image_url=event.image_url,
-                price_min=float(event.price_min) if event.price_min is not None else None,
-                price_max=float(event.price_max) if event.price_max is not None else None,
-                currency=event.currency,
-                status=event.status,
-                distance_meters=float(dist) if dist is not None else None,
-            )
-            items.append(item)
+        Distance ordering uses the KNN operator (``location <-> point``) so
+        the GiST index yields rows nearest-first and the page is cut off by
+        ``LIMIT`` without sorting every match; the exact ``ST_Distance`` is
+        only evaluated for the rows returned.
 
-        return items, total
+        With *params.bbox* the viewport replaces the radius filter; results
+        are ordered by distance from the center when one is given, otherwise
+        by start date.  ``sort="trending"`` orders by the precomputed
+        trending score instead (see :mod:`app.services.event_stats`), with
+        events never viewed last.
+        """
+        has_center = params.lat is not None and params.lng is not None
+        if has_center:
+            ref_point = func.ST_GeogFromText(_point_wkt(params.lng, params.lat))
+            distance_col = func.ST_Distance(Event.location, ref_point).label("distance")
+            order = Event.location.op("<->")(ref_point)
+        else:
+            distance_col = null().label("distance")
+            order = Event.start_date
+        lng_col, lat_col = _lng_lat_columns()
+
+        filters = [_spatial_filter(params), *_attribute_filters(params)]
+
+        # Count (with the version, see get_area_version()) and paginated
+        # data, run side by side
+        count_q = select(func.count(), func.max(Event.updated_at)).where(*filters)
+        offset = (params.page - 1) * params.page_size
+        page_q = select(Event, distance_col, lng_col, lat_col).where(*filters)
+        if params.sort == "trending":
+            page_q = page_q.outerjoin(EventStats, EventStats.event_id == Event.id)
+            page_q = page_q.order_by(EventStats.trending.desc().nulls_last(), order, Event.id)
+        else:
+            page_q = page_q.order_by(order)
+        page_q = page_q.offset(offset).limit(params.page_size)
+        rows, (total, last_modified) = await gather_reads(
+            session, partial(_fetch_all, page_q), partial(_fetch_one, count_q)
+        )
+
+        items = [_event_to_list_item(event, lng, lat, dist) for event, dist, lng, lat in rows]
+        return items, total, last_modified
 
     # ------------------------------------------------------------------
     # Bubbles (lightweight map markers)
@@ -138,35 +587,42 @@ class EventService:
     async def get_event_bubbles(
         session: AsyncSession,
         *,
-        lat: float,
-        lng: float,
-        radius: float,
+        lat: float | None = None,
+        lng: float | None = None,
+        radius: float = 5000,
+        bbox: BoundingBox | None = None,
         category_id: int | None = None,
-    ) -> list[EventBubble]:
-        """Return minimal event data for rendering map markers."""
-        ref_point = func.ST_GeogFromText(_point_wkt(lng, lat))
-
-        lng_col = func.ST_X(func.ST_GeomFromWKB(Event.location.cast_to_geometry())).label(
-            "longitude"
-        )
-        lat_col = func.ST_Y(func.ST_GeomFromWKB(Event.location.cast_to_geometry())).label(
-            "latitude"
-        )
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+    ) -> tuple[list[EventBubble], datetime | None, int]:
+        """Return minimal event data for rendering map markers.
 
-        stmt = (
-            select(Event, lng_col, lat_col)
-            .where(
-                func.ST_DWithin(Event.location, ref_point, radius),
-                Event.status == "active",
-            )
-        )
-
-        if category_id is not None:
-            stmt = stmt.where(Event.category_id == category_id)
+        Filters by *bbox* when given, otherwise by *radius* around *lat*/*lng*,
+        and to events running at some point between *date_from* and *date_to*.
+        Served from the in-memory snapshot when one is installed, fresh, and
+        covers *date_from*; otherwise from PostGIS.  The result is
+        ``(bubbles, watermark, count)``, the last two being the version
+        :meth:`get_bubbles_version` would compute.
+        """
+        snapshot = _serving_snapshot(date_from)
+        filters = {
+            "lat": lat,
+            "lng": lng,
+            "radius": radius,
+            "bbox": bbox,
+            "category_id": category_id,
+            "date_from": date_from,
+            "date_to": date_to,
+        }
+        if snapshot is not None:
+            bubbles = snapshot.query(**filters)
+            return bubbles, snapshot.last_modified, len(bubbles)
 
+        lng_col, lat_col = _lng_lat_columns()
+        stmt = select(Event, lng_col, lat_col).where(*_bubble_filters(**filters))
         rows = (await session.execute(stmt)).all()
 
-        return [
+        bubbles = [
             EventBubble(
                 id=event.id,
                 title=event.title,
@@ -178,6 +634,123 @@ class EventService:
             )
             for event, lng_val, lat_val in rows
         ]
+        watermark = max((event.updated_at for event, _, _ in rows), default=None)
+        return bubbles, watermark, len(bubbles)
+
+    # ------------------------------------------------------------------
+    # Facets (category / day counts)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    async def get_event_facets(
+        session: AsyncSession,
+        params: EventsNearbyParams,
+        *,
+        window_start: datetime,
+        days: int,
+        tz: str,
+    ) -> EventFacets:
+        """Count matching events per category and per local day in one query.
+
+        A single ``GROUP BY GROUPING SETS ((category_id), (day), ())`` pass
+        over the spatial + window filter yields the category counts, the
+        day histogram, and the total; ``GROUPING()`` tells the rows apart.
+        Days with no events are filled in with zero.
+        """
+        window_end = window_start + timedelta(days=days)
+        # Inlined rather than bound: the expression must render identically in
+        # SELECT and GROUP BY for Postgres to match them.
+        day = cast(func.timezone(literal(tz, literal_execute=True), Event.start_date), Date)
+
+        stmt = (
+            select(
+                Event.category_id,
+                day.label("day"),
+                func.count().label("n"),
+                func.grouping(Event.category_id, day).label("level"),
+            )
+            .where(
+                _spatial_filter(params),
+                *_attribute_filters(params),
+                Event.start_date >= window_start,
+                Event.start_date < window_end,
+            )
+            .group_by(func.grouping_sets(tuple_(Event.category_id), tuple_(day), tuple_()))
+        )
+        rows = (await session.execute(stmt)).all()
+
+        total = 0
+        categories: list[CategoryFacet] = []
+        per_day: dict = {}
+        for category_id, day_val, count, level in rows:
+            if level == 1:  # grouped by category only
+                categories.append(CategoryFacet(category_id=category_id, count=count))
+            elif level == 2:  # grouped by day only
+                per_day[day_val] = count
+            else:
+                total = count
+
+        first_day = window_start.astimezone(ZoneInfo(tz)).date()
+        dates = [
+            DateFacet(date=d, count=per_day.get(d, 0))
+            for d in (first_day + timedelta(days=i) for i in range(days))
+        ]
+        categories.sort(key=lambda c: c.count, reverse=True)
+        return EventFacets(total=total, categories=categories, dates=dates)
+
+    # ------------------------------------------------------------------
+    # Heatmap (precomputed density)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    async def get_heatmap(
+        session: AsyncSession,
+        *,
+        bbox: BoundingBox,
+        zoom: int,
+        week_from: date,
+        weeks: int = 1,
+        category_id: int | None = None,
+    ) -> EventHeatmap:
+        """Return event counts per grid cell over *bbox* for *weeks* weeks.
+
+        Reads only the ``event_heatmap`` aggregate (see
+        :mod:`app.services.heatmap`) at the cell size suited to *zoom*;
+        *week_from* must be a Monday.  Counts lag writes by up to one
+        refresh interval.
+        """
+        level = heatmap_level(zoom)
+        size = HEATMAP_LEVELS[level]
+        cell = event_heatmap.c
+
+        stmt = (
+            select(cell.cell_x, cell.cell_y, func.sum(cell.events))
+            .where(
+                cell.level == level,
+                or_(
+                    *(
+                        cell.cell_x.between(math.floor(min_lng / size), math.floor(max_lng / size))
+                        for min_lng, _, max_lng, _ in bbox.envelopes()
+                    )
+                ),
+                cell.cell_y.between(
+                    math.floor(bbox.min_lat / size), math.floor(bbox.max_lat / size)
+                ),
+                cell.week >= week_from,
+                cell.week < week_from + timedelta(weeks=weeks),
+            )
+            .group_by(cell.cell_x, cell.cell_y)
+            .order_by(cell.cell_y, cell.cell_x)
+        )
+        if category_id is not None:
+            stmt = stmt.where(cell.category_id == category_id)
+
+        rows = (await session.execute(stmt)).all()
+        cells = [
+            HeatmapCell(latitude=(y + 0.5) * size, longitude=(x + 0.5) * size, count=int(count))
+            for x, y, count in rows
+        ]
+        return EventHeatmap(cell_size=size, week_from=week_from, weeks=weeks, cells=cells)
 
     # ------------------------------------------------------------------
     # Single event detail
@@ -188,51 +761,141 @@ class EventService:
         session: AsyncSession,
         event_id: UUID,
     ) -> EventDetail | None:
-        """Return full event detail or None."""
-        lng_col = func.ST_X(func.ST_GeomFromWKB(Event.location.cast_to_geometry())).label(
-            "longitude"
+        """Return full event detail or None.
+
+        One statement: the category is joined, images come back as a
+        ``json_agg`` column and tags from the ``events.tags`` array.
+        """
+        row = (await session.execute(_detail_query().where(Event.id == event_id))).first()
+        return _event_to_detail(row) if row is not None else None
+
+    @staticmethod
+    async def get_events_by_ids(
+        session: AsyncSession,
+        event_ids: list[UUID],
+    ) -> list[EventDetail]:
+        """Return the details of *event_ids* in the given order, skipping unknown ids."""
+        rows = (await session.execute(_detail_query().where(Event.id.in_(event_ids)))).all()
+        by_id = {row[0].id: _event_to_detail(row) for row in rows}
+        return [by_id[event_id] for event_id in dict.fromkeys(event_ids) if event_id in by_id]
+
+    # ------------------------------------------------------------------
+    # Delta sync
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    async def get_changes(
+        session: AsyncSession,
+        *,
+        bbox: BoundingBox,
+        since: ChangeCursor | None,
+        limit: int = 500,
+    ) -> EventChanges:
+        """Return events in *bbox* changed after *since*, oldest change first.
+
+        Keyset pagination over ``(change_xid, id)`` (``ix_events_change_xid_id``)
+        makes every page an index range scan, and stopping at
+        ``change_horizon()`` means a transaction still running cannot commit
+        behind a token already handed out.  Soft-deleted events are included
+        so clients can evict them, and so are events that moved out of *bbox*
+        since *since* (found in ``event_moves``), with ``moved_out`` set;
+        without *since* (a first sync) both are skipped.
+        """
+        in_area = _bbox_clause(bbox)
+        filters = [Event.change_xid < change_horizon()]
+        if since is None:
+            filters += [in_area, Event.status != "deleted"]
+        else:
+            moved_away = (
+                select(EventMove.id)
+                .where(
+                    EventMove.event_id == Event.id,
+                    EventMove.change_xid >= since.change_xid,
+                    _bbox_clause(bbox, EventMove.location),
+                )
+                .exists()
+            )
+            filters += [
+                tuple_(Event.change_xid, Event.id) > (since.change_xid, since.id),
+                or_(in_area, moved_away),
+            ]
+
+        lng_col, lat_col = _lng_lat_columns()
+        stmt = (
+            select(Event, lng_col, lat_col, in_area.label("in_area"))
+            .where(*filters)
+            .order_by(Event.change_xid, Event.id)
+            .limit(limit + 1)
         )
-        lat_col = func.ST_Y(func.ST_GeomFromWKB(Event.location.cast_to_geometry())).label(
-            "latitude"
+        rows = (await session.execute(stmt)).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        items = [
+            _event_to_list_item(
+                event,
+                lng_val,
+                lat_val,
+                schema=EventChange,
+                updated_at=event.updated_at,
+                moved_out=not inside,
+            )
+            for event, lng_val, lat_val, inside in rows
+        ]
+        if rows:
+            since = ChangeCursor(change_xid=rows[-1][0].change_xid, id=rows[-1][0].id)
+        return EventChanges(
+            items=items,
+            next_token=since.encode() if since is not None else None,
+            has_more=has_more,
         )
 
-        stmt = select(Event, lng_col, lat_col).where(Event.id == event_id)
-        row = (await session.execute(stmt)).first()
+    # ------------------------------------------------------------------
+    # Versions (HTTP validators)
+    # ------------------------------------------------------------------
 
-        if row is None:
-            return None
+    @staticmethod
+    async def get_event_version(session: AsyncSession, event_id: UUID) -> datetime | None:
+        """Return the event's ``updated_at`` (a primary-key lookup), or None if unknown."""
+        stmt = select(Event.updated_at).where(Event.id == event_id)
+        return (await session.execute(stmt)).scalar_one_or_none()
 
-        event, lng_val, lat_val = row
-
-        return EventDetail(
-            id=event.id,
-            title=event.title,
-            description=event.description,
-            category=event.category,
-            latitude=lat_val,
-            longitude=lng_val,
-            address=event.address,
-            city=event.city,
-            country=event.country,
-            start_date=event.start_date,
-            end_date=event.end_date,
-            image_url=event.image_url,
-            ticket_url=event.ticket_url,
-            price_min=float(event.price_min) if event.price_min is not None else None,
-            price_max=float(event.price_max) if event.price_max is not None else None,
-            currency=event.currency,
-            status=event.status,
-            source=event.source,
-            external_id=event.external_id,
-            tags=[EventTagOut(tag=t.tag) for t in event.tags],
-            images=[
-                EventImageOut(id=img.id, image_url=img.image_url, display_order=img.display_order)
-                for img in event.images
-            ],
-            metadata_=event.metadata_,
-            created_at=event.created_at,
-            updated_at=event.updated_at,
-        )
+    @staticmethod
+    async def get_area_version(
+        session: AsyncSession,
+        params: EventsNearbyParams,
+    ) -> tuple[datetime | None, int]:
+        """Return ``(max(updated_at), count)`` over the events the list matches.
+
+        Any insert or edit of a matching event moves ``max(updated_at)``, and
+        an event leaving the list (deleted, moved away, no longer matching a
+        filter) lowers the count.  :meth:`get_nearby_events` returns the same
+        pair from its count query, so this aggregate is only needed to
+        answer a conditional request before building the page.
+        """
+        filters = [_spatial_filter(params), *_attribute_filters(params)]
+        stmt = select(func.max(Event.updated_at), func.count()).where(*filters)
+        last_modified, count = (await session.execute(stmt)).one()
+        return last_modified, count
+
+    @staticmethod
+    async def get_bubbles_version(
+        session: AsyncSession, **filters: Any
+    ) -> tuple[datetime | None, int]:
+        """Return ``(watermark, count)`` for ``get_event_bubbles(**filters)``.
+
+        The watermark is the newest ``updated_at`` the data reflects: the
+        snapshot's ``last_modified`` when the query is served from memory,
+        otherwise ``max(updated_at)`` over the matching events.  Both depend on the
+        data only, so every worker computes the same version for it;
+        :meth:`get_event_bubbles` returns the same pair with the bubbles.
+        """
+        snapshot = _serving_snapshot(filters.get("date_from"))
+        if snapshot is not None:
+            return snapshot.last_modified, snapshot.count(**filters)
+        stmt = select(func.max(Event.updated_at), func.count()).where(*_bubble_filters(**filters))
+        watermark, count = (await session.execute(stmt)).one()
+        return watermark, count
 
     # ------------------------------------------------------------------
     # Text search (ILIKE fallback)
@@ -244,61 +907,72 @@ class EventService:
         *,
         query: str,
         category_id: int | None = None,
+        tags: list[str] | None = None,
+        tags_match: TagMatch = "any",
+        meta: MetaFilters | None = None,
+        lat: float | None = None,
+        lng: float | None = None,
+        radius: float = SEARCH_RADIUS,
         page: int = 1,
         page_size: int = 20,
     ) -> tuple[list[EventListItem], int]:
         """Search events by title/description using ILIKE.
 
+        Without a location, matches are ordered by start date.  With *lat*
+        and *lng*, the search is limited to *radius* meters: the GiST index
+        yields matches nearest-first and only the nearest
+        ``SEARCH_MAX_CANDIDATES`` are ranked, by :func:`_search_score` (text
+        relevance x distance decay x time proximity), so the cost stays
+        bounded however many events match the text.  *total* then counts
+        the ranked candidates.
+
         TODO: Integrate Meilisearch for full-text search when available.
         """
         pattern = f"%{query}%"
 
-        lng_col = func.ST_X(func.ST_GeomFromWKB(Event.location.cast_to_geometry())).label(
-            "longitude"
-        )
-        lat_col = func.ST_Y(func.ST_GeomFromWKB(Event.location.cast_to_geometry())).label(
-            "latitude"
-        )
-
-        base = (
-            select(Event, lng_col, lat_col)
-            .where(
-                Event.status == "active",
-                (Event.title.ilike(pattern)) | (Event.description.ilike(pattern)),
-            )
-        )
+        lng_col, lat_col = _lng_lat_columns()
 
+        filters = [
+            Event.status == "active",
+            (Event.title.ilike(pattern)) | (Event.description.ilike(pattern)),
+        ]
         if category_id is not None:
-            base = base.where(Event.category_id == category_id)
-
-        count_q = select(func.count()).select_from(base.subquery())
-        total = (await session.execute(count_q)).scalar_one()
+            filters.append(Event.category_id == category_id)
+        if tags:
+            filters.append(_tag_filter(tags, tags_match))
+        if meta:
+            filters.extend(_meta_filters(meta))
 
         offset = (page - 1) * page_size
-        rows = (
-            await session.execute(base.order_by(Event.start_date).offset(offset).limit(page_size))
-        ).all()
+        if lat is None or lng is None:
+            base = select(Event, null().label("distance"), lng_col, lat_col).where(*filters)
+            count_q = select(func.count()).select_from(Event).where(*filters)
+            page_q = base.order_by(Event.start_date).offset(offset).limit(page_size)
+        else:
+            ref_point = func.ST_GeogFromText(_point_wkt(lng, lat))
+            candidates = (
+                select(Event.id, func.ST_Distance(Event.location, ref_point).label("distance"))
+                .where(*filters, func.ST_DWithin(Event.location, ref_point, radius))
+                .order_by(Event.location.op("<->")(ref_point))
+                .limit(SEARCH_MAX_CANDIDATES)
+                .subquery("candidates")
+            )
+            score = _search_score(query, candidates.c.distance)
+            count_q = select(func.count()).select_from(candidates)
+            page_q = (
+                select(Event, candidates.c.distance, lng_col, lat_col)
+                .join(candidates, candidates.c.id == Event.id)
+                .order_by(score.desc(), candidates.c.distance, Event.id)
+                .offset(offset)
+                .limit(page_size)
+            )
+        rows, total = await gather_reads(
+            session, partial(_fetch_all, page_q), partial(_fetch_scalar, count_q)
+        )
 
         items = [
-            EventListItem(
-                id=event.id,
-                title=event.title,
-                description=event.description,
-                category=event.category,
-                latitude=lat_val,
-                longitude=lng_val,
-                address=event.address,
-                city=event.city,
-                country=event.country,
-                start_date=event.start_date,
-                end_date=event.end_date,
-                image_url=event.image_url,
-                price_min=float(event.price_min) if event.price_min is not None else None,
-                price_max=float(event.price_max) if event.price_max is not None else None,
-                currency=event.currency,
-                status=event.status,
-            )
-            for event, lng_val, lat_val in rows
+            _event_to_list_item(event, lng_val, lat_val, dist)
+            for event, dist, lng_val, lat_val in rows
         ]
 
         return items, total
@@ -334,8 +1008,8 @@ class EventService:
         )
 
         # Tags
-        for tag_name in data.tags:
-            event.tags.append(EventTag(tag=tag_name))
+        for tag_name in dict.fromkeys(data.tags):
+            event.tag_links.append(EventTag(tag=tag_name))
 
         session.add(event)
         await session.flush()
@@ -372,10 +1046,11 @@ class EventService:
         # Handle tags replacement
         tags = update_data.pop("tags", None)
         if tags is not None:
-            # Remove existing tags and replace
-            event.tags.clear()
-            for tag_name in tags:
-                event.tags.append(EventTag(tag=tag_name))
+            # Replace the rows; the trigger rewrites ``event.tags`` to match.
+            await session.execute(delete(EventTag).where(EventTag.event_id == event.id))
+            session.add_all(
+                EventTag(event_id=event.id, tag=tag_name) for tag_name in dict.fromkeys(tags)
+            )
 
         # Apply remaining scalar fields
         for field, value in update_data.items():
@@ -407,3 +1082,21 @@ class EventService:
         event.status = "deleted"
         await session.flush()
         return True
+
+    # ------------------------------------------------------------------
+    # Startup warmup
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    async def prepare_hot_statements(session: AsyncSession) -> None:
+        """Run the hot read queries once with throwaway parameters.
+
+        Executing them compiles the SQL (SQLAlchemy's compiled cache) and
+        prepares it on the session's connection (asyncpg's per-connection
+        statement cache), so the first real request skips both steps.  The
+        parameters only need to produce the default statement shape.
+        """
+        params = EventsNearbyParams(lat=0.0, lng=0.0, radius=100)
+        await EventService.get_nearby_events(session, params)
+        await EventService.get_event_bubbles(session, lat=0.0, lng=0.0, radius=100)
+        await EventService.get_event_by_id(session, uuid4())
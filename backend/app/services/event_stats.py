@@ -0,0 +1,219 @@
+"""Buffered view and ticket-click counters, and the trending score.
+
+Writing a counter row on every ``GET /events/{id}`` would turn each detail
+read into a write.  Instead each worker adds increments to an in-memory
+:class:`StatsBuffer`, and :func:`run_stats_flusher` drains it every
+``EVENT_STATS_FLUSH_SECONDS`` into ``event_stats`` with one statement::
+
+    INSERT INTO event_stats (...)
+    SELECT ... FROM unnest($1::uuid[], $2::bigint[], ...) AS batch JOIN events ON ...
+    ORDER BY batch.event_id
+    ON CONFLICT (event_id) DO UPDATE SET views = event_stats.views + excluded.views, ...
+
+Each column of the batch is bound as one array, so the statement has four
+parameters whatever the batch size: it stays under the driver's limit on
+bind parameters and is prepared once per connection.  The join drops ids
+of events that do not exist, and the ordering makes workers flushing at
+the same time lock rows in the same order.  Counts
+still buffered when a worker dies are lost — a few seconds of traffic,
+acceptable for a popularity signal.
+
+Trending score: a view weighs :data:`VIEW_WEIGHT`, a ticket click
+:data:`TICKET_CLICK_WEIGHT`, and a hit's weight halves every
+``TRENDING_HALF_LIFE_HOURS``.  Rather than decaying every stored score on
+each tick, scores use forward decay: a hit at time *t* adds
+``w * 2 ** ((t - TRENDING_EPOCH) / half_life)``, so at any moment every
+score is inflated by the same factor and ordering by the stored value is
+ordering by the decayed score.  The sum is stored as its natural log
+(``event_stats.trending``) so it cannot overflow; adding a batch is a
+log-sum-exp.  ``/events/nearby?sort=trending`` orders by that column.
+"""
+
+import logging
+import math
+import time
+from datetime import UTC, datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import BigInteger, Float, bindparam, cast, func, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.config import Settings
+from app.core.metrics import Counter
+from app.database import async_session_factory, get_background_engine
+from app.models.event import Event
+from app.models.event_stats import EventStats
+from app.services.background import run_periodically
+
+logger = logging.getLogger(__name__)
+
+VIEW_WEIGHT = 1.0
+TICKET_CLICK_WEIGHT = 5.0
+TRENDING_EPOCH = datetime(2026, 1, 1, tzinfo=UTC)
+
+# Distinct events a buffer holds; increments for further events are dropped
+# until the next flush (only reached when flushes keep failing).
+STATS_BUFFER_MAX_EVENTS = 50_000
+
+# Trending order changes without any event changing; list ETags for it are
+# cut into windows of this many seconds.
+TRENDING_ETAG_SECONDS = 60
+
+STATS_FLUSHED = Counter(
+    "eventbuzz_event_stats_flushed_total",
+    "Buffered counter increments written to event_stats.",
+    ("kind",),
+)
+STATS_DROPPED = Counter(
+    "eventbuzz_event_stats_dropped_total",
+    "Counter increments dropped because the buffer was full.",
+)
+
+
+class StatsBuffer:
+    """Per-worker accumulator of view and ticket-click increments."""
+
+    def __init__(self, max_events: int = STATS_BUFFER_MAX_EVENTS) -> None:
+        self.max_events = max_events
+        self._counts: dict[UUID, list[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def add(self, event_id: UUID, *, views: int = 0, ticket_clicks: int = 0) -> None:
+        counts = self._counts.get(event_id)
+        if counts is None:
+            if len(self._counts) >= self.max_events:
+                STATS_DROPPED.inc(views + ticket_clicks)
+                return
+            counts = self._counts[event_id] = [0, 0]
+        counts[0] += views
+        counts[1] += ticket_clicks
+
+    def drain(self) -> dict[UUID, list[int]]:
+        """Return the buffered counts and start a new batch."""
+        counts, self._counts = self._counts, {}
+        return counts
+
+    def restore(self, counts: dict[UUID, list[int]]) -> None:
+        """Put back counts from a flush that did not commit."""
+        for event_id, (views, ticket_clicks) in counts.items():
+            self.add(event_id, views=views, ticket_clicks=ticket_clicks)
+
+
+# Installed by run_stats_flusher(); while it is None (counters disabled, or
+# outside the app) increments are discarded.
+_buffer: StatsBuffer | None = None
+
+
+def record_view(event_id: UUID) -> None:
+    """Count one view of *event_id* (no I/O)."""
+    if _buffer is not None:
+        _buffer.add(event_id, views=1)
+
+
+def record_ticket_click(event_id: UUID) -> None:
+    """Count one ticket click on *event_id* (no I/O)."""
+    if _buffer is not None:
+        _buffer.add(event_id, ticket_clicks=1)
+
+
+def trending_boost(views: int, ticket_clicks: int, at: datetime, half_life_hours: float) -> float:
+    """Log of the forward-decayed weight of hits made at *at*."""
+    weight = views * VIEW_WEIGHT + ticket_clicks * TICKET_CLICK_WEIGHT
+    hours = (at - TRENDING_EPOCH).total_seconds() / 3600
+    return math.log(weight) + hours / half_life_hours * math.log(2)
+
+
+def trending_window() -> int:
+    """Number of the current ETag window for trending-ordered lists."""
+    return int(time.time() // TRENDING_ETAG_SECONDS)
+
+
+def flush_statement(counts: dict[UUID, list[int]], at: datetime, half_life_hours: float):
+    """Build the upsert adding *counts* (hits made at *at*) to ``event_stats``."""
+    ids = list(counts)
+    boosts = [trending_boost(*counts[event_id], at, half_life_hours) for event_id in ids]
+
+    def array(name: str, value: list, item_type) -> Any:
+        return cast(bindparam(name, value), ARRAY(item_type))
+
+    batch = (
+        func.unnest(
+            array("event_ids", ids, PG_UUID(as_uuid=True)),
+            array("views", [counts[event_id][0] for event_id in ids], BigInteger),
+            array("ticket_clicks", [counts[event_id][1] for event_id in ids], BigInteger),
+            array("trending", boosts, Float),
+        )
+        .table_valued("event_id", "views", "ticket_clicks", "trending")
+        .render_derived(name="batch")
+    )
+    rows = (
+        select(batch.c.event_id, batch.c.views, batch.c.ticket_clicks, batch.c.trending)
+        .join(Event, Event.id == batch.c.event_id)
+        .order_by(batch.c.event_id)
+    )
+    stmt = insert(EventStats).from_select(["event_id", "views", "ticket_clicks", "trending"], rows)
+    old, new = EventStats.trending, stmt.excluded.trending
+    return stmt.on_conflict_do_update(
+        index_elements=[EventStats.event_id],
+        set_={
+            "views": EventStats.views + stmt.excluded.views,
+            "ticket_clicks": EventStats.ticket_clicks + stmt.excluded.ticket_clicks,
+            # log(exp(old) + exp(new)) without overflow
+            "trending": func.greatest(old, new) + func.ln(1 + func.exp(-func.abs(old - new))),
+            "updated_at": func.now(),
+        },
+    )
+
+
+async def flush_stats(buffer: StatsBuffer, settings: Settings) -> int:
+    """Write the buffered counts in one statement.  Returns the number of events.
+
+    On failure (or cancellation) the counts go back into *buffer* for the
+    next flush, and the error is raised.
+    """
+    counts = buffer.drain()
+    if not counts:
+        return 0
+    stmt = flush_statement(counts, datetime.now(UTC), settings.TRENDING_HALF_LIFE_HOURS)
+    try:
+        async with async_session_factory(bind=get_background_engine()) as session, session.begin():
+            await session.execute(stmt)
+    except BaseException:
+        buffer.restore(counts)
+        raise
+    STATS_FLUSHED.inc(sum(views for views, _ in counts.values()), kind="view")
+    STATS_FLUSHED.inc(sum(clicks for _, clicks in counts.values()), kind="ticket_click")
+    return len(counts)
+
+
+async def flush_pending_stats(settings: Settings) -> None:
+    """Flush what is still buffered (at shutdown), logging failures."""
+    if _buffer is None:
+        return
+    try:
+        await flush_stats(_buffer, settings)
+    except (SQLAlchemyError, OSError) as exc:
+        logger.warning("Event stats flush failed, %d events lost: %r", len(_buffer), exc)
+
+
+async def run_stats_flusher(settings: Settings) -> None:
+    """Buffer counter increments in this worker and flush them, forever.
+
+    A failed flush puts its counts back in the buffer for the next tick.
+    """
+    global _buffer
+    if _buffer is None:
+        _buffer = StatsBuffer()
+    buffer = _buffer
+
+    async def step() -> None:
+        await flush_stats(buffer, settings)
+
+    await run_periodically(
+        "Event stats flush", step, settings.EVENT_STATS_FLUSH_SECONDS, wait_first=True
+    )
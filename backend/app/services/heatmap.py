@@ -0,0 +1,100 @@
+"""Event density heatmap backed by a materialized aggregate.
+
+``/events/heatmap`` never touches ``events``: it sums rows of the
+``event_heatmap`` materialized view (migration 0006), which counts active
+events per grid cell, category and week (by start date, weeks starting on
+Monday UTC) at the cell sizes in :data:`HEATMAP_LEVELS`.  Latency therefore
+depends on the number of cells in the viewport, not on the size of the
+events table.
+
+:func:`run_heatmap_refresher` keeps the view current.  Every
+``HEATMAP_REFRESH_SECONDS`` each worker checks whether any event changed
+since the last refresh (``max(events.updated_at)`` against the watermark
+in ``event_heatmap_refresh``); if so, the worker that wins a transaction
+advisory lock runs ``REFRESH MATERIALIZED VIEW CONCURRENTLY``, which
+leaves the view readable throughout, and advances the watermark in the
+same transaction.  Soft deletes bump ``updated_at`` and are picked up the
+same way.
+"""
+
+import logging
+import math
+from datetime import date, timedelta
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import Settings
+from app.database import async_session_factory, get_background_engine
+from app.models.event import Event
+from app.models.event_heatmap import HeatmapRefresh
+from app.services.background import run_periodically
+
+logger = logging.getLogger(__name__)
+
+# Cell edge lengths in degrees, indexed by the view's ``level`` column.  Must
+# match the levels the migration aggregates.
+HEATMAP_LEVELS: tuple[float, ...] = (2.0, 0.5, 0.1, 0.02)
+
+# Target heatmap resolution: cells across one 256 px map tile.
+HEATMAP_CELLS_PER_TILE = 8
+
+# pg_try_advisory_xact_lock key serializing refreshes across workers.
+HEATMAP_LOCK_KEY = 0x68656174
+
+_REFRESH = text("REFRESH MATERIALIZED VIEW CONCURRENTLY event_heatmap")
+
+
+def heatmap_level(zoom: int) -> int:
+    """Return the level whose cell size is closest (in log scale) to the ideal at *zoom*."""
+    ideal = 360 / 2**zoom / HEATMAP_CELLS_PER_TILE
+    return min(
+        range(len(HEATMAP_LEVELS)),
+        key=lambda level: abs(math.log(HEATMAP_LEVELS[level] / ideal)),
+    )
+
+
+def week_start(day: date) -> date:
+    """Return the Monday of *day*'s week (``date_trunc('week', ...)``)."""
+    return day - timedelta(days=day.weekday())
+
+
+async def refresh_heatmap(session: AsyncSession) -> bool:
+    """Refresh ``event_heatmap`` if events changed since the last refresh.
+
+    Must run inside a transaction on the primary.  Returns whether a refresh
+    ran; ``False`` when nothing changed or another worker holds the lock.
+    """
+    lock = select(func.pg_try_advisory_xact_lock(HEATMAP_LOCK_KEY))
+    if not (await session.execute(lock)).scalar_one():
+        return False
+
+    head = (await session.execute(select(func.max(Event.updated_at)))).scalar_one()
+    state = await session.get(HeatmapRefresh, 1)
+    if state is None:
+        state = HeatmapRefresh(id=1)
+        session.add(state)
+    elif head is None or (state.refreshed_through is not None and head <= state.refreshed_through):
+        return False
+
+    await session.execute(_REFRESH)
+    state.refreshed_through = head
+    state.refreshed_at = func.now()
+    return True
+
+
+async def run_heatmap_refresher(settings: Settings) -> None:
+    """Keep ``event_heatmap`` current, forever.
+
+    Failures are logged and retried on the next tick (see
+    :func:`run_periodically`); meanwhile the heatmap keeps serving the last
+    refreshed counts.
+    """
+
+    async def step() -> None:
+        async with async_session_factory(bind=get_background_engine()) as session, session.begin():
+            refreshed = await refresh_heatmap(session)
+        if refreshed:
+            logger.info("Event heatmap refreshed")
+
+    await run_periodically("Event heatmap refresh", step, settings.HEATMAP_REFRESH_SECONDS)
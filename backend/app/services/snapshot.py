@@ -0,0 +1,485 @@
+"""In-process snapshot of active events for map bubble queries.
+
+With ``BUBBLE_SNAPSHOT_ENABLED`` each worker keeps a columnar copy of the
+active events that have not ended (coordinates, category, time range) in
+NumPy arrays, indexed by a uniform lat/lng grid.  ``/events/bubbles``
+requests with a time window are then answered from memory — a grid lookup,
+an exact bbox test or vectorized haversine, and category/time masks —
+instead of a PostGIS query.
+
+A background task (:func:`run_snapshot_refresher`) keeps the snapshot
+current: every few seconds it applies the rows changed by transactions
+that finished since the last pass (``events.change_xid`` below
+``change_horizon()``, so a long transaction is applied when it ends rather
+than missed), and every ``BUBBLE_SNAPSHOT_REBUILD_SECONDS`` it loads
+a new snapshot (dropping events that have ended) and swaps it in.  The
+event service only uses a snapshot that refreshed recently enough; when the
+refresher falls behind, requests go back to SQL.  With ``BUBBLE_SNAPSHOT_DIR``
+set, the workers share one memory-mapped copy instead
+(:mod:`app.services.snapshot_file`).
+
+Distances are great-circle (haversine) rather than PostGIS's spheroid, so
+matches within about 0.3% of the radius edge may differ.
+"""
+
+import logging
+import math
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable, Iterable
+from datetime import UTC, datetime, timedelta
+from typing import Any, NamedTuple
+from uuid import UUID
+
+import numpy as np
+from geoalchemy2 import Geometry
+from sqlalchemy import cast, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import Settings
+from app.database import autocommit_engine, get_background_engine, read_session_factory
+from app.models.category import Category
+from app.models.event import Event, change_horizon
+from app.schemas.event import BoundingBox, EventBubble
+from app.services.background import run_periodically
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_M = 6_371_008.8
+GRID_CELL_DEG = 0.05  # ~5.5 km of latitude
+_GRID_ROWS = round(180 / GRID_CELL_DEG)
+_GRID_COLS = round(360 / GRID_CELL_DEG)
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+DEFAULT_COLOR = "#6750A4"
+
+
+class SnapshotRow(NamedTuple):
+    """One event as loaded into (or evicted from) a snapshot."""
+
+    id: UUID
+    title: str
+    latitude: float
+    longitude: float
+    category_id: int
+    status: str
+    start_date: datetime
+    end: datetime | None  # upper(during)
+    updated_at: datetime
+
+
+def _micros(value: datetime) -> int:
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+
+def _cell_keys(lat: np.ndarray, lng: np.ndarray) -> np.ndarray:
+    rows = np.clip(((lat + 90) / GRID_CELL_DEG).astype(np.int64), 0, _GRID_ROWS - 1)
+    cols = np.clip(((lng + 180) / GRID_CELL_DEG).astype(np.int64), 0, _GRID_COLS - 1)
+    return rows * _GRID_COLS + cols
+
+
+def haversine_m(lat: float, lng: float, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """Great-circle distance in meters from (*lat*, *lng*) to each point."""
+    phi1, phi2 = math.radians(lat), np.radians(lats)
+    dphi = phi2 - phi1
+    dlmb = np.radians(lngs - lng)
+    a = np.sin(dphi / 2) ** 2 + math.cos(phi1) * np.cos(phi2) * np.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def radius_bbox(lat: float, lng: float, radius: float) -> BoundingBox:
+    """The lng/lat box enclosing a *radius*-meter circle (wrapping at ±180°)."""
+    dlat = math.degrees(radius / EARTH_RADIUS_M)
+    min_lat, max_lat = max(lat - dlat, -90.0), min(lat + dlat, 90.0)
+    cos_lat = math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+    dlng = 180.0 if cos_lat < 1e-6 else math.degrees(radius / (EARTH_RADIUS_M * cos_lat))
+    if dlng >= 180:
+        return BoundingBox(min_lng=-180, min_lat=min_lat, max_lng=180, max_lat=max_lat)
+    min_lng = lng - dlng + (360 if lng - dlng < -180 else 0)
+    max_lng = lng + dlng - (360 if lng + dlng > 180 else 0)
+    return BoundingBox(min_lng=min_lng, min_lat=min_lat, max_lng=max_lng, max_lat=max_lat)
+
+
+class SnapshotIndex(ABC):
+    """Query side shared by the in-process and the memory-mapped snapshots.
+
+    Subclasses provide the coordinate, category and time columns, the grid
+    index (cell keys in ascending order, plus the row of each key or
+    ``None`` when rows are stored in key order), the age of the data and
+    the conversion of matching rows to bubbles.
+    """
+
+    coverage_start: datetime
+    last_modified: datetime | None  # newest updated_at applied: the data's version
+    max_staleness: float
+    _lat: np.ndarray
+    _lng: np.ndarray
+    _cat: np.ndarray
+    _start: np.ndarray  # start_date, epoch microseconds
+    _end: np.ndarray  # upper(during), epoch microseconds
+
+    @abstractmethod
+    def _index(self) -> tuple[np.ndarray, np.ndarray | None]:
+        """Grid cell keys in ascending order, and the row of each (or ``None``)."""
+
+    @abstractmethod
+    def _age(self) -> float:
+        """Seconds since the data was last known to be current."""
+
+    @abstractmethod
+    def _bubbles(self, slots: np.ndarray) -> list[EventBubble]:
+        """Bubbles for the rows *slots*, in that order."""
+
+    def can_serve(self, date_from: datetime | None) -> bool:
+        """Whether a query starting at *date_from* may be answered from memory.
+
+        The snapshot must have refreshed within ``max_staleness`` seconds, and
+        the window must start inside the covered period: events that ended
+        before ``coverage_start`` are not held, so windowless queries (which
+        also match past events) stay on SQL.
+        """
+        return (
+            date_from is not None
+            and date_from >= self.coverage_start
+            and self._age() <= self.max_staleness
+        )
+
+    def _in_envelope(self, envelope: tuple[float, float, float, float]) -> np.ndarray:
+        """Rows of live events inside one non-wrapping lng/lat envelope."""
+        keys, slots = self._index()
+        min_lng, min_lat, max_lng, max_lat = envelope
+        row0, row1 = (
+            int(np.clip((v + 90) // GRID_CELL_DEG, 0, _GRID_ROWS - 1)) for v in (min_lat, max_lat)
+        )
+        col0, col1 = (
+            int(np.clip((v + 180) // GRID_CELL_DEG, 0, _GRID_COLS - 1)) for v in (min_lng, max_lng)
+        )
+        starts = np.arange(row0, row1 + 1) * _GRID_COLS
+        lo = np.searchsorted(keys, starts + col0, side="left")
+        hi = np.searchsorted(keys, starts + col1, side="right")
+        if not len(lo) or not (hi - lo).any():
+            return np.empty(0, dtype=np.int64)
+        pairs = zip(lo, hi, strict=True)
+        if slots is None:
+            candidates = np.concatenate([np.arange(a, b) for a, b in pairs])
+        else:
+            candidates = np.concatenate([slots[a:b] for a, b in pairs])
+        lat, lng = self._lat[candidates], self._lng[candidates]
+        inside = (lat >= min_lat) & (lat <= max_lat) & (lng >= min_lng) & (lng <= max_lng)
+        return candidates[inside]
+
+    def query(self, **filters: Any) -> list[EventBubble]:
+        """Bubbles matching the same filters as ``EventService.get_event_bubbles``."""
+        return self._bubbles(self._matches(**filters))
+
+    def count(self, **filters: Any) -> int:
+        """Number of bubbles :meth:`query` would return, without building them."""
+        return len(self._matches(**filters))
+
+    def _matches(
+        self,
+        *,
+        lat: float | None = None,
+        lng: float | None = None,
+        radius: float = 5000,
+        bbox: BoundingBox | None = None,
+        category_id: int | None = None,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+    ) -> np.ndarray:
+        area = bbox if bbox is not None else radius_bbox(lat, lng, radius)
+        found = [self._in_envelope(env) for env in area.envelopes()]
+        slots = np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+
+        mask = np.ones(len(slots), dtype=bool)
+        if bbox is None:
+            mask &= haversine_m(lat, lng, self._lat[slots], self._lng[slots]) <= radius
+        if category_id is not None:
+            mask &= self._cat[slots] == category_id
+        # ``during && [date_from, date_to]`` with during = [start, end), or
+        # [start, start] for zero-length events.
+        if date_from is not None:
+            start, end = self._start[slots], self._end[slots]
+            since = _micros(date_from)
+            mask &= (end > since) | ((end == start) & (start >= since))
+        if date_to is not None:
+            mask &= self._start[slots] <= _micros(date_to)
+        return slots[mask]
+
+
+class EventSnapshot(SnapshotIndex):
+    """Columnar, grid-indexed copy of the active events ending after *coverage_start*.
+
+    Rows are upserted and evicted in place (freed slots are reused); the
+    grid index — row numbers sorted by cell key — is rebuilt lazily on the
+    first query after a change.  All methods are synchronous, so on the
+    event loop a query never observes a half-applied refresh.
+    """
+
+    def __init__(
+        self,
+        *,
+        coverage_start: datetime,
+        colors: dict[int, str],
+        max_staleness: float,
+        capacity: int = 1024,
+    ) -> None:
+        self.coverage_start = coverage_start
+        self.colors = colors
+        self.max_staleness = max_staleness
+        self.cursor: int | None = None  # change horizon: every change below it is applied
+        self.last_modified: datetime | None = None
+        self.generation = 0  # bumped whenever the contents change
+        self.refreshed_at = float("-inf")  # time.monotonic() of the last refresh
+
+        self._coverage_us = _micros(coverage_start)
+        self._lat = np.empty(capacity)
+        self._lng = np.empty(capacity)
+        self._cat = np.empty(capacity, dtype=np.int64)
+        self._start = np.empty(capacity, dtype=np.int64)
+        self._end = np.empty(capacity, dtype=np.int64)
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._ids = np.empty(capacity, dtype=object)
+        self._titles = np.empty(capacity, dtype=object)
+        self._start_dates = np.empty(capacity, dtype=object)
+        self._slots: dict[UUID, int] = {}
+        self._free: list[int] = []
+        self._size = 0  # slots ever used
+        self._grid: tuple[np.ndarray, np.ndarray] | None = None  # (sorted keys, slots)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    # -- Maintenance ------------------------------------------------------
+
+    def _grow(self) -> None:
+        capacity = len(self._alive) * 2
+        for name in ("_lat", "_lng", "_cat", "_start", "_end", "_ids", "_titles", "_start_dates"):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[: len(old)] = old
+            setattr(self, name, new)
+        alive = np.zeros(capacity, dtype=bool)
+        alive[: self._size] = self._alive[: self._size]
+        self._alive = alive
+
+    def _keeps(self, row: SnapshotRow) -> bool:
+        # A NULL ``during`` never matches a time filter in SQL either.
+        return (
+            row.status == "active"
+            and row.end is not None
+            and row.end >= row.start_date
+            and _micros(row.end) > self._coverage_us
+        )
+
+    def apply(self, rows: Iterable[SnapshotRow]) -> int:
+        """Upsert rows that belong in the snapshot and evict the rest.
+
+        Returns the number of rows that changed the snapshot.
+        """
+        changed = 0
+        for row in rows:
+            slot = self._slots.get(row.id)
+            if not self._keeps(row):
+                if slot is not None:
+                    del self._slots[row.id]
+                    self._alive[slot] = False
+                    self._ids[slot] = self._titles[slot] = self._start_dates[slot] = None
+                    self._free.append(slot)
+                    changed += 1
+                continue
+
+            if slot is None:
+                if self._free:
+                    slot = self._free.pop()
+                else:
+                    if self._size == len(self._alive):
+                        self._grow()
+                    slot = self._size
+                    self._size += 1
+                self._slots[row.id] = slot
+            self._lat[slot] = row.latitude
+            self._lng[slot] = row.longitude
+            self._cat[slot] = row.category_id
+            self._start[slot] = _micros(row.start_date)
+            self._end[slot] = _micros(row.end)
+            self._ids[slot] = row.id
+            self._titles[slot] = row.title
+            self._start_dates[slot] = row.start_date
+            self._alive[slot] = True
+            changed += 1
+
+        if changed:
+            self._grid = None
+            self.generation += 1
+        return changed
+
+    def _index(self) -> tuple[np.ndarray, np.ndarray]:
+        if self._grid is None:
+            slots = np.flatnonzero(self._alive[: self._size])
+            keys = _cell_keys(self._lat[slots], self._lng[slots])
+            order = np.argsort(keys, kind="stable")
+            self._grid = keys[order], slots[order]
+        return self._grid
+
+    def columns(self) -> dict[str, np.ndarray]:
+        """The live rows in grid order, as contiguous columns (for the shared file)."""
+        keys, slots = self._index()
+        titles = [title.encode() for title in self._titles[slots]]
+        return {
+            "keys": keys,
+            "lat": self._lat[slots],
+            "lng": self._lng[slots],
+            "cat": self._cat[slots],
+            "start": self._start[slots],
+            "end": self._end[slots],
+            "id": np.frombuffer(
+                b"".join(event_id.bytes for event_id in self._ids[slots]), dtype=np.uint8
+            ).reshape(-1, 16),
+            "title": np.frombuffer(b"".join(titles), dtype=np.uint8),
+            "title_offsets": np.cumsum([0, *map(len, titles)], dtype=np.int64),
+        }
+
+    # -- Queries ----------------------------------------------------------
+
+    def _age(self) -> float:
+        return time.monotonic() - self.refreshed_at
+
+    def _bubbles(self, slots: np.ndarray) -> list[EventBubble]:
+        return [
+            EventBubble.model_construct(
+                id=event_id,
+                title=title,
+                latitude=float(lat_val),
+                longitude=float(lng_val),
+                category_id=int(cat),
+                color_hex=self.colors.get(int(cat), DEFAULT_COLOR),
+                start_date=start_date,
+            )
+            for event_id, title, lat_val, lng_val, cat, start_date in zip(
+                self._ids[slots],
+                self._titles[slots],
+                self._lat[slots],
+                self._lng[slots],
+                self._cat[slots],
+                self._start_dates[slots],
+                strict=True,
+            )
+        ]
+
+
+# ---------------------------------------------------------------------------
+# Loading from the database
+# ---------------------------------------------------------------------------
+
+
+def _row_query():
+    point = cast(Event.location, Geometry(geometry_type="POINT", srid=4326))
+    return select(
+        Event.id,
+        Event.title,
+        func.ST_Y(point),
+        func.ST_X(point),
+        Event.category_id,
+        Event.status,
+        Event.start_date,
+        func.upper(Event.during),
+        Event.updated_at,
+    )
+
+
+async def _load_colors(session: AsyncSession) -> dict[int, str]:
+    rows = await session.execute(select(Category.id, Category.color_hex))
+    return dict(rows.tuples().all())
+
+
+async def load_snapshot(
+    session: AsyncSession, *, history: timedelta, max_staleness: float
+) -> EventSnapshot:
+    """Build a snapshot of the active events that ended less than *history* ago."""
+    coverage_start = datetime.now(UTC) - history
+    # Read the horizon first: anything committed while the rows load is
+    # applied again by the next incremental refresh.
+    cursor, last_modified = (
+        await session.execute(select(change_horizon(), func.max(Event.updated_at)))
+    ).one()
+    snapshot = EventSnapshot(
+        coverage_start=coverage_start,
+        colors=await _load_colors(session),
+        max_staleness=max_staleness,
+    )
+    rows = await session.execute(
+        _row_query().where(Event.status == "active", func.upper(Event.during) > coverage_start)
+    )
+    snapshot.apply(SnapshotRow(*row) for row in rows)
+    snapshot.cursor, snapshot.last_modified = cursor, last_modified
+    snapshot.refreshed_at = time.monotonic()
+    return snapshot
+
+
+async def refresh_snapshot(session: AsyncSession, snapshot: EventSnapshot) -> int:
+    """Apply the rows changed since *snapshot*'s cursor; return how many changed it.
+
+    Each pass reads the changes between the cursor and the current
+    ``change_horizon()``: every transaction below it has finished, so none
+    can commit behind the new cursor.
+    """
+    horizon = (await session.execute(select(change_horizon()))).scalar_one()
+    stmt = _row_query().where(Event.change_xid < horizon)
+    if snapshot.cursor is not None:
+        stmt = stmt.where(Event.change_xid >= snapshot.cursor)
+    rows = [SnapshotRow(*row) for row in await session.execute(stmt)]
+
+    if any(row.category_id not in snapshot.colors for row in rows):
+        snapshot.colors = await _load_colors(session)
+    changed = snapshot.apply(rows)
+    if rows:
+        newest = max(row.updated_at for row in rows)
+        snapshot.last_modified = max(snapshot.last_modified or newest, newest)
+    snapshot.cursor = horizon
+    snapshot.refreshed_at = time.monotonic()
+    return changed
+
+
+async def run_snapshot_refresher(
+    settings: Settings,
+    publish: Callable[[EventSnapshot, bool], Awaitable[None]] | None = None,
+) -> None:
+    """Keep a bubble snapshot current, forever.
+
+    Reads go through the background pool on the primary
+    (:func:`~app.database.get_background_engine`).  After every pass
+    ``publish(snapshot, changed)`` is awaited; by default it installs the
+    snapshot in this process.  Failures are logged and retried on the next
+    tick (see :func:`run_periodically`); meanwhile the snapshot goes stale
+    and bubble queries fall back to SQL.
+    """
+    if publish is None:
+        from app.services.event_service import set_bubble_snapshot
+
+        async def publish(snapshot: EventSnapshot, changed: bool) -> None:
+            set_bubble_snapshot(snapshot)
+
+    history = timedelta(hours=settings.BUBBLE_SNAPSHOT_HISTORY_HOURS)
+    snapshot: EventSnapshot | None = None
+    built_at = float("-inf")
+
+    async def step() -> None:
+        nonlocal snapshot, built_at
+        bind = autocommit_engine(get_background_engine())
+        async with read_session_factory(bind=bind) as session:
+            if time.monotonic() - built_at >= settings.BUBBLE_SNAPSHOT_REBUILD_SECONDS:
+                snapshot = await load_snapshot(
+                    session,
+                    history=history,
+                    max_staleness=settings.BUBBLE_SNAPSHOT_MAX_STALENESS,
+                )
+                built_at = time.monotonic()
+                changed = True
+                logger.info("Bubble snapshot loaded: %d events", len(snapshot))
+            else:
+                changed = await refresh_snapshot(session, snapshot) > 0
+        await publish(snapshot, changed)
+
+    await run_periodically(
+        "Bubble snapshot refresh", step, settings.BUBBLE_SNAPSHOT_REFRESH_SECONDS
+    )
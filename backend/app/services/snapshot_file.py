@@ -0,0 +1,246 @@
+"""Bubble snapshot shared by all API workers through a memory-mapped file.
+
+With ``BUBBLE_SNAPSHOT_DIR`` set (ideally on tmpfs, e.g. ``/dev/shm``), the
+workers of one host stop keeping private snapshots.  One of them — whichever
+holds the ``refresher.lock`` file lock — runs the refresher and publishes
+each new version as an immutable file::
+
+    EBSNAP1\\n | header length (u64 LE) | JSON header | 64-byte aligned columns
+
+and atomically repoints ``CURRENT`` at it; passes that change nothing just
+touch ``CURRENT`` as a heartbeat.  Every worker polls ``CURRENT`` once a
+second, ``mmap``\\ s new versions and swaps them in; the columns are NumPy
+views of the mapping, so the data lives once in the page cache however
+many workers there are.  Superseded files are unlinked after a few
+versions; workers still mapping one keep it alive until they let go.
+
+If the lock holder exits, another worker takes the lock on its next poll.
+"""
+
+import asyncio
+import contextlib
+import fcntl
+import json
+import logging
+import math
+import mmap
+import os
+import struct
+import time
+from datetime import datetime, timedelta
+from functools import partial
+from pathlib import Path
+from typing import IO
+from uuid import UUID
+
+import numpy as np
+
+from app.config import Settings
+from app.schemas.event import EventBubble
+from app.services.snapshot import (
+    DEFAULT_COLOR,
+    EPOCH,
+    EventSnapshot,
+    SnapshotIndex,
+    run_snapshot_refresher,
+)
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"EBSNAP1\n"
+POINTER = "CURRENT"
+LOCK = "refresher.lock"
+KEEP_VERSIONS = 3
+WATCH_INTERVAL = 1.0  # seconds between polls of CURRENT
+
+_HEADER_LEN = struct.Struct("<Q")
+_ALIGN = 64
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGN) * _ALIGN
+
+
+def write_snapshot(snapshot: EventSnapshot, directory: Path) -> Path:
+    """Write *snapshot* as a new version file and point ``CURRENT`` at it."""
+    version = time.time_ns()
+    columns = snapshot.columns()
+    layout, size = {}, 0
+    for name, array in columns.items():
+        size = _aligned(size)
+        layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": size}
+        size += array.nbytes
+    header = json.dumps(
+        {
+            "version": version,
+            "coverage_start": snapshot.coverage_start.isoformat(),
+            "last_modified": (
+                snapshot.last_modified.isoformat() if snapshot.last_modified else None
+            ),
+            "colors": {str(category_id): color for category_id, color in snapshot.colors.items()},
+            "columns": layout,
+        }
+    ).encode()
+    data_start = _aligned(len(MAGIC) + _HEADER_LEN.size + len(header))
+
+    path = directory / f"bubbles-{version}.snap"
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        f.write(MAGIC + _HEADER_LEN.pack(len(header)) + header)
+        for name, array in columns.items():
+            f.seek(data_start + layout[name]["offset"])
+            f.write(np.ascontiguousarray(array).data)
+        f.truncate(data_start + size)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+    pointer_tmp = directory / f"{POINTER}.tmp"
+    pointer_tmp.write_text(path.name)
+    os.replace(pointer_tmp, directory / POINTER)
+
+    for stale in sorted(directory.glob("bubbles-*.snap"))[:-KEEP_VERSIONS]:
+        stale.unlink(missing_ok=True)
+    return path
+
+
+async def publish_snapshot(directory: Path, snapshot: EventSnapshot, changed: bool) -> None:
+    """Refresher callback: write a new version when *changed*, else heartbeat."""
+    if changed:
+        await asyncio.to_thread(write_snapshot, snapshot, directory)
+    else:
+        os.utime(directory / POINTER)
+
+
+class MappedSnapshot(SnapshotIndex):
+    """Read-only view of one snapshot file; every column is zero-copy."""
+
+    def __init__(self, path: Path, *, max_staleness: float) -> None:
+        with open(path, "rb") as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if buf[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a bubble snapshot")
+        (header_len,) = _HEADER_LEN.unpack_from(buf, len(MAGIC))
+        header_start = len(MAGIC) + _HEADER_LEN.size
+        header = json.loads(buf[header_start : header_start + header_len])
+        data_start = _aligned(header_start + header_len)
+
+        columns = {
+            name: np.frombuffer(
+                buf,
+                dtype=np.dtype(spec["dtype"]),
+                count=math.prod(spec["shape"]),
+                offset=data_start + spec["offset"],
+            ).reshape(spec["shape"])
+            for name, spec in header["columns"].items()
+        }
+
+        self.path = path
+        self.max_staleness = max_staleness
+        self.generation = header["version"]
+        self.coverage_start = datetime.fromisoformat(header["coverage_start"])
+        last_modified = header["last_modified"]
+        self.last_modified = datetime.fromisoformat(last_modified) if last_modified else None
+        self.colors = {int(category_id): color for category_id, color in header["colors"].items()}
+        self.heartbeat = os.stat(path).st_mtime  # wall clock; advanced by the watcher
+
+        self._keys = columns["keys"]
+        self._lat = columns["lat"]
+        self._lng = columns["lng"]
+        self._cat = columns["cat"]
+        self._start = columns["start"]
+        self._end = columns["end"]
+        self._ids = columns["id"]
+        self._titles = columns["title"]
+        self._title_offsets = columns["title_offsets"]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _index(self) -> tuple[np.ndarray, None]:
+        # Rows are stored in grid order.
+        return self._keys, None
+
+    def _age(self) -> float:
+        return time.time() - self.heartbeat
+
+    def _bubbles(self, slots: np.ndarray) -> list[EventBubble]:
+        offsets = self._title_offsets
+        return [
+            EventBubble.model_construct(
+                id=UUID(bytes=self._ids[row].tobytes()),
+                title=self._titles[offsets[row] : offsets[row + 1]].tobytes().decode(),
+                latitude=float(self._lat[row]),
+                longitude=float(self._lng[row]),
+                category_id=int(self._cat[row]),
+                color_hex=self.colors.get(int(self._cat[row]), DEFAULT_COLOR),
+                start_date=EPOCH + timedelta(microseconds=int(self._start[row])),
+            )
+            for row in slots.tolist()
+        ]
+
+
+class SnapshotWatcher:
+    """Follows ``CURRENT`` in *directory*, mapping each new version once."""
+
+    def __init__(self, directory: Path, *, max_staleness: float) -> None:
+        self.directory = directory
+        self.max_staleness = max_staleness
+        self.current: MappedSnapshot | None = None
+
+    def poll(self) -> MappedSnapshot | None:
+        """Pick up a new version and the latest heartbeat; return the current view."""
+        pointer = self.directory / POINTER
+        try:
+            heartbeat = pointer.stat().st_mtime
+            name = pointer.read_text().strip()
+        except FileNotFoundError:
+            return self.current
+        if self.current is None or self.current.path.name != name:
+            self.current = MappedSnapshot(self.directory / name, max_staleness=self.max_staleness)
+        self.current.heartbeat = heartbeat
+        return self.current
+
+
+def _try_lock(lock: IO) -> bool:
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return False
+    return True
+
+
+async def run_shared_snapshot(settings: Settings) -> None:
+    """Serve bubbles from the shared snapshot; refresh it while holding the lock."""
+    from app.services.event_service import set_bubble_snapshot
+
+    directory = Path(settings.BUBBLE_SNAPSHOT_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    watcher = SnapshotWatcher(directory, max_staleness=settings.BUBBLE_SNAPSHOT_MAX_STALENESS)
+    refresher: asyncio.Task | None = None
+    with open(directory / LOCK, "a") as lock:
+        try:
+            while True:
+                if refresher is not None and refresher.done():
+                    logger.error("Bubble snapshot refresher stopped: %r", refresher.exception())
+                    refresher = None
+                if refresher is None and _try_lock(lock):
+                    logger.info("Refreshing the shared bubble snapshot in pid %d", os.getpid())
+                    refresher = asyncio.create_task(
+                        run_snapshot_refresher(settings, partial(publish_snapshot, directory))
+                    )
+
+                previous = watcher.current
+                try:
+                    current = watcher.poll()
+                except (OSError, ValueError) as exc:
+                    logger.warning("Could not map the shared bubble snapshot: %r", exc)
+                else:
+                    if current is not previous:
+                        set_bubble_snapshot(current)
+                await asyncio.sleep(WATCH_INTERVAL)
+        finally:
+            if refresher is not None:
+                refresher.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await refresher
@@ -0,0 +1,136 @@
+"""Match new and updated events against geofenced subscriptions.
+
+Nothing is checked in ``EventService.create_event``: every write (bulk
+imports, which bypass the service, included) stamps ``events.change_xid``
+with its transaction id.  :func:`run_subscription_matcher` follows the event
+stream in ``(change_xid, id)`` order from the position saved in
+``subscription_match_cursor``, and for each batch of up to
+``SUBSCRIPTION_MATCH_BATCH`` events runs one statement::
+
+    INSERT INTO notification_queue (subscription_id, event_id)
+    SELECT s.id, e.id FROM events e JOIN subscriptions s
+        ON s.area && e.location::geometry              -- GiST on subscriptions.area
+       AND ST_DWithin(s.location, e.location, s.radius_m)
+       AND (s.category_ids IS NULL OR e.category_id = ANY (s.category_ids))
+    WHERE e.id IN (...batch...) AND e.status = 'active' AND <not over>
+    ON CONFLICT (subscription_id, event_id) DO NOTHING
+
+The planner drives the join from the batch: one index probe into the
+subscription bounding boxes per event, then the exact distance test on the
+few candidates, so the cost grows with the batch and the number of
+matches, not with the number of subscriptions.  The unique constraint
+keeps an event that is edited again from being queued twice for one
+subscription; an event moved into a circle is queued on its update.
+
+The cursor advances in the same transaction as the insert, under an
+advisory lock, so each batch is matched once however many workers run the
+loop.  Only changes below ``change_horizon()`` are read — those of
+transactions that have finished — so a long transaction that commits
+after the cursor has moved on is still matched: its changes are held back
+(with everything after them) until it ends, never skipped.
+"""
+
+import logging
+from collections.abc import Sequence
+from uuid import UUID
+
+from geoalchemy2 import Geometry
+from sqlalchemy import any_, cast, func, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import Settings
+from app.core.metrics import Counter
+from app.database import async_session_factory, get_background_engine
+from app.models.event import Event, change_horizon
+from app.models.subscription import Notification, Subscription, SubscriptionMatchCursor
+from app.services.background import run_periodically
+
+logger = logging.getLogger(__name__)
+
+# pg_try_advisory_xact_lock key serializing matcher passes across workers.
+MATCH_LOCK_KEY = 0x7375_6273
+
+SUBSCRIPTION_MATCHES = Counter(
+    "eventbuzz_subscription_matches_total",
+    "Events matched against subscriptions, and notifications queued.",
+    ("kind",),
+)
+
+
+def match_statement(event_ids: Sequence[UUID]):
+    """Build the spatial join queuing a notification per (subscription, event) match."""
+    event_point = cast(Event.location, Geometry(geometry_type="POINT", srid=4326))
+    matches = (
+        select(Subscription.id, Event.id)
+        .join(
+            Subscription,
+            Subscription.area.op("&&")(event_point)
+            & func.ST_DWithin(Subscription.location, Event.location, Subscription.radius_m)
+            & or_(
+                Subscription.category_ids.is_(None),
+                Event.category_id == any_(Subscription.category_ids),
+            ),
+        )
+        .where(
+            Event.id.in_(event_ids),
+            Event.status == "active",
+            func.coalesce(Event.end_date, Event.start_date) >= func.now(),
+        )
+    )
+    return (
+        insert(Notification)
+        .from_select(["subscription_id", "event_id"], matches)
+        .on_conflict_do_nothing(index_elements=["subscription_id", "event_id"])
+    )
+
+
+async def match_next_batch(session: AsyncSession, batch_size: int) -> tuple[int, int]:
+    """Match the next batch of changed events and advance the cursor.
+
+    Must run inside a transaction on the primary.  Returns ``(events,
+    queued)``; ``(0, 0)`` when caught up or another worker holds the lock.
+    """
+    lock = select(func.pg_try_advisory_xact_lock(MATCH_LOCK_KEY))
+    if not (await session.execute(lock)).scalar_one():
+        return 0, 0
+
+    cursor = await session.get(SubscriptionMatchCursor, 1)
+    stmt = (
+        select(Event.id, Event.change_xid)
+        .where(
+            tuple_(Event.change_xid, Event.id) > (cursor.change_xid, cursor.event_id),
+            Event.change_xid < change_horizon(),
+        )
+        .order_by(Event.change_xid, Event.id)
+        .limit(batch_size)
+    )
+    batch = (await session.execute(stmt)).all()
+    if not batch:
+        return 0, 0
+
+    result = await session.execute(match_statement([event_id for event_id, _ in batch]))
+    cursor.event_id, cursor.change_xid = batch[-1]
+    SUBSCRIPTION_MATCHES.inc(len(batch), kind="event")
+    SUBSCRIPTION_MATCHES.inc(result.rowcount, kind="notification")
+    return len(batch), result.rowcount
+
+
+async def run_subscription_matcher(settings: Settings) -> None:
+    """Match changed events against subscriptions, forever.
+
+    Full batches are followed immediately by the next one, so a bulk import
+    is worked through at full speed; otherwise the loop waits
+    ``SUBSCRIPTION_MATCH_INTERVAL`` seconds.  Failures are logged and the
+    batch is retried on the next tick (see :func:`run_periodically`).
+    """
+    batch_size = settings.SUBSCRIPTION_MATCH_BATCH
+
+    async def step() -> bool:
+        async with async_session_factory(bind=get_background_engine()) as session, session.begin():
+            events, queued = await match_next_batch(session, batch_size)
+        if events:
+            logger.info("Matched %d events: %d notifications queued", events, queued)
+        return events == batch_size
+
+    await run_periodically("Subscription matching", step, settings.SUBSCRIPTION_MATCH_INTERVAL)
@@ -0,0 +1,91 @@
+"""Payload size and encode time of the bubble wire formats.
+
+Run with:
+    python -m benchmarks.bubble_formats [--count 10000] [--repeat 20]
+
+Encodes *count* synthetic bubbles (spread over a city, 12 categories) in
+each representation served by ``/events/bubbles`` and reports the body
+size, its gzip size (what Caddy sends), and the median encode time.  The
+plain JSON row goes through the same pydantic serialization as the route.
+"""
+
+import argparse
+import gzip
+import random
+import statistics
+import time
+import uuid
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+
+from pydantic import TypeAdapter
+
+from app.core import bubble_codec
+from app.schemas.event import EventBubble
+
+COLORS = [f"#{random.Random(i).randrange(0xFFFFFF):06X}" for i in range(12)]
+
+
+def make_bubbles(count: int, seed: int = 7) -> list[EventBubble]:
+    rng = random.Random(seed)
+    now = datetime(2026, 10, 19, 18, tzinfo=UTC)
+    bubbles = []
+    for _ in range(count):
+        category = rng.randrange(len(COLORS))
+        bubbles.append(
+            EventBubble(
+                id=uuid.UUID(int=rng.getrandbits(128), version=4),
+                title=f"Event {rng.randrange(100_000)} at the venue",
+                latitude=40.70 + rng.random() * 0.12,
+                longitude=-74.02 + rng.random() * 0.12,
+                category_id=category + 1,
+                color_hex=COLORS[category],
+                start_date=now + timedelta(minutes=rng.randrange(60 * 24 * 14)),
+            )
+        )
+    return bubbles
+
+
+def _time(encode: Callable[[], bytes], repeat: int) -> tuple[bytes, float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = encode()
+        timings.append(time.perf_counter() - start)
+    return body, statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    bubbles = make_bubbles(args.count)
+    adapter = TypeAdapter(list[EventBubble])
+    formats: dict[str, Callable[[], bytes]] = {
+        bubble_codec.JSON: lambda: adapter.dump_json(bubbles),
+        bubble_codec.COLUMNAR_JSON: lambda: bubble_codec.encode(
+            bubbles, bubble_codec.COLUMNAR_JSON
+        ),
+    }
+    if bubble_codec.MSGPACK_AVAILABLE:
+        formats[bubble_codec.MSGPACK] = lambda: bubble_codec.encode(bubbles, bubble_codec.MSGPACK)
+    else:
+        print("msgpack is not installed; skipping application/msgpack\n")
+
+    print(f"{args.count} bubbles, median of {args.repeat} runs")
+    print(f"{'format':<42} {'bytes':>10} {'gzip':>10} {'encode ms':>10}")
+    baseline = None
+    for name, encode in formats.items():
+        body, seconds = _time(encode, args.repeat)
+        gz = len(gzip.compress(body, compresslevel=6))
+        baseline = baseline or (len(body), gz)
+        print(
+            f"{name:<42} {len(body):>10,} {gz:>10,} {seconds * 1000:>10.1f}"
+            f"   ({len(body) / baseline[0]:.0%} / {gz / baseline[1]:.0%} of JSON)"
+        )
+
+
+if __name__ == "__main__":
+    main()
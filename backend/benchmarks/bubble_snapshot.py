@@ -0,0 +1,113 @@
+"""Query latency of the in-memory bubble snapshot.
+
+Run with:
+    python -m benchmarks.bubble_snapshot [--events 100000] [--queries 200]
+
+Loads *events* synthetic active events spread over a metro area into an
+:class:`~app.services.snapshot.EventSnapshot` and times bubble queries for
+random viewports (bbox) and radius searches with a one-day window, plus an
+incremental refresh touching 1% of the rows.  The same queries then run
+against the shared memory-mapped file (``BUBBLE_SNAPSHOT_DIR``) after
+timing its write.  Needs the ``snapshot`` extra.
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from app.schemas.event import BoundingBox
+from app.services.snapshot import EventSnapshot, SnapshotIndex, SnapshotRow
+from app.services.snapshot_file import MappedSnapshot, write_snapshot
+
+NOW = datetime(2026, 10, 19, 18, tzinfo=UTC)
+
+
+def make_rows(count: int, rng: random.Random) -> list[SnapshotRow]:
+    rows = []
+    for _ in range(count):
+        start = NOW + timedelta(minutes=rng.randrange(60 * 24 * 30))
+        rows.append(
+            SnapshotRow(
+                id=uuid.UUID(int=rng.getrandbits(128), version=4),
+                title=f"Event {rng.randrange(100_000)}",
+                latitude=40.50 + rng.random() * 0.5,
+                longitude=-74.25 + rng.random() * 0.5,
+                category_id=rng.randrange(1, 13),
+                status="active",
+                start_date=start,
+                end=start + timedelta(hours=rng.choice((1, 2, 3, 6))),
+                updated_at=NOW,
+            )
+        )
+    return rows
+
+
+def _median_ms(timings: list[float]) -> str:
+    return f"{statistics.median(timings) * 1000:8.3f} ms"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+    rng = random.Random(7)
+
+    rows = make_rows(args.events, rng)
+    snapshot = EventSnapshot(coverage_start=NOW, colors={}, max_staleness=10)
+    start = time.perf_counter()
+    snapshot.apply(rows)
+    snapshot.query(lat=40.75, lng=-74.0, radius=100, date_from=NOW)  # builds the grid
+    print(f"load {args.events:,} events: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    window = {"date_from": NOW, "date_to": NOW + timedelta(days=1)}
+    viewports = [
+        (40.55 + rng.random() * 0.4, -74.2 + rng.random() * 0.4) for _ in range(args.queries)
+    ]
+    run_queries("in-process", snapshot, viewports, window)
+
+    touched = rng.sample(rows, max(1, args.events // 100))
+    start = time.perf_counter()
+    snapshot.apply(row._replace(latitude=row.latitude + 0.001) for row in touched)
+    snapshot.query(lat=40.75, lng=-74.0, radius=100, date_from=NOW)
+    refresh = time.perf_counter() - start
+    print(f"refresh {len(touched):,} rows + regrid  {refresh * 1000:8.1f} ms")
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        path = write_snapshot(snapshot, Path(directory))
+        written = time.perf_counter() - start
+        print(
+            f"\nwrite shared file ({path.stat().st_size / 2**20:.1f} MiB) {written * 1000:8.1f} ms"
+        )
+        run_queries("mmap", MappedSnapshot(path, max_staleness=10), viewports, window)
+
+
+def run_queries(
+    label: str,
+    snapshot: SnapshotIndex,
+    viewports: list[tuple[float, float]],
+    window: dict[str, datetime],
+) -> None:
+    bbox_times, radius_times, found = [], [], []
+    for lat, lng in viewports:
+        box = BoundingBox(min_lng=lng - 0.03, min_lat=lat - 0.02, max_lng=lng + 0.03, max_lat=lat)
+        start = time.perf_counter()
+        found.append(len(snapshot.query(bbox=box, **window)))
+        bbox_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        snapshot.query(lat=lat, lng=lng, radius=5000, **window)
+        radius_times.append(time.perf_counter() - start)
+
+    print(f"{label}: bbox query (~{statistics.median(found):.0f} hits) {_median_ms(bbox_times)}")
+    print(f"{label}: radius 5 km query        {_median_ms(radius_times)}")
+
+
+if __name__ == "__main__":
+    main()
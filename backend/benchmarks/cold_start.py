@@ -0,0 +1,86 @@
+"""Cold-start benchmark: process start to first 200 on ``/api/v1/health``.
+
+Run with:
+    python -m benchmarks.cold_start [--runs 5] [--budget-ms 3000]
+
+Starts the API under uvicorn (startup warmup disabled, so no database is
+needed), polls the health endpoint until it answers 200, and reports the
+median over several runs.  Exits non-zero when the median exceeds the
+budget, which makes it usable as a CI gate.
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+HEALTH_PATH = "/api/v1/health"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_once(timeout: float = 30.0) -> float:
+    """Return milliseconds from spawning the server to its first 200."""
+    port = free_port()
+    env = {**os.environ, "DB_WARMUP_ON_STARTUP": "false"}
+    cmd = [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "--factory",
+        "app.main:create_app",
+        "--port",
+        str(port),
+        "--log-level",
+        "warning",
+    ]
+    url = f"http://127.0.0.1:{port}{HEALTH_PATH}"
+
+    start = time.perf_counter()
+    proc = subprocess.Popen(cmd, env=env)
+    try:
+        with httpx.Client() as client:
+            while time.perf_counter() - start < timeout:
+                if proc.poll() is not None:
+                    raise RuntimeError(f"server exited with code {proc.returncode}")
+                try:
+                    if client.get(url, timeout=1.0).status_code == 200:
+                        return (time.perf_counter() - start) * 1000
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.005)
+        raise TimeoutError(f"no 200 from {url} within {timeout}s")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    samples = [measure_once() for _ in range(args.runs)]
+    median = statistics.median(samples)
+    print(
+        f"cold start to first 200: median {median:.0f} ms "
+        f"(min {min(samples):.0f}, max {max(samples):.0f}, runs {args.runs})"
+    )
+
+    if args.budget_ms is not None and median > args.budget_ms:
+        print(f"FAIL: over budget of {args.budget_ms:.0f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Import-time breakdown for the API process.
+
+Run with:
+    python -m benchmarks.startup_profile [--top 20]
+
+Imports ``app.main`` and builds the app in a fresh interpreter under
+``python -X importtime``, then sums the self time of every imported module
+by top-level package so that the heaviest dependencies stand out.
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+from collections import Counter
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+STARTUP_CODE = "import app.main; app.main.create_app()"
+
+
+def profile(code: str = STARTUP_CODE) -> tuple[Counter[str], int]:
+    """Return ``(self time per top-level package, total)`` in microseconds."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    by_package: Counter[str] = Counter()
+    total = 0
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        by_package[module.split(".")[0]] += int(self_us)
+        if len(indent) == 1:
+            total += int(cumulative_us)
+    return by_package, total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=20, help="Packages to list")
+    args = parser.parse_args()
+
+    by_package, total = profile()
+    print(f"{'package':<30} {'ms':>9} {'share':>7}")
+    for package, self_us in by_package.most_common(args.top):
+        print(f"{package:<30} {self_us / 1000:>9.1f} {self_us / total:>7.1%}")
+    print(f"{'total':<30} {total / 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Throughput of the geofenced subscription matcher.
+
+Run with:
+    python -m benchmarks.subscription_matching [--subscriptions 1000000] [--events 10000]
+        [--batch 1000] [--explain]
+
+Needs a migrated PostGIS database (``DATABASE_URL``) with categories
+seeded.  Inside one transaction, which is rolled back at the end, it
+inserts *subscriptions* saved places (1-20 km circles, half of them
+filtered to one category) and *events* upcoming events, both spread over
+the contiguous United States, then queues notifications with the
+matcher's spatial join (:func:`app.services.subscriptions.match_statement`)
+in batches of *batch* events, as ``run_subscription_matcher`` does, and
+reports per-batch latency and throughput.  ``--explain`` prints the plan of
+the first batch.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from app.database import async_session_factory, dispose_engines, get_engine
+from app.services.subscriptions import match_statement
+
+# Contiguous US: min_lng, min_lat, lng span, lat span.
+REGION = {"min_lng": -124.0, "min_lat": 25.0, "span_lng": 57.0, "span_lat": 24.0}
+
+_USER = text(
+    "INSERT INTO users (keycloak_id, display_name) "
+    "VALUES ('benchmark-subscriber', 'Benchmark') RETURNING id"
+)
+_SUBSCRIPTIONS = text(
+    """
+    INSERT INTO subscriptions (user_id, location, radius_m, category_ids)
+    SELECT :user_id,
+           ST_SetSRID(ST_MakePoint(:min_lng + random() * :span_lng,
+                                   :min_lat + random() * :span_lat), 4326)::geography,
+           1000 + random() * 19000,
+           CASE WHEN random() < 0.5 THEN NULL
+                ELSE ARRAY[(:categories)[1 + floor(random() * cardinality(:categories))::int]]
+           END
+    FROM generate_series(1, :count)
+    """
+)
+_EVENTS = text(
+    """
+    INSERT INTO events (title, category_id, location, start_date, status, currency, source)
+    SELECT 'Benchmark event ' || n,
+           (:categories)[1 + floor(random() * cardinality(:categories))::int],
+           ST_SetSRID(ST_MakePoint(:min_lng + random() * :span_lng,
+                                   :min_lat + random() * :span_lat), 4326)::geography,
+           now() + random() * interval '30 days',
+           'active', 'USD', 'benchmark'
+    FROM generate_series(1, :count) AS n
+    RETURNING id
+    """
+)
+
+
+async def run(args: argparse.Namespace) -> None:
+    async with async_session_factory(bind=get_engine()) as session:
+        transaction = await session.begin()
+        try:
+            await session.execute(text("SELECT setseed(0.7)"))
+            categories = list((await session.execute(text("SELECT id FROM categories"))).scalars())
+            if not categories:
+                raise SystemExit("No categories found. Run  python -m app.scripts.seed_categories")
+            user_id = (await session.execute(_USER)).scalar_one()
+
+            start = time.perf_counter()
+            params = {"user_id": user_id, "categories": categories, **REGION}
+            await session.execute(_SUBSCRIPTIONS, {**params, "count": args.subscriptions})
+            await session.execute(text("ANALYZE subscriptions"))
+            elapsed = time.perf_counter() - start
+            print(f"insert {args.subscriptions:,} subscriptions + analyze {elapsed:8.1f} s")
+
+            params = {"categories": categories, "count": args.events, **REGION}
+            event_ids = list((await session.execute(_EVENTS, params)).scalars())
+            await session.execute(text("ANALYZE events"))
+
+            batches = [event_ids[i : i + args.batch] for i in range(0, len(event_ids), args.batch)]
+            if args.explain:
+                sql = match_statement(batches[0]).compile(
+                    dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+                )
+                connection = await session.connection()
+                plan = await connection.exec_driver_sql(f"EXPLAIN {sql}")
+                print("\n".join(row[0] for row in plan))
+
+            timings, queued = [], 0
+            for batch in batches:
+                start = time.perf_counter()
+                result = await session.execute(match_statement(batch))
+                timings.append(time.perf_counter() - start)
+                queued += result.rowcount
+            total = sum(timings)
+            print(f"match {len(event_ids):,} events in {len(batches)} batches of {args.batch}")
+            print(f"  per batch     {statistics.median(timings) * 1000:8.1f} ms median")
+            print(f"  total         {total:8.2f} s  ({len(event_ids) / total:,.0f} events/s)")
+            print(f"  notifications {queued:,} ({queued / len(event_ids):.1f} per event)")
+        finally:
+            await transaction.rollback()
+    await dispose_engines()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--subscriptions", type=int, default=1_000_000)
+    parser.add_argument("--events", type=int, default=10_000)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--explain", action="store_true")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Throughput scaling of ``python -m app.serve`` with the worker count.
+
+Run with:
+    python -m benchmarks.worker_scaling [--workers 1 2 4] [--duration 10]
+
+For each worker count, starts the server, drives ``--path`` with several
+client processes for ``--duration`` seconds, and reports requests per
+second.  The default path (``/api/v1/health``) needs no database, so the
+numbers isolate server/worker overhead; point ``--path`` at a read
+endpoint to include the database.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.cold_start import free_port
+
+
+async def _drive(url: str, concurrency: int, deadline: float) -> int:
+    done = 0
+
+    async def client_loop(client: httpx.AsyncClient) -> None:
+        nonlocal done
+        while time.perf_counter() < deadline:
+            response = await client.get(url)
+            if response.status_code == 200:
+                done += 1
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=10.0) as client:
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+    return done
+
+
+def _client_process(url: str, concurrency: int, deadline: float) -> int:
+    return asyncio.run(_drive(url, concurrency, deadline))
+
+
+def _wait_ready(url: str, timeout: float = 30.0) -> None:
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        try:
+            if httpx.get(url, timeout=1.0).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.05)
+    raise TimeoutError(f"server at {url} did not become ready")
+
+
+def measure(workers: int, path: str, duration: float, clients: int, concurrency: int) -> float:
+    """Return requests per second served by *workers* worker processes."""
+    port = free_port()
+    env = {**os.environ, "DB_WARMUP_ON_STARTUP": "false", "LOG_LEVEL": "warning"}
+    cmd = [sys.executable, "-m", "app.serve", "--port", str(port), "--workers", str(workers)]
+    url = f"http://127.0.0.1:{port}{path}"
+
+    proc = subprocess.Popen(cmd, env=env)
+    try:
+        _wait_ready(f"http://127.0.0.1:{port}/api/v1/health")
+        deadline = time.perf_counter() + duration
+        with multiprocessing.Pool(clients) as pool:
+            counts = pool.starmap(_client_process, [(url, concurrency, deadline)] * clients)
+        return sum(counts) / duration
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--path", default="/api/v1/health")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--clients", type=int, default=4, help="Load-generator processes")
+    parser.add_argument(
+        "--concurrency", type=int, default=32, help="Requests in flight per client"
+    )
+    args = parser.parse_args()
+
+    baseline = None
+    print(f"{'workers':>7} {'req/s':>10} {'speedup':>8}")
+    for workers in args.workers:
+        rps = measure(workers, args.path, args.duration, args.clients, args.concurrency)
+        baseline = baseline or rps
+        print(f"{workers:>7} {rps:>10.0f} {rps / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
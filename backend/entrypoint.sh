@@ -5,8 +5,7 @@ echo "Running Alembic migrations..."
 alembic upgrade head
 
 echo "Starting EventBuzz API..."
-exec uvicorn app.main:app \
+exec python -m app.serve \
     --host 0.0.0.0 \
     --port 8000 \
-    --workers "${UVICORN_WORKERS:-1}" \
     --log-level "${LOG_LEVEL:-info}"
@@ -0,0 +1,63 @@
+"""Database stand-ins shared by the service tests."""
+
+from sqlalchemy.dialects import postgresql
+
+
+def compile_sql(statement, *, literal_binds: bool = False) -> str:
+    """Render *statement* as PostgreSQL, optionally with its parameters inlined."""
+    compile_kwargs = {"literal_binds": True} if literal_binds else {}
+    return str(statement.compile(dialect=postgresql.dialect(), compile_kwargs=compile_kwargs))
+
+
+class FakeResult:
+    """The parts of ``Result`` the services use, over one canned answer."""
+
+    def __init__(self, answer: object) -> None:
+        self.answer = answer
+        self.rowcount = answer if isinstance(answer, int) else 0
+
+    def scalar_one(self) -> object:
+        return self.answer
+
+    def one(self) -> object:
+        return self.answer
+
+    def all(self) -> object:
+        return self.answer
+
+    def __iter__(self):
+        return iter(self.answer)
+
+
+class FakeSession:
+    """Answers statements with canned results, in order, and records their SQL.
+
+    ``get`` returns *row* whatever the model asked for, and ``add`` replaces it.
+    """
+
+    def __init__(self, *answers: object, row: object = None, literal_binds: bool = False):
+        self.answers = list(answers)
+        self.row = row
+        self.literal_binds = literal_binds
+        self.statements: list[str] = []
+
+    async def execute(self, statement) -> FakeResult:
+        self.statements.append(compile_sql(statement, literal_binds=self.literal_binds))
+        return FakeResult(self.answers.pop(0))
+
+    async def get(self, model, ident) -> object:
+        return self.row
+
+    def add(self, row: object) -> None:
+        self.row = row
+
+
+class RecordingSession:
+    """Records compiled statements, then stops the caller with ``LookupError``."""
+
+    def __init__(self) -> None:
+        self.statements: list[str] = []
+
+    async def execute(self, statement):
+        self.statements.append(compile_sql(statement))
+        raise LookupError
@@ -0,0 +1,129 @@
+"""Tests for the admission-control middleware."""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.core.admission import ADMISSION_REQUESTS, AdmissionControl, classify
+
+DETAIL = "/api/v1/events/0b9e8c4e-5a0e-4e63-9a51-2f1d1c0f7a10"
+
+
+@pytest.mark.parametrize(
+    ("method", "path", "expected"),
+    [
+        ("GET", "/api/v1/events/nearby", "map"),
+        ("GET", "/api/v1/events/bubbles", "map"),
+        ("GET", "/api/v1/events", "map"),
+        ("GET", DETAIL, "detail"),
+        ("POST", "/api/v1/events", "write"),
+        ("DELETE", DETAIL, "write"),
+        ("GET", "/api/v1/health/ready", "other"),
+        ("GET", "/api/v1/categories", "other"),
+    ],
+)
+def test_classify(method: str, path: str, expected: str) -> None:
+    assert classify(method, path) == expected
+
+
+@pytest.fixture()
+def gate() -> asyncio.Event:
+    return asyncio.Event()
+
+
+@pytest.fixture()
+async def client(gate: asyncio.Event):
+    app = FastAPI()
+
+    @app.get("/api/v1/events/nearby")
+    async def nearby() -> dict:
+        await gate.wait()
+        return {"ok": True}
+
+    @app.get("/api/v1/events/{event_id}")
+    async def detail(event_id: str) -> dict:
+        return {"id": event_id}
+
+    app.add_middleware(AdmissionControl, limit=1, max_wait=0.05, retry_after=3)
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as http:
+        yield http
+
+
+async def test_excess_map_reads_are_shed_but_detail_reads_pass(
+    client: AsyncClient, gate: asyncio.Event
+) -> None:
+    shed_before = ADMISSION_REQUESTS.value(route_class="map", outcome="shed")
+    busy = asyncio.create_task(client.get("/api/v1/events/nearby"))
+    await asyncio.sleep(0.01)
+
+    response = await client.get("/api/v1/events/nearby")
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "3"
+    assert ADMISSION_REQUESTS.value(route_class="map", outcome="shed") == shed_before + 1
+
+    # The held slot does not affect detail reads.
+    assert (await client.get(DETAIL)).status_code == 200
+
+    gate.set()
+    assert (await busy).status_code == 200
+    assert (await client.get("/api/v1/events/nearby")).status_code == 200
+
+
+async def test_conditional_reads_keep_their_cached_copy(
+    client: AsyncClient, gate: asyncio.Event
+) -> None:
+    busy = asyncio.create_task(client.get("/api/v1/events/nearby"))
+    await asyncio.sleep(0.01)
+
+    response = await client.get("/api/v1/events/nearby", headers={"If-None-Match": 'W/"abc"'})
+    assert response.status_code == 304
+    assert response.headers["etag"] == 'W/"abc"'
+
+    gate.set()
+    await busy
+
+
+async def test_waiting_reads_are_admitted_when_a_slot_frees_up(
+    client: AsyncClient, gate: asyncio.Event
+) -> None:
+    busy = asyncio.create_task(client.get("/api/v1/events/nearby"))
+    await asyncio.sleep(0.01)
+    queued = asyncio.create_task(client.get("/api/v1/events/nearby"))
+    await asyncio.sleep(0.01)
+    gate.set()
+    assert (await busy).status_code == 200
+    assert (await queued).status_code == 200
+
+
+async def test_map_reads_wait_for_idle_connections_in_a_saturated_pool() -> None:
+    """Checkouts made outside map reads (detail reads, background tasks) count too."""
+    app = FastAPI()
+    idle = 1  # the pool's last connection is reserved
+
+    @app.get("/api/v1/events/nearby")
+    async def nearby() -> dict:
+        return {"ok": True}
+
+    @app.get("/api/v1/events/{event_id}")
+    async def detail(event_id: str) -> dict:
+        return {"id": event_id}
+
+    app.add_middleware(
+        AdmissionControl,
+        limit=10,
+        max_wait=0.05,
+        retry_after=3,
+        idle_connections=lambda: idle,
+        reserved=1,
+    )
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        assert (await client.get("/api/v1/events/nearby")).status_code == 503
+        assert (await client.get(DETAIL)).status_code == 200
+
+        waiting = asyncio.create_task(client.get("/api/v1/events/nearby"))
+        await asyncio.sleep(0.01)
+        idle = 3  # connections were checked in
+        assert (await waiting).status_code == 200
@@ -0,0 +1,45 @@
+"""Tests for the supervised background loop."""
+
+import asyncio
+import logging
+
+import pytest
+import sqlalchemy.exc
+
+from app.services.background import BACKGROUND_FAILURES, run_periodically
+
+
+async def test_loop_survives_failures_and_runs_again_when_asked(
+    caplog: pytest.LogCaptureFixture, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    outcomes = [
+        sqlalchemy.exc.TimeoutError("QueuePool limit reached"),
+        KeyError("bug"),
+        True,  # more work ready: no sleep before the next step
+        None,
+        asyncio.CancelledError(),
+    ]
+    sleeps: list[float] = []
+
+    async def sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+
+    async def step() -> object:
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr("app.services.background.asyncio.sleep", sleep)
+    database = BACKGROUND_FAILURES.value(task="Test loop", kind="database")
+    unexpected = BACKGROUND_FAILURES.value(task="Test loop", kind="unexpected")
+    with caplog.at_level(logging.WARNING), pytest.raises(asyncio.CancelledError):
+        await run_periodically("Test loop", step, 7, wait_first=True)
+
+    assert not outcomes
+    assert sleeps == [7, 7, 7, 7]  # first wait, two failures, the idle step
+    assert BACKGROUND_FAILURES.value(task="Test loop", kind="database") == database + 1
+    assert BACKGROUND_FAILURES.value(task="Test loop", kind="unexpected") == unexpected + 1
+    database_log, bug_log = caplog.records
+    assert database_log.levelno == logging.WARNING and database_log.exc_info is None
+    assert bug_log.levelno == logging.ERROR and bug_log.exc_info[0] is KeyError
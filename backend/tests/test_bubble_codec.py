@@ -0,0 +1,71 @@
+"""Tests for bubble content negotiation and the columnar encodings."""
+
+import json
+import uuid
+from datetime import UTC, datetime
+
+import pytest
+
+from app.core import bubble_codec
+from app.schemas.event import EventBubble
+
+START = datetime(2026, 10, 23, 20, 30, tzinfo=UTC)
+
+
+def _bubbles() -> list[EventBubble]:
+    return [
+        EventBubble(
+            id=uuid.UUID(int=i + 1),
+            title=f"Event {i}",
+            latitude=40.7 + i * 0.01234567,
+            longitude=-73.99 + i * 0.001,
+            category_id=1 + i % 2,
+            color_hex=("#FF0000", "#00FF00")[i % 2],
+            start_date=START,
+        )
+        for i in range(5)
+    ]
+
+
+@pytest.mark.parametrize(
+    ("accept", "expected"),
+    [
+        (None, bubble_codec.JSON),
+        ("*/*", bubble_codec.JSON),
+        ("application/json", bubble_codec.JSON),
+        (bubble_codec.COLUMNAR_JSON, bubble_codec.COLUMNAR_JSON),
+        (f"application/json;q=0.5, {bubble_codec.COLUMNAR_JSON}", bubble_codec.COLUMNAR_JSON),
+        (f"{bubble_codec.COLUMNAR_JSON};q=0.2, application/json", bubble_codec.JSON),
+        ("text/html", bubble_codec.JSON),
+    ],
+)
+def test_negotiate_picks_highest_quality_known_type(accept: str | None, expected: str) -> None:
+    assert bubble_codec.negotiate(accept) == expected
+
+
+def test_columnar_json_round_trips_within_quantization() -> None:
+    bubbles = _bubbles()
+    doc = json.loads(bubble_codec.encode(bubbles, bubble_codec.COLUMNAR_JSON))
+
+    assert doc["n"] == len(bubbles)
+    assert doc["palette"] == [[1, "#FF0000"], [2, "#00FF00"]]
+    lat0, lng0 = doc["origin"]
+    for i, bubble in enumerate(bubbles):
+        assert doc["id"][i] == str(bubble.id)
+        assert (lat0 + doc["lat"][i]) / doc["scale"] == pytest.approx(bubble.latitude, abs=1e-5)
+        assert (lng0 + doc["lng"][i]) / doc["scale"] == pytest.approx(bubble.longitude, abs=1e-5)
+        assert doc["palette"][doc["cat"][i]][0] == bubble.category_id
+        assert doc["start"][i] == int(START.timestamp())
+
+
+def test_columnar_json_handles_empty_list() -> None:
+    doc = json.loads(bubble_codec.encode([], bubble_codec.COLUMNAR_JSON))
+    assert doc["n"] == 0 and doc["id"] == [] and doc["palette"] == []
+
+
+def test_msgpack_packs_ids_into_one_blob() -> None:
+    msgpack = pytest.importorskip("msgpack")
+    bubbles = _bubbles()
+    doc = msgpack.unpackb(bubble_codec.encode(bubbles, bubble_codec.MSGPACK))
+    assert doc["id"] == b"".join(b.id.bytes for b in bubbles)
+    assert doc["title"] == [b.title for b in bubbles]
@@ -0,0 +1,166 @@
+"""Tests for read-replica routing and read-only sessions."""
+
+import pytest
+import sqlalchemy.exc
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.pool import PoolResetState
+
+from app.api.deps import get_settings_dep, get_write_session, read_your_writes
+from app.config import Settings
+from app.database import (
+    STATEMENTS_ABORTED,
+    ReplicaRouter,
+    StatementTimeoutError,
+    _reset_statement_timeout,
+    _set_session_timeout,
+    autocommit_engine,
+    get_engine,
+    idle_read_connections,
+    read_from_primary,
+    read_session,
+    statement_timeout_ms,
+)
+
+PRIMARY = object()
+REPLICA_A = object()
+REPLICA_B = object()
+
+
+def test_no_replicas_reads_from_primary() -> None:
+    router = ReplicaRouter(PRIMARY, [])
+    assert router.pick() is PRIMARY
+
+
+def test_replicas_round_robin() -> None:
+    router = ReplicaRouter(PRIMARY, [REPLICA_A, REPLICA_B])
+    assert [router.pick() for _ in range(4)] == [REPLICA_A, REPLICA_B, REPLICA_A, REPLICA_B]
+
+
+def test_down_replica_is_skipped_until_marked_up() -> None:
+    router = ReplicaRouter(PRIMARY, [REPLICA_A, REPLICA_B])
+    router.mark_down(REPLICA_A)
+    assert [router.pick() for _ in range(3)] == [REPLICA_B, REPLICA_B, REPLICA_B]
+    router.mark_up(REPLICA_A)
+    assert {router.pick(), router.pick()} == {REPLICA_A, REPLICA_B}
+
+
+def test_all_replicas_down_falls_back_to_primary() -> None:
+    router = ReplicaRouter(PRIMARY, [REPLICA_A, REPLICA_B])
+    router.mark_down(REPLICA_A)
+    router.mark_down(REPLICA_B)
+    assert router.pick() is PRIMARY
+
+
+def test_idle_read_connections_is_the_busiest_pool_in_rotation(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    class Engine:
+        def __init__(self, checked_out: int) -> None:
+            self.pool = self
+            self.checked_out = checked_out
+
+        def checkedout(self) -> int:
+            return self.checked_out
+
+    primary, idle, busy = Engine(0), Engine(1), Engine(9)
+    router = ReplicaRouter(primary, [idle, busy])
+    monkeypatch.setattr("app.database.get_replica_router", lambda: router)
+    monkeypatch.setattr(
+        "app.database.get_settings", lambda: Settings(DB_POOL_SIZE=8, DB_MAX_OVERFLOW=2)
+    )
+    assert idle_read_connections() == 1
+    router.mark_down(busy)
+    assert idle_read_connections() == 9
+    router.mark_down(idle)
+    assert idle_read_connections() == 10
+
+
+async def test_only_the_writing_client_reads_from_the_primary() -> None:
+    app = FastAPI(dependencies=[Depends(read_your_writes)])
+    app.dependency_overrides[get_settings_dep] = lambda: Settings(DB_READ_YOUR_WRITES_SECONDS=60)
+
+    @app.post("/events")
+    async def write(session=Depends(get_write_session)) -> dict:
+        return {}
+
+    @app.get("/events")
+    async def read() -> dict:
+        return {"primary": read_from_primary.get()}
+
+    transport = ASGITransport(app=app)
+    async with (
+        AsyncClient(transport=transport, base_url="http://test") as writer,
+        AsyncClient(transport=transport, base_url="http://test") as other,
+    ):
+        assert (await writer.get("/events")).json() == {"primary": False}
+        await writer.post("/events")
+        assert (await writer.get("/events")).json() == {"primary": True}
+        assert (await other.get("/events")).json() == {"primary": False}
+        other.cookies.set("eventbuzz_last_write", "1000000000.0")  # long expired
+        assert (await other.get("/events")).json() == {"primary": False}
+
+
+async def test_pool_timeout_marks_the_replica_down() -> None:
+    class ExhaustedReplica:
+        def connect(self):
+            raise sqlalchemy.exc.TimeoutError("QueuePool limit reached")
+
+    replica = ExhaustedReplica()
+    router = ReplicaRouter(PRIMARY, [replica])
+    await router.check_health()
+    assert router.pick() is PRIMARY
+
+
+def test_autocommit_engine_shares_pool_and_is_cached() -> None:
+    engine = get_engine()
+    view = autocommit_engine(engine)
+    assert view.get_execution_options()["isolation_level"] == "AUTOCOMMIT"
+    assert view.pool is engine.pool
+    assert autocommit_engine(engine) is view
+
+
+async def test_read_over_budget_raises_statement_timeout() -> None:
+    """A cancelled statement (SQLSTATE 57014) surfaces as StatementTimeoutError."""
+
+    class QueryCanceledError(Exception):
+        sqlstate = "57014"
+
+    token = statement_timeout_ms.set(100)
+    try:
+        with pytest.raises(StatementTimeoutError):
+            async with read_session() as session:
+                assert session.bind is autocommit_engine(get_engine())
+                raise DBAPIError("SELECT pg_sleep(1)", None, QueryCanceledError())
+    finally:
+        statement_timeout_ms.reset(token)
+    assert STATEMENTS_ABORTED.value(reason="timeout") >= 1
+
+
+class _Connection:
+    """Stands in for both the SQLAlchemy and the asyncpg connection."""
+
+    def __init__(self) -> None:
+        self.info: dict = {}
+        self.sql: list[str] = []
+
+    def exec_driver_sql(self, sql: str) -> None:
+        self.sql.append(sql)
+
+    execute = exec_driver_sql
+
+    def run_async(self, fn) -> None:
+        fn(self)
+
+
+def test_budget_is_set_for_the_session_and_reset_on_return() -> None:
+    conn = _Connection()
+    returned = PoolResetState(transaction_was_reset=False, terminate_only=False, asyncio_safe=True)
+    _set_session_timeout(250, None, None, conn)
+    _reset_statement_timeout(conn, conn, returned)
+    assert conn.sql == ["SET statement_timeout = 250", "RESET statement_timeout"]
+
+    # Connections that never had a budget are returned without a round trip.
+    _reset_statement_timeout(conn, conn, returned)
+    assert conn.sql == ["SET statement_timeout = 250", "RESET statement_timeout"]
@@ -0,0 +1,87 @@
+"""Tests for disconnect cancellation and per-route statement budgets."""
+
+import asyncio
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.api.deps import get_settings_dep, statement_timeout
+from app.config import Settings
+from app.core.disconnect import REQUESTS_CANCELLED, CancelOnDisconnect
+from app.database import statement_timeout_ms
+
+
+def _scope(method: str = "GET", path: str = "/api/v1/events/nearby") -> dict:
+    return {"type": "http", "method": method, "path": path, "headers": []}
+
+
+async def test_read_handler_is_cancelled_when_the_client_leaves() -> None:
+    started, cancelled = asyncio.Event(), asyncio.Event()
+
+    async def slow_app(scope, receive, send) -> None:
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    messages = asyncio.Queue()
+    await messages.put({"type": "http.request", "body": b"", "more_body": False})
+    sent = []
+
+    async def send(message) -> None:
+        sent.append(message)
+
+    before = REQUESTS_CANCELLED.value(route_class="map")
+    middleware = asyncio.create_task(CancelOnDisconnect(slow_app)(_scope(), messages.get, send))
+    await started.wait()
+    await messages.put({"type": "http.disconnect"})
+    await asyncio.wait_for(middleware, 1)
+
+    assert cancelled.is_set()
+    assert sent == []
+    assert REQUESTS_CANCELLED.value(route_class="map") == before + 1
+
+
+async def test_writes_are_not_watched() -> None:
+    calls = []
+
+    async def app(scope, receive, send) -> None:
+        calls.append(await receive())
+
+    async def receive():
+        return {"type": "http.request", "body": b"{}", "more_body": False}
+
+    await CancelOnDisconnect(app)(_scope("POST", "/api/v1/events"), receive, None)
+    assert calls == [{"type": "http.request", "body": b"{}", "more_body": False}]
+
+
+async def test_completed_requests_are_unaffected() -> None:
+    app = FastAPI()
+
+    @app.get("/api/v1/events/nearby")
+    async def nearby() -> dict:
+        return {"ok": True}
+
+    app.add_middleware(CancelOnDisconnect)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/api/v1/events/nearby")
+    assert response.json() == {"ok": True}
+
+
+async def test_statement_timeout_dependency_sets_the_request_budget() -> None:
+    app = FastAPI()
+    app.dependency_overrides[get_settings_dep] = lambda: Settings(DB_TIMEOUT_SEARCH_MS=1234)
+
+    @app.get("/search", dependencies=[statement_timeout("DB_TIMEOUT_SEARCH_MS")])
+    async def search() -> dict:
+        return {"budget": statement_timeout_ms.get()}
+
+    @app.get("/plain")
+    async def plain() -> dict:
+        return {"budget": statement_timeout_ms.get()}
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        assert (await client.get("/search")).json() == {"budget": 1234}
+        assert (await client.get("/plain")).json() == {"budget": None}
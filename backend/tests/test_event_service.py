@@ -0,0 +1,360 @@
+"""Tests for EventService helpers that do not need a database."""
+
+import asyncio
+import contextlib
+from datetime import datetime
+from uuid import uuid4
+from zoneinfo import ZoneInfo
+
+import pytest
+import sqlalchemy.exc
+from httpx import AsyncClient
+from sqlalchemy.dialects import postgresql
+
+from app import database
+from app.config import Settings
+from app.database import StatementTimeoutError
+from app.models.category import Category
+from app.models.event import Event
+from app.schemas.event import BoundingBox, ChangeCursor, EventChange
+from app.services import event_service
+from app.services.event_service import (
+    EventService,
+    _detail_query,
+    _event_to_list_item,
+    _tag_filter,
+    gather_reads,
+    snap_to_grid,
+    time_window,
+)
+from tests.fakes import FakeSession, RecordingSession
+
+PARIS = ZoneInfo("Europe/Paris")
+
+
+def test_snap_to_grid_merges_nearby_centers() -> None:
+    lat, lng = snap_to_grid(40.75, -73.98, 5000)
+    for d_lat, d_lng in [(0.0003, 0.0003), (-0.0003, 0.0002), (0.0001, -0.0004)]:
+        assert snap_to_grid(lat + d_lat, lng + d_lng, 5000) == (lat, lng)
+
+
+def test_snap_to_grid_stays_close_to_center() -> None:
+    lat, lng = snap_to_grid(40.7512, -73.9857, 5000)
+    # Half a grid step (radius / 40 = 125 m) is about 0.0012 degrees of latitude.
+    assert lat == pytest.approx(40.7512, abs=0.0012)
+    assert lng == pytest.approx(-73.9857, abs=0.0016)
+
+
+def test_time_window_tonight_starts_at_evening() -> None:
+    start, end = time_window("tonight", PARIS, now=datetime(2026, 10, 21, 14, 0, tzinfo=PARIS))
+    assert start == datetime(2026, 10, 21, 18, 0, tzinfo=PARIS)
+    assert (end.date().day, end.hour, end.minute) == (22, 3, 59)
+
+
+def test_time_window_tonight_after_midnight_is_the_current_night() -> None:
+    now = datetime(2026, 10, 22, 1, 30, tzinfo=PARIS)
+    start, end = time_window("tonight", PARIS, now=now)
+    assert start == now
+    assert (end.date().day, end.hour) == (22, 3)
+
+
+def test_time_window_weekend_from_a_weekday_and_during_it() -> None:
+    start, end = time_window("weekend", PARIS, now=datetime(2026, 10, 21, 9, tzinfo=PARIS))
+    assert start == datetime(2026, 10, 23, 18, 0, tzinfo=PARIS)  # Friday
+    assert (end.date().day, end.hour) == (25, 23)  # Sunday night
+
+    saturday = datetime(2026, 10, 24, 12, tzinfo=PARIS)
+    start, end = time_window("weekend", PARIS, now=saturday)
+    assert start == saturday
+    assert end.date().day == 25
+
+
+def test_time_window_now_is_an_instant() -> None:
+    now = datetime(2026, 10, 21, 20, tzinfo=PARIS)
+    assert time_window("now", PARIS, now=now) == (now, now)
+
+
+@pytest.mark.parametrize(("match", "operator"), [("any", "&&"), ("all", "@>")])
+def test_tag_filter_uses_gin_array_operators(match: str, operator: str) -> None:
+    sql = str(_tag_filter(["jazz", "outdoor"], match).compile(dialect=postgresql.dialect()))
+    assert sql.startswith(f"events.tags {operator} ")
+
+
+def test_detail_query_is_a_single_statement() -> None:
+    sql = str(_detail_query().compile(dialect=postgresql.dialect()))
+    assert "JOIN categories ON" in sql
+    assert "json_agg(" in sql
+    assert "events.tags" in sql
+
+
+def _event(**fields) -> Event:
+    created = datetime(2026, 10, 19, 12, tzinfo=PARIS)
+    category = Category(
+        id=1,
+        name="Music",
+        slug="music",
+        color_hex="#FF0000",
+        icon_name="music",
+        created_at=created,
+    )
+    fields = {
+        "id": uuid4(),
+        "title": "Concert",
+        "category": category,
+        "start_date": created,
+        "updated_at": created,
+        "currency": "EUR",
+        "status": "active",
+        "tags": [],
+        **fields,
+    }
+    return Event(**fields)
+
+
+def test_list_items_carry_the_event_coordinates() -> None:
+    event = _event()
+    created = event.updated_at
+
+    item = _event_to_list_item(event, 2.35, 48.85, 120)
+    assert (item.latitude, item.longitude, item.distance_meters) == (48.85, 2.35, 120.0)
+
+    change = _event_to_list_item(
+        event, 2.35, 48.85, schema=EventChange, updated_at=event.updated_at
+    )
+    assert isinstance(change, EventChange)
+    assert (change.latitude, change.longitude, change.updated_at) == (48.85, 2.35, created)
+
+
+NYC_BOX = BoundingBox(min_lng=-74.02, min_lat=40.69, max_lng=-73.91, max_lat=40.82)
+
+
+async def test_changes_report_events_moved_out_of_the_area() -> None:
+    stayed, left = _event(change_xid=41), _event(change_xid=42)
+    session = FakeSession([(stayed, -73.98, 40.75, True), (left, 2.35, 48.85, False)])
+    since = ChangeCursor(change_xid=40, id=uuid4())
+
+    changes = await EventService.get_changes(session, bbox=NYC_BOX, since=since)
+    assert [(item.id, item.moved_out) for item in changes.items] == [
+        (stayed.id, False),
+        (left.id, True),
+    ]
+    assert ChangeCursor.decode(changes.next_token) == ChangeCursor(change_xid=42, id=left.id)
+    (sql,) = session.statements
+    # The moves since the cursor, found through the event's old location.
+    assert "EXISTS (SELECT event_moves.id" in sql
+    assert "event_moves.event_id = events.id" in sql
+    assert "event_moves.change_xid >= " in sql
+    assert "CAST(event_moves.location AS geometry(POINT,4326)) && ST_MakeEnvelope(" in sql
+    assert "events.change_xid < CAST(CAST(pg_snapshot_xmin(" in sql
+    assert "ORDER BY events.change_xid, events.id" in sql
+
+
+async def test_first_sync_skips_moved_and_deleted_events() -> None:
+    session = FakeSession([])
+    changes = await EventService.get_changes(session, bbox=NYC_BOX, since=None)
+    assert changes.items == [] and changes.next_token is None
+    (sql,) = session.statements
+    assert "event_moves" not in sql
+    assert "events.status != " in sql
+
+
+@pytest.fixture()
+def own_sessions(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Replace pooled read sessions with labels, recording each one opened."""
+    opened: list[str] = []
+
+    @contextlib.asynccontextmanager
+    async def fake_read_session():
+        opened.append(f"own-{len(opened)}")
+        yield opened[-1]
+
+    monkeypatch.setattr(event_service, "read_session", fake_read_session)
+    return opened
+
+
+def _fanout(monkeypatch: pytest.MonkeyPatch, fanout: int) -> None:
+    settings = Settings(DB_READ_FANOUT=fanout)
+    monkeypatch.setattr(event_service, "get_settings", lambda: settings)
+
+
+async def test_gather_reads_runs_reads_side_by_side(
+    monkeypatch: pytest.MonkeyPatch, own_sessions: list[str]
+) -> None:
+    _fanout(monkeypatch, 2)
+    both_started = asyncio.Barrier(2)
+
+    async def read(session: str) -> str:
+        await both_started.wait()  # deadlocks unless the reads overlap
+        return session
+
+    results = await asyncio.wait_for(gather_reads("request", read, read), 1)
+    assert results == ["request", "own-0"]
+
+
+async def test_gather_reads_respects_the_connection_budget(
+    monkeypatch: pytest.MonkeyPatch, own_sessions: list[str]
+) -> None:
+    _fanout(monkeypatch, 2)
+    running = peak = 0
+
+    async def read(session: str) -> str:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return session
+
+    assert await gather_reads("request", read, read, read) == ["request", "own-0", "own-1"]
+    assert peak == 2
+
+
+async def test_gather_reads_with_a_fanout_of_one_stays_on_the_request_session(
+    monkeypatch: pytest.MonkeyPatch, own_sessions: list[str]
+) -> None:
+    _fanout(monkeypatch, 1)
+
+    async def read(session: str) -> str:
+        return session
+
+    assert await gather_reads("request", read, read) == ["request", "request"]
+    assert own_sessions == []
+
+
+async def test_gather_reads_cancels_the_other_reads_on_failure(
+    monkeypatch: pytest.MonkeyPatch, own_sessions: list[str]
+) -> None:
+    _fanout(monkeypatch, 2)
+    cancelled = asyncio.Event()
+
+    async def slow(session: str) -> None:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def failing(session: str) -> None:
+        raise RuntimeError("count failed")
+
+    with pytest.raises(RuntimeError, match="count failed"):
+        await gather_reads("request", slow, failing)
+    assert cancelled.is_set()
+
+
+async def test_fanned_out_read_over_budget_is_a_503(
+    monkeypatch: pytest.MonkeyPatch, async_client: AsyncClient
+) -> None:
+    _fanout(monkeypatch, 2)
+
+    class OverBudgetSession:
+        async def execute(self, statement):
+            raise StatementTimeoutError("Read exceeded its statement_timeout")
+
+    @contextlib.asynccontextmanager
+    async def over_budget_read_session():
+        yield OverBudgetSession()
+
+    async def area_version(session, params):
+        return None, 0
+
+    monkeypatch.setattr(event_service, "read_session", over_budget_read_session)
+    monkeypatch.setattr(EventService, "get_area_version", staticmethod(area_version))
+    response = await async_client.get(
+        "/api/v1/events/nearby", params={"lat": 40.75, "lng": -73.98}
+    )
+    assert response.status_code == 503
+    assert "retry-after" in response.headers
+
+
+class _FullPool:
+    """A pool of *size* connections and no overflow; checkouts never wait."""
+
+    def __init__(self, size: int) -> None:
+        self.free = size
+
+    def checkout(self) -> None:
+        if not self.free:
+            raise sqlalchemy.exc.TimeoutError("QueuePool limit reached")
+        self.free -= 1
+
+    def checkin(self) -> None:
+        self.free += 1
+
+
+async def test_warm_up_primes_each_connection_without_extra_checkouts(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    _fanout(monkeypatch, 2)
+    pool = _FullPool(4)
+
+    class Connection:
+        async def start(self) -> "Connection":
+            pool.checkout()
+            return self
+
+        async def close(self) -> None:
+            pool.checkin()
+
+    class Engine:
+        def execution_options(self, **options: object) -> "Engine":
+            return self
+
+        def connect(self) -> Connection:
+            return Connection()
+
+    @contextlib.asynccontextmanager
+    async def session_on(bind: Connection):
+        yield bind
+
+    @contextlib.asynccontextmanager
+    async def pooled_read_session():
+        pool.checkout()
+        try:
+            yield "own"
+        finally:
+            pool.checkin()
+
+    monkeypatch.setattr(database, "AsyncConnection", Connection)
+    monkeypatch.setattr(database, "read_session_factory", session_on)
+    monkeypatch.setattr(event_service, "read_session", pooled_read_session)
+    primed: list[list[object]] = []
+
+    async def prepare(session: Connection) -> None:
+        async def read(own: object) -> object:
+            await asyncio.sleep(0)
+            return own
+
+        primed.append(await gather_reads(session, read, read))
+
+    await database.warm_up(Engine(), 4, prepare)
+    assert len(primed) == 4
+    assert all(first is second for first, second in primed)
+    assert pool.free == 4
+
+
+async def test_located_search_ranks_only_the_nearest_candidates(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    _fanout(monkeypatch, 1)
+    session = RecordingSession()
+    with pytest.raises(LookupError):
+        await EventService.search_events(session, query="jazz", lat=40.75, lng=-73.98)
+    (page,) = session.statements
+    candidates = page[page.index("(SELECT") : page.index(") AS candidates")]
+    assert "ST_DWithin(events.location" in candidates
+    assert "ORDER BY events.location <-> ST_GeogFromText" in candidates
+    assert "LIMIT" in candidates
+    ranking = page[page.index(") AS candidates") :]
+    assert "ORDER BY CASE WHEN (events.title ILIKE" in ranking
+    assert "power(" in ranking
+
+
+async def test_search_without_location_keeps_date_order(monkeypatch: pytest.MonkeyPatch) -> None:
+    _fanout(monkeypatch, 1)
+    session = RecordingSession()
+    with pytest.raises(LookupError):
+        await EventService.search_events(session, query="jazz")
+    (page,) = session.statements
+    assert "ORDER BY events.start_date" in page
+    assert "ST_DWithin" not in page
@@ -0,0 +1,112 @@
+"""Tests for the buffered popularity counters and the trending order."""
+
+import math
+from datetime import UTC, datetime, timedelta
+from uuid import UUID
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.dialects import postgresql
+
+from app.config import Settings
+from app.schemas.event import EventsNearbyParams
+from app.services import event_service, event_stats
+from app.services.event_service import EventService
+from app.services.event_stats import (
+    STATS_DROPPED,
+    StatsBuffer,
+    flush_statement,
+    record_ticket_click,
+    record_view,
+    trending_boost,
+)
+from tests.fakes import RecordingSession, compile_sql
+
+FIRST = UUID("00000000-0000-0000-0000-000000000001")
+SECOND = UUID("00000000-0000-0000-0000-000000000002")
+NOON = datetime(2026, 10, 19, 12, tzinfo=UTC)
+
+
+def test_buffer_accumulates_until_drained() -> None:
+    buffer = StatsBuffer()
+    buffer.add(FIRST, views=1)
+    buffer.add(FIRST, views=1)
+    buffer.add(SECOND, ticket_clicks=1)
+    assert buffer.drain() == {FIRST: [2, 0], SECOND: [0, 1]}
+    assert len(buffer) == 0
+
+
+def test_failed_flush_counts_are_restored() -> None:
+    buffer = StatsBuffer()
+    buffer.add(FIRST, views=3)
+    counts = buffer.drain()
+    buffer.add(FIRST, views=1)
+    buffer.restore(counts)
+    assert buffer.drain() == {FIRST: [4, 0]}
+
+
+def test_full_buffer_drops_new_events_only() -> None:
+    buffer = StatsBuffer(max_events=1)
+    dropped = STATS_DROPPED.value()
+    buffer.add(FIRST, views=1)
+    buffer.add(SECOND, views=1)
+    buffer.add(FIRST, views=1)
+    assert buffer.drain() == {FIRST: [2, 0]}
+    assert STATS_DROPPED.value() == dropped + 1
+
+
+def test_recording_is_a_no_op_without_a_flusher(monkeypatch: pytest.MonkeyPatch) -> None:
+    record_view(FIRST)  # no buffer installed: nothing to check, nothing raised
+    buffer = StatsBuffer()
+    monkeypatch.setattr(event_stats, "_buffer", buffer)
+    record_view(FIRST)
+    record_ticket_click(FIRST)
+    assert buffer.drain() == {FIRST: [1, 1]}
+
+
+def test_trending_weight_doubles_every_half_life() -> None:
+    now = trending_boost(1, 0, NOON, half_life_hours=24)
+    later = trending_boost(1, 0, NOON + timedelta(hours=24), half_life_hours=24)
+    assert later - now == pytest.approx(math.log(2))
+    # A ticket click outweighs a view made at the same time.
+    assert trending_boost(0, 1, NOON, 24) > now
+
+
+def test_flush_is_one_batched_upsert() -> None:
+    sql = compile_sql(flush_statement({SECOND: [1, 0], FIRST: [2, 1]}, NOON, 24))
+    assert sql.count("INSERT INTO event_stats") == 1
+    assert "FROM unnest(CAST(%(event_ids)s AS UUID[])" in sql
+    assert "JOIN events ON events.id = batch.event_id" in sql
+    assert "ORDER BY batch.event_id" in sql
+    assert "ON CONFLICT (event_id) DO UPDATE" in sql
+    assert "event_stats.views + excluded.views" in sql
+
+
+def test_flush_binds_one_array_per_column_whatever_the_batch_size() -> None:
+    # asyncpg accepts at most 32767 bind parameters per statement.
+    counts = {UUID(int=n): [1, 0] for n in range(1, 10_001)}
+    compiled = flush_statement(counts, NOON, 24).compile(dialect=postgresql.dialect())
+    batch = {name: compiled.params[name] for name in ("event_ids", "views", "ticket_clicks")}
+    assert len(compiled.params) < 10
+    assert batch["event_ids"] == list(counts)
+    assert len(batch["views"]) == len(batch["ticket_clicks"]) == 10_000
+    assert str(compiled) == str(
+        flush_statement({FIRST: [1, 0]}, NOON, 24).compile(dialect=postgresql.dialect())
+    )
+
+
+async def test_trending_sort_orders_by_the_stored_score(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(event_service, "get_settings", lambda: Settings(DB_READ_FANOUT=1))
+    session = RecordingSession()
+    params = EventsNearbyParams(lat=40.75, lng=-73.98, sort="trending")
+    with pytest.raises(LookupError):
+        await EventService.get_nearby_events(session, params)
+    (page,) = session.statements
+    assert "LEFT OUTER JOIN event_stats" in page
+    assert "ORDER BY event_stats.trending DESC NULLS LAST" in page
+
+
+@pytest.mark.asyncio
+async def test_ticket_click_is_accepted_without_a_database(async_client: AsyncClient) -> None:
+    response = await async_client.post(f"/api/v1/events/{FIRST}/ticket-click")
+    assert response.status_code == 204
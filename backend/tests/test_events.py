@@ -63,6 +63,13 @@ async def test_search_requires_query(async_client: AsyncClient) -> None:
     assert response.status_code == 422
 
 
+@pytest.mark.asyncio
+async def test_search_requires_both_coordinates(async_client: AsyncClient) -> None:
+    """A search location needs lat and lng together."""
+    response = await async_client.get("/api/v1/events/search", params={"q": "jazz", "lat": 40.75})
+    assert response.status_code == 422
+
+
 # ---------------------------------------------------------------------------
 # GET /api/v1/events/{id}
 # ---------------------------------------------------------------------------
@@ -108,3 +115,137 @@ async def test_delete_event_requires_auth(async_client: AsyncClient) -> None:
         "/api/v1/events/00000000-0000-0000-0000-000000000001"
     )
     assert response.status_code in (401, 403)
+
+
+# ---------------------------------------------------------------------------
+# bbox (viewport) mode
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_bubbles_rejects_malformed_bbox(async_client: AsyncClient) -> None:
+    """A bbox without four numbers should return 422."""
+    response = await async_client.get("/api/v1/events/bubbles", params={"bbox": "1,2,3"})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_bubbles_rejects_inverted_latitudes(async_client: AsyncClient) -> None:
+    """minLat greater than maxLat should return 422."""
+    response = await async_client.get(
+        "/api/v1/events/bubbles", params={"bbox": "-74.0,40.8,-73.9,40.7"}
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_nearby_rejects_bbox_too_large_for_zoom(async_client: AsyncClient) -> None:
+    """A continent-sized box at street zoom should return 422."""
+    response = await async_client.get(
+        "/api/v1/events/nearby", params={"bbox": "-120,30,-70,45", "zoom": 15}
+    )
+    assert response.status_code == 422
+    assert "too large" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_nearby_min_results_requires_center(async_client: AsyncClient) -> None:
+    """min_results widens a radius, so it cannot be combined with bbox."""
+    response = await async_client.get(
+        "/api/v1/events/nearby",
+        params={"bbox": "-74.0,40.7,-73.9,40.8", "min_results": 10},
+    )
+    assert response.status_code == 422
+
+
+# ---------------------------------------------------------------------------
+# GET /api/v1/events/facets
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_facets_requires_location(async_client: AsyncClient) -> None:
+    """Facets need a center or a bbox."""
+    response = await async_client.get("/api/v1/events/facets")
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_facets_rejects_unknown_time_zone(async_client: AsyncClient) -> None:
+    """An unknown IANA zone should return 422."""
+    response = await async_client.get(
+        "/api/v1/events/facets", params={"lat": 40.75, "lng": -73.98, "tz": "Mars/Olympus"}
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_nearby_rejects_when_with_explicit_dates(async_client: AsyncClient) -> None:
+    """A named time window cannot be mixed with date_from/date_to."""
+    response = await async_client.get(
+        "/api/v1/events/nearby",
+        params={"lat": 40.75, "lng": -73.98, "when": "tonight", "date_from": "2026-10-21T18:00Z"},
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_bubbles_rejects_unknown_when_preset(async_client: AsyncClient) -> None:
+    response = await async_client.get(
+        "/api/v1/events/bubbles", params={"lat": 40.75, "lng": -73.98, "when": "someday"}
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_search_rejects_too_many_tags(async_client: AsyncClient) -> None:
+    response = await async_client.get(
+        "/api/v1/events/search", params={"q": "jazz", "tags": [f"t{i}" for i in range(11)]}
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_nearby_rejects_unknown_tags_match(async_client: AsyncClient) -> None:
+    response = await async_client.get(
+        "/api/v1/events/nearby",
+        params={"lat": 40.75, "lng": -73.98, "tags": "jazz", "tags_match": "most"},
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_nearby_rejects_unlisted_metadata_key(async_client: AsyncClient) -> None:
+    response = await async_client.get(
+        "/api/v1/events/nearby",
+        params={"lat": 40.75, "lng": -73.98, "meta.internal_note": "x"},
+    )
+    assert response.status_code == 422
+    assert "meta.internal_note" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_multi_get_rejects_malformed_ids(async_client: AsyncClient) -> None:
+    response = await async_client.get("/api/v1/events", params={"ids": "not-a-uuid"})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_multi_get_limits_batch_size(async_client: AsyncClient) -> None:
+    ids = ",".join(f"00000000-0000-0000-0000-{i:012d}" for i in range(51))
+    response = await async_client.get("/api/v1/events", params={"ids": ids})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_changes_requires_bbox(async_client: AsyncClient) -> None:
+    response = await async_client.get("/api/v1/events/changes")
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_changes_rejects_malformed_token(async_client: AsyncClient) -> None:
+    response = await async_client.get(
+        "/api/v1/events/changes", params={"bbox": "-74.02,40.69,-73.91,40.82", "since": "bogus"}
+    )
+    assert response.status_code == 422
@@ -1,8 +1,11 @@
 """Tests for the health-check endpoints."""
 
 import pytest
+import sqlalchemy.exc
 from httpx import AsyncClient
 
+from app.api.deps import get_read_session
+
 
 @pytest.mark.asyncio
 async def test_health_returns_ok(async_client: AsyncClient) -> None:
@@ -25,13 +28,68 @@ async def test_health_contains_version(async_client: AsyncClient) -> None:
 
 
 @pytest.mark.asyncio
-async def test_health_ready_requires_db(async_client: AsyncClient) -> None:
+async def test_health_ready_requires_db(app, async_client: AsyncClient) -> None:
     """GET /api/v1/health/ready exercises the DB check.
 
-    In a test environment without a real DB this may return 500,
+    In a test environment without a real DB this returns 503,
     which is the expected behaviour — the probe correctly detects
     that the database is unreachable.
     """
+    app.state.db_warm = True
+    response = await async_client.get("/api/v1/health/ready")
+    # Accept either 200 (DB available) or 503 (DB unavailable in CI)
+    assert response.status_code in (200, 503)
+
+
+@pytest.mark.asyncio
+async def test_health_ready_reports_pool_timeouts_as_unavailable(
+    app, async_client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A pool checkout timing out is a 503, not a server error."""
+
+    async def ping_primary() -> None:
+        raise sqlalchemy.exc.TimeoutError("QueuePool limit reached")
+
+    app.state.db_warm = True
+    monkeypatch.setattr("app.api.v1.health.ping_primary", ping_primary)
+    response = await async_client.get("/api/v1/health/ready")
+    assert response.status_code == 503
+    assert response.json()["detail"] == "Database unreachable"
+
+
+@pytest.mark.asyncio
+async def test_health_ready_probes_the_primary_not_a_replica(
+    app, async_client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A healthy replica does not make the worker ready while the primary is down."""
+
+    class ReplicaSession:
+        async def execute(self, statement):
+            return None
+
+    async def ping_primary() -> None:
+        raise OSError("connection refused")
+
+    app.state.db_warm = True
+    app.dependency_overrides[get_read_session] = ReplicaSession
+    monkeypatch.setattr("app.api.v1.health.ping_primary", ping_primary)
     response = await async_client.get("/api/v1/health/ready")
-    # Accept either 200 (DB available) or 500 (DB unavailable in CI)
-    assert response.status_code in (200, 500)
+    assert response.status_code == 503
+
+
+@pytest.mark.asyncio
+async def test_health_ready_waits_for_warmup(app, async_client: AsyncClient) -> None:
+    """Readiness should report 503 until the startup warmup has finished."""
+    app.state.db_warm = False
+    response = await async_client.get("/api/v1/health/ready")
+    assert response.status_code == 503
+    assert response.json()["detail"] == "Database warmup in progress"
+
+
+@pytest.mark.asyncio
+async def test_metrics_are_exposed_as_prometheus_text(async_client: AsyncClient) -> None:
+    """GET /api/v1/health/metrics should list the coalescing counter."""
+    response = await async_client.get("/api/v1/health/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE eventbuzz_single_flight_calls_total counter" in response.text
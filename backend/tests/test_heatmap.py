@@ -0,0 +1,119 @@
+"""Tests for the precomputed event heatmap."""
+
+from datetime import UTC, date, datetime
+
+import pytest
+from httpx import AsyncClient
+
+from app.models.event_heatmap import HeatmapRefresh
+from app.schemas.event import BoundingBox
+from app.services.event_service import EventService
+from app.services.heatmap import (
+    HEATMAP_LEVELS,
+    heatmap_level,
+    refresh_heatmap,
+    week_start,
+)
+from tests.fakes import FakeSession
+
+
+def _refreshed(session: FakeSession) -> bool:
+    return any("REFRESH MATERIALIZED VIEW CONCURRENTLY" in sql for sql in session.statements)
+
+
+MONDAY = datetime(2026, 10, 19, 12, tzinfo=UTC)
+
+
+async def test_refresh_runs_when_events_changed() -> None:
+    state = HeatmapRefresh(id=1, refreshed_through=MONDAY.replace(hour=9))
+    # Answers the lock, the newest updated_at, then the REFRESH itself.
+    session = FakeSession(True, MONDAY, None, row=state)
+    assert await refresh_heatmap(session)
+    assert _refreshed(session)
+    assert state.refreshed_through == MONDAY
+
+
+async def test_refresh_is_skipped_when_nothing_changed() -> None:
+    state = HeatmapRefresh(id=1, refreshed_through=MONDAY)
+    session = FakeSession(True, MONDAY, row=state)
+    assert not await refresh_heatmap(session)
+    assert not _refreshed(session)
+
+
+async def test_refresh_is_left_to_the_worker_holding_the_lock() -> None:
+    session = FakeSession(False)
+    assert not await refresh_heatmap(session)
+    assert len(session.statements) == 1
+
+
+async def test_first_refresh_creates_the_watermark() -> None:
+    session = FakeSession(True, MONDAY, None)
+    assert await refresh_heatmap(session)
+    assert session.row.refreshed_through == MONDAY
+
+
+def test_heatmap_cells_shrink_as_the_map_zooms_in() -> None:
+    sizes = [HEATMAP_LEVELS[heatmap_level(zoom)] for zoom in range(23)]
+    assert sizes == sorted(sizes, reverse=True)
+    assert sizes[0] == HEATMAP_LEVELS[0]
+    assert sizes[-1] == HEATMAP_LEVELS[-1]
+
+
+def test_week_start_is_monday() -> None:
+    assert week_start(date(2026, 10, 19)) == date(2026, 10, 19)
+    assert week_start(date(2026, 10, 25)) == date(2026, 10, 19)
+
+
+async def test_heatmap_reads_only_the_aggregate() -> None:
+    session = FakeSession([(-3699, 2037, 4)], literal_binds=True)
+    heatmap = await EventService.get_heatmap(
+        session,
+        bbox=BoundingBox.from_query("-74.1,40.6,-73.8,40.9"),
+        zoom=10,
+        week_from=date(2026, 10, 19),
+        weeks=2,
+        category_id=3,
+    )
+
+    (sql,) = session.statements
+    assert "FROM event_heatmap" in sql
+    assert "events.location" not in sql
+    assert "event_heatmap.level = 3" in sql
+    assert "event_heatmap.cell_x BETWEEN -3705 AND -3690" in sql
+    assert "event_heatmap.week < '2026-11-02'" in sql
+    assert "event_heatmap.category_id = 3" in sql
+
+    assert heatmap.cell_size == 0.02
+    (cell,) = heatmap.cells
+    assert cell.longitude == pytest.approx(-73.97)
+    assert cell.latitude == pytest.approx(40.75)
+    assert cell.count == 4
+
+
+async def test_heatmap_splits_an_antimeridian_viewport() -> None:
+    session = FakeSession([], literal_binds=True)
+    await EventService.get_heatmap(
+        session,
+        bbox=BoundingBox.from_query("170,-20,-170,0"),
+        zoom=3,
+        week_from=date(2026, 10, 19),
+    )
+    (sql,) = session.statements
+    assert "cell_x BETWEEN 85 AND 90 OR event_heatmap.cell_x BETWEEN -90 AND -85" in sql
+
+
+@pytest.mark.asyncio
+async def test_heatmap_requires_bbox_and_zoom(async_client: AsyncClient) -> None:
+    response = await async_client.get("/api/v1/events/heatmap", params={"bbox": "0,0,1,1"})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_heatmap_rejects_a_viewport_too_large_for_the_zoom(
+    async_client: AsyncClient,
+) -> None:
+    response = await async_client.get(
+        "/api/v1/events/heatmap", params={"bbox": "-20,30,20,60", "zoom": 10}
+    )
+    assert response.status_code == 422
+    assert "too large" in response.json()["detail"]
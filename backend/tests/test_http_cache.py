@@ -0,0 +1,119 @@
+"""Tests for the HTTP validator helpers."""
+
+from datetime import UTC, datetime
+
+import pytest
+from fastapi import Request, Response
+from httpx import AsyncClient
+
+from app.api.v1 import events
+from app.core.http_cache import (
+    AREA_CACHE_CONTROL,
+    is_fresh,
+    make_etag,
+    not_modified,
+    set_cache_headers,
+)
+from app.services.event_service import EventService
+
+UPDATED = datetime(2026, 10, 19, 8, 30, 15, 123456, tzinfo=UTC)
+
+
+def _request(**headers: str) -> Request:
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+def test_make_etag_is_weak_and_deterministic() -> None:
+    etag = make_etag("event", UPDATED)
+    assert etag.startswith('W/"')
+    assert etag == make_etag("event", UPDATED)
+    assert etag != make_etag("event", UPDATED.replace(microsecond=0))
+
+
+def test_if_none_match_compares_weakly_and_accepts_lists() -> None:
+    etag = make_etag("event", UPDATED)
+    strong = etag.removeprefix("W/")
+    assert is_fresh(_request(if_none_match=etag), etag)
+    assert is_fresh(_request(if_none_match=f'"other", {strong}'), etag)
+    assert is_fresh(_request(if_none_match="*"), etag)
+    assert not is_fresh(_request(if_none_match='"other"'), etag)
+    assert not is_fresh(_request(), etag)
+
+
+def test_if_modified_since_is_ignored_when_if_none_match_is_sent() -> None:
+    etag = make_etag("event", UPDATED)
+    since = "Mon, 19 Oct 2026 08:30:15 GMT"
+    assert is_fresh(_request(if_modified_since=since), etag, UPDATED)
+    assert not is_fresh(_request(if_modified_since="Mon, 19 Oct 2026 08:30:14 GMT"), etag, UPDATED)
+    assert not is_fresh(_request(if_none_match='"other"', if_modified_since=since), etag, UPDATED)
+
+
+def test_if_modified_since_without_a_zone_is_utc() -> None:
+    etag = make_etag("event", UPDATED)
+    assert is_fresh(_request(if_modified_since="Mon, 19 Oct 2026 08:30:15 -0000"), etag, UPDATED)
+    assert not is_fresh(
+        _request(if_modified_since="Mon, 19 Oct 2026 08:30:14 -0000"), etag, UPDATED
+    )
+
+
+def test_not_modified_carries_validators() -> None:
+    etag = make_etag("area", UPDATED, 12)
+    response = not_modified(etag, AREA_CACHE_CONTROL, UPDATED)
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["etag"] == etag
+    assert response.headers["last-modified"] == "Mon, 19 Oct 2026 08:30:15 GMT"
+
+    response = Response()
+    set_cache_headers(response, etag, AREA_CACHE_CONTROL)
+    assert response.headers["cache-control"] == AREA_CACHE_CONTROL
+    assert "Accept-Encoding" in response.headers["vary"]
+
+
+async def test_area_lists_are_validated_by_etag_only(
+    monkeypatch: pytest.MonkeyPatch, async_client: AsyncClient
+) -> None:
+    """An event leaving the area changes the count, not the newest updated_at."""
+
+    async def coalesced_read(method, *args, **kwargs):
+        if method == EventService.get_area_version:
+            return UPDATED, 2
+        return [], 0, UPDATED
+
+    monkeypatch.setattr(events, "coalesced_read", coalesced_read)
+    response = await async_client.get(
+        "/api/v1/events/nearby",
+        params={"lat": 40.75, "lng": -73.98},
+        headers={"If-Modified-Since": "Mon, 19 Oct 2026 08:30:15 GMT"},
+    )
+    assert response.status_code == 200
+    assert "last-modified" not in response.headers
+    assert "etag" in response.headers
+
+
+async def test_area_version_is_only_queried_to_revalidate(
+    monkeypatch: pytest.MonkeyPatch, async_client: AsyncClient
+) -> None:
+    """The page's count query versions a 200; the aggregate only answers a 304."""
+    calls = []
+
+    async def coalesced_read(method, *args, **kwargs):
+        calls.append(method)
+        if method == EventService.get_area_version:
+            return UPDATED, 2
+        return [], 2, UPDATED
+
+    monkeypatch.setattr(events, "coalesced_read", coalesced_read)
+    params = {"lat": 40.75, "lng": -73.98}
+    response = await async_client.get("/api/v1/events/nearby", params=params)
+    assert response.status_code == 200
+    assert calls == [EventService.get_nearby_events]
+
+    calls.clear()
+    etag = response.headers["etag"]
+    response = await async_client.get(
+        "/api/v1/events/nearby", params=params, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert calls == [EventService.get_area_version]
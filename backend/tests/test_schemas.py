@@ -0,0 +1,98 @@
+"""Tests for query-parameter schemas."""
+
+from uuid import UUID
+
+import pytest
+
+from app.models.event import Event
+from app.schemas.event import (
+    META_FILTER_KEYS,
+    META_RANGE_KEYS,
+    BoundingBox,
+    ChangeCursor,
+    MetaFilters,
+    max_bbox_span,
+)
+
+
+def test_bbox_parses_query_string() -> None:
+    box = BoundingBox.from_query("-74.02,40.69,-73.91,40.82")
+    assert not box.crosses_antimeridian
+    assert box.envelopes() == [(-74.02, 40.69, -73.91, 40.82)]
+
+
+def test_bbox_splits_at_antimeridian() -> None:
+    box = BoundingBox.from_query("179,-17,-179,-16")
+    assert box.crosses_antimeridian
+    assert box.lng_span == pytest.approx(2.0)
+    assert box.envelopes() == [(179.0, -17.0, 180.0, -16.0), (-180.0, -17.0, -179.0, -16.0)]
+
+
+@pytest.mark.parametrize("value", ["1,2,3", "a,b,c,d", "0,0,200,1", "0,10,1,5"])
+def test_bbox_rejects_invalid_values(value: str) -> None:
+    with pytest.raises(ValueError):
+        BoundingBox.from_query(value)
+
+
+def test_max_bbox_span_shrinks_with_zoom_and_is_clamped() -> None:
+    assert max_bbox_span(12) == pytest.approx(max_bbox_span(11) / 2)
+    assert max_bbox_span(0) == max_bbox_span(8)
+
+
+def test_meta_filters_parse_typed_values_and_ranges() -> None:
+    meta = MetaFilters.from_query(
+        [
+            ("lat", "40.7"),
+            ("meta.wheelchair_accessible", "True"),
+            ("meta.language", "fr"),
+            ("meta.min_age", "18"),
+            ("meta.venue_capacity.gte", "500"),
+        ]
+    )
+    assert meta.equals == {"wheelchair_accessible": True, "language": "fr", "min_age": 18}
+    assert meta.ranges == [("venue_capacity", "gte", 500.0)]
+
+
+@pytest.mark.parametrize(
+    "item",
+    [
+        ("meta.secret", "x"),
+        ("meta.indoor", "yes"),
+        ("meta.min_age", "adult"),
+        ("meta.language.gte", "3"),
+        ("meta.min_age.between", "3"),
+    ],
+)
+def test_meta_filters_reject_unknown_keys_and_bad_values(item: tuple[str, str]) -> None:
+    with pytest.raises(ValueError):
+        MetaFilters.from_query([item])
+
+
+def test_meta_range_keys_have_expression_indexes() -> None:
+    index_names = {index.name for index in Event.__table__.indexes}
+    for key in META_RANGE_KEYS:
+        assert key in META_FILTER_KEYS
+        assert f"ix_events_meta_{key}" in index_names
+
+
+def test_change_cursor_round_trips_as_opaque_token() -> None:
+    cursor = ChangeCursor(change_xid=9_876_543, id=UUID("00000000-0000-0000-0000-000000000042"))
+    token = cursor.encode()
+    assert "=" not in token and "9876543" not in token
+    assert ChangeCursor.decode(token) == cursor
+
+
+# The last one is an (updated_at, id) token of the former stream.
+@pytest.mark.parametrize(
+    "token",
+    [
+        "",
+        "not base64!",
+        "WzEsMl0",
+        "eyJhIjogMX0",
+        "WyIyMDI2LTEwLTE5VDA4OjMwOjE1KzAwOjAwIiwgIjAwMDAwMDAwLTAwMDAtMDAwMC0wMDAwLTAwMDAwMDAwMDA0MiJd",
+    ],
+)
+def test_change_cursor_rejects_malformed_tokens(token: str) -> None:
+    with pytest.raises(ValueError):
+        ChangeCursor.decode(token)
@@ -0,0 +1,34 @@
+"""Tests for the multi-worker server entry point."""
+
+from app.config import Settings
+from app.serve import available_cpus, pool_budget
+
+
+def test_available_cpus_is_positive() -> None:
+    assert available_cpus() >= 1
+
+
+def test_pool_budget_keeps_configured_sizes_when_they_fit() -> None:
+    settings = Settings(DB_POOL_SIZE=20, DB_MAX_OVERFLOW=10, DB_MAX_CONNECTIONS=100)
+    assert pool_budget(settings, 2) == (20, 10)
+
+
+def test_pool_budget_shares_connections_across_workers() -> None:
+    settings = Settings(
+        DB_POOL_SIZE=20, DB_MAX_OVERFLOW=10, DB_MAX_CONNECTIONS=80, DB_BACKGROUND_POOL_SIZE=2
+    )
+    workers = 8
+    pool_size, max_overflow = pool_budget(settings, workers)
+    assert (pool_size + max_overflow + 2) * workers <= 80
+    assert pool_size == 8
+    assert max_overflow == 0
+
+
+def test_pool_budget_leaves_room_for_workers_added_later() -> None:
+    settings = Settings(DB_MAX_CONNECTIONS=80, DB_BACKGROUND_POOL_SIZE=2, API_MAX_WORKERS=8)
+    assert pool_budget(settings, 4) == pool_budget(settings, 8) == (8, 0)
+
+
+def test_pool_budget_keeps_one_connection_per_worker() -> None:
+    settings = Settings(DB_MAX_CONNECTIONS=4)
+    assert pool_budget(settings, 16) == (1, 0)
@@ -0,0 +1,112 @@
+"""Tests for request coalescing."""
+
+import asyncio
+from datetime import UTC, datetime
+
+import pytest
+
+from app.core.single_flight import SINGLE_FLIGHT_CALLS, SingleFlight
+from app.schemas.event import EventsNearbyParams
+from app.services.event_service import _freeze
+
+
+class _Query:
+    """A fake query that blocks until released and counts its executions."""
+
+    def __init__(self, result: object = "rows") -> None:
+        self.result = result
+        self.calls = 0
+        self.cancelled = False
+        self.release = asyncio.Event()
+
+    async def __call__(self) -> object:
+        self.calls += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+async def _started() -> None:
+    # Let the tasks run up to their first await.
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+
+async def test_concurrent_calls_share_one_execution() -> None:
+    flight, query = SingleFlight("test-share"), _Query()
+    callers = [asyncio.create_task(flight.run("key", query)) for _ in range(5)]
+    other = asyncio.create_task(flight.run("other", _Query("other")))
+    await _started()
+    assert len(flight) == 2
+
+    query.release.set()
+    assert await asyncio.gather(*callers) == ["rows"] * 5
+    assert query.calls == 1
+    assert SINGLE_FLIGHT_CALLS.value(group="test-share", role="leader") == 2
+    assert SINGLE_FLIGHT_CALLS.value(group="test-share", role="follower") == 4
+    other.cancel()
+
+
+async def test_finished_calls_are_not_cached() -> None:
+    flight, query = SingleFlight("test-nocache"), _Query()
+    query.release.set()
+    assert await flight.run("key", query) == "rows"
+    assert await flight.run("key", query) == "rows"
+    assert query.calls == 2
+    assert len(flight) == 0
+
+
+async def test_exceptions_reach_every_caller() -> None:
+    flight, query = SingleFlight("test-error"), _Query(RuntimeError("db down"))
+    callers = [asyncio.create_task(flight.run("key", query)) for _ in range(3)]
+    await _started()
+    query.release.set()
+    results = await asyncio.gather(*callers, return_exceptions=True)
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert query.calls == 1
+
+
+async def test_cancelling_the_first_caller_does_not_cancel_the_others() -> None:
+    flight, query = SingleFlight("test-cancel-one"), _Query()
+    leader = asyncio.create_task(flight.run("key", query))
+    follower = asyncio.create_task(flight.run("key", query))
+    await _started()
+
+    leader.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    query.release.set()
+    assert await follower == "rows"
+    assert not query.cancelled
+
+
+async def test_execution_is_cancelled_when_every_caller_is() -> None:
+    flight, query = SingleFlight("test-cancel-all"), _Query()
+    callers = [asyncio.create_task(flight.run("key", query)) for _ in range(2)]
+    await _started()
+    for caller in callers:
+        caller.cancel()
+    await asyncio.gather(*callers, return_exceptions=True)
+    await asyncio.sleep(0)
+    assert query.cancelled
+    assert len(flight) == 0
+
+    # A later caller starts a fresh execution.
+    fresh = _Query()
+    fresh.release.set()
+    assert await flight.run("key", fresh) == "rows"
+
+
+def test_keys_normalize_equal_arguments() -> None:
+    moment = datetime(2026, 10, 19, 18, tzinfo=UTC)
+    first = EventsNearbyParams(lat=40.75, lng=-73.98, tags=["jazz"], date_from=moment)
+    second = EventsNearbyParams(lat=40.75, lng=-73.98, tags=["jazz"], date_from=moment)
+    assert _freeze((first,)) == _freeze((second,))
+    assert hash(_freeze({"bbox": None, "params": first}))
+    second.page = 2
+    assert _freeze((first,)) != _freeze((second,))
@@ -0,0 +1,212 @@
+"""Tests for the in-memory bubble snapshot (no database needed)."""
+
+import time
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from app.schemas.event import BoundingBox  # noqa: E402
+from app.services import event_service  # noqa: E402
+from app.services.snapshot import (  # noqa: E402
+    EventSnapshot,
+    SnapshotIndex,
+    SnapshotRow,
+    radius_bbox,
+    refresh_snapshot,
+)
+from tests.fakes import FakeSession  # noqa: E402
+
+NOW = datetime(2026, 10, 19, 18, tzinfo=UTC)
+NYC = (40.7580, -73.9855)
+
+
+def _row(
+    lat: float,
+    lng: float,
+    *,
+    category_id: int = 1,
+    status: str = "active",
+    start: datetime = NOW,
+    hours: float = 3,
+    event_id: uuid.UUID | None = None,
+) -> SnapshotRow:
+    return SnapshotRow(
+        id=event_id or uuid.uuid4(),
+        title="Event",
+        latitude=lat,
+        longitude=lng,
+        category_id=category_id,
+        status=status,
+        start_date=start,
+        end=start + timedelta(hours=hours),
+        updated_at=NOW,
+    )
+
+
+def _snapshot(*rows: SnapshotRow) -> EventSnapshot:
+    snapshot = EventSnapshot(
+        coverage_start=NOW - timedelta(hours=6),
+        colors={1: "#FF0000", 2: "#00FF00"},
+        max_staleness=10,
+        capacity=2,
+    )
+    snapshot.apply(rows)
+    snapshot.refreshed_at = time.monotonic()
+    return snapshot
+
+
+def _ids(bubbles) -> set[uuid.UUID]:
+    return {b.id for b in bubbles}
+
+
+def test_radius_query_uses_great_circle_distance() -> None:
+    # ~1.1 km and ~5.5 km north of Times Square.
+    near, far = _row(NYC[0] + 0.01, NYC[1]), _row(NYC[0] + 0.05, NYC[1])
+    snapshot = _snapshot(near, far)
+
+    bubbles = snapshot.query(lat=NYC[0], lng=NYC[1], radius=2000, date_from=NOW)
+    assert _ids(bubbles) == {near.id}
+    assert bubbles[0].color_hex == "#FF0000"
+    assert _ids(snapshot.query(lat=NYC[0], lng=NYC[1], radius=6000, date_from=NOW)) == {
+        near.id,
+        far.id,
+    }
+
+
+def test_bbox_query_is_exact_and_handles_the_antimeridian() -> None:
+    inside, outside = _row(40.75, -73.99), _row(40.80, -73.99)
+    east, west = _row(-17.0, 179.9), _row(-17.0, -179.9)
+    snapshot = _snapshot(inside, outside, east, west)
+
+    box = BoundingBox(min_lng=-74.0, min_lat=40.70, max_lng=-73.9, max_lat=40.78)
+    assert _ids(snapshot.query(bbox=box, date_from=NOW)) == {inside.id}
+
+    fiji = BoundingBox(min_lng=179.5, min_lat=-18, max_lng=-179.5, max_lat=-16)
+    assert _ids(snapshot.query(bbox=fiji, date_from=NOW)) == {east.id, west.id}
+
+
+def test_category_and_time_filters_match_the_sql_overlap() -> None:
+    music = _row(*NYC, category_id=2)
+    tonight = _row(*NYC, start=NOW + timedelta(hours=2))
+    tomorrow = _row(*NYC, start=NOW + timedelta(days=1))
+    snapshot = _snapshot(music, tonight, tomorrow)
+    near = {"lat": NYC[0], "lng": NYC[1], "radius": 500}
+
+    assert _ids(snapshot.query(**near, category_id=2, date_from=NOW)) == {music.id}
+    window = snapshot.query(**near, date_from=NOW, date_to=NOW + timedelta(hours=6))
+    assert _ids(window) == {music.id, tonight.id}
+    # An event ending exactly at date_from is over ([start, end) range).
+    assert music.id not in _ids(snapshot.query(**near, date_from=NOW + timedelta(hours=3)))
+    # An event starting exactly at date_to is included (inclusive window).
+    assert tomorrow.id in _ids(
+        snapshot.query(**near, date_from=NOW, date_to=NOW + timedelta(days=1))
+    )
+
+
+def test_zero_length_events_match_their_instant() -> None:
+    instant = _row(*NYC, start=NOW + timedelta(hours=1), hours=0)
+    snapshot = _snapshot(instant)
+    near = {"lat": NYC[0], "lng": NYC[1], "radius": 500}
+
+    assert len(snapshot) == 1
+    assert _ids(snapshot.query(**near, date_from=NOW + timedelta(hours=1))) == {instant.id}
+    assert _ids(snapshot.query(**near, date_from=NOW, date_to=NOW + timedelta(hours=1))) == {
+        instant.id
+    }
+    later = NOW + timedelta(hours=1, seconds=1)
+    assert not snapshot.query(**near, date_from=later)
+
+
+def test_apply_upserts_moves_and_evicts() -> None:
+    event = _row(*NYC)
+    snapshot = _snapshot(event, _row(*NYC), _row(*NYC))
+    assert len(snapshot) == 3
+    generation = snapshot.generation
+    near = {"lat": NYC[0], "lng": NYC[1], "radius": 500, "date_from": NOW}
+
+    moved = event._replace(latitude=NYC[0] + 1)
+    assert snapshot.apply([moved]) == 1
+    assert snapshot.generation > generation
+    assert event.id not in _ids(snapshot.query(**near))
+    assert event.id in _ids(snapshot.query(lat=NYC[0] + 1, lng=NYC[1], radius=500, date_from=NOW))
+
+    assert snapshot.apply([moved._replace(status="cancelled")]) == 1
+    assert len(snapshot) == 2
+    # Evicting an unknown row, or re-applying the same removal, is a no-op.
+    assert snapshot.apply([moved._replace(status="cancelled")]) == 0
+
+    # The freed slot is reused.
+    assert snapshot.apply([_row(*NYC)]) == 1
+    assert len(snapshot.query(**near)) == 3
+
+
+def test_rows_outside_the_coverage_are_not_kept() -> None:
+    ended = _row(*NYC, start=NOW - timedelta(hours=12))
+    no_range = _row(*NYC)._replace(end=None)
+    snapshot = _snapshot(ended, no_range)
+    assert len(snapshot) == 0
+
+
+def test_can_serve_requires_fresh_data_and_a_covered_window() -> None:
+    snapshot = _snapshot()
+    assert snapshot.can_serve(NOW)
+    assert not snapshot.can_serve(None)
+    assert not snapshot.can_serve(NOW - timedelta(hours=7))
+    snapshot.refreshed_at = time.monotonic() - 11
+    assert not snapshot.can_serve(NOW)
+
+
+def test_radius_bbox_wraps_and_saturates() -> None:
+    box = radius_bbox(-17.0, 179.99, 5000)
+    assert box.min_lng > 0 > box.max_lng
+    polar = radius_bbox(89.99, 0.0, 5000)
+    assert (polar.min_lng, polar.max_lng) == (-180, 180)
+
+
+async def test_refresh_applies_changes_up_to_the_horizon() -> None:
+    kept, ended = _row(*NYC), _row(*NYC, start=NOW - timedelta(days=2))
+    snapshot = _snapshot(kept)
+    snapshot.cursor, snapshot.last_modified = 700, NOW - timedelta(hours=1)
+    moved = kept._replace(latitude=NYC[0] + 1, updated_at=NOW)
+    session = FakeSession(750, [moved, ended])
+
+    assert await refresh_snapshot(session, snapshot) == 1
+    horizon, rows = session.statements
+    assert "pg_snapshot_xmin(pg_current_snapshot())" in horizon
+    assert "events.change_xid < %(change_xid_1)s::BIGINT" in rows
+    assert "events.change_xid >= %(change_xid_2)s::BIGINT" in rows
+    assert (snapshot.cursor, snapshot.last_modified) == (750, NOW)
+    assert _ids(snapshot.query(lat=NYC[0] + 1, lng=NYC[1], radius=500, date_from=NOW)) == {kept.id}
+
+
+def test_snapshot_index_requires_the_storage_side() -> None:
+    class Partial(SnapshotIndex):
+        def _age(self) -> float:
+            return 0.0
+
+    with pytest.raises(TypeError, match="_bubbles"):
+        Partial()
+
+
+async def test_get_event_bubbles_routes_to_a_serving_snapshot() -> None:
+    event = _row(*NYC)
+    snapshot = _snapshot(event)
+    event_service.set_bubble_snapshot(snapshot)
+    try:
+        filters = {"lat": NYC[0], "lng": NYC[1], "radius": 500, "date_from": NOW}
+        bubbles, watermark, count = await event_service.EventService.get_event_bubbles(
+            None, **filters
+        )
+        assert _ids(bubbles) == {event.id}
+        assert (watermark, count) == (snapshot.last_modified, 1)
+        # The version is the data's, not this worker's: a rebuilt snapshot
+        # of the same rows versions the same.
+        version = await event_service.EventService.get_bubbles_version(None, **filters)
+        event_service.set_bubble_snapshot(_snapshot(event))
+        assert await event_service.EventService.get_bubbles_version(None, **filters) == version
+        assert version == (watermark, count)
+    finally:
+        event_service.set_bubble_snapshot(None)
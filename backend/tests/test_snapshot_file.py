@@ -0,0 +1,110 @@
+"""Tests for the shared, memory-mapped bubble snapshot file."""
+
+import os
+import time
+from datetime import timedelta
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from app.schemas.event import BoundingBox  # noqa: E402
+from app.services.snapshot_file import (  # noqa: E402
+    KEEP_VERSIONS,
+    LOCK,
+    POINTER,
+    MappedSnapshot,
+    SnapshotWatcher,
+    _try_lock,
+    publish_snapshot,
+    write_snapshot,
+)
+from tests.test_snapshot import NOW, NYC, _row, _snapshot  # noqa: E402
+
+
+def _key(bubble) -> tuple:
+    return bubble.id, bubble.title, bubble.latitude, bubble.longitude, bubble.color_hex
+
+
+def test_mapped_file_answers_like_the_in_process_snapshot(tmp_path) -> None:
+    rows = [_row(NYC[0] + i * 0.003, NYC[1] - i * 0.002, category_id=1 + i % 2) for i in range(40)]
+    rows.append(_row(-17.0, 179.9)._replace(title="Café ☕"))
+    snapshot = _snapshot(*rows)
+    snapshot.last_modified = NOW
+    mapped = MappedSnapshot(write_snapshot(snapshot, tmp_path), max_staleness=10)
+
+    assert len(mapped) == len(snapshot)
+    assert (mapped.coverage_start, mapped.last_modified, mapped.colors) == (
+        snapshot.coverage_start,
+        snapshot.last_modified,
+        snapshot.colors,
+    )
+    queries = [
+        {"lat": NYC[0], "lng": NYC[1], "radius": 3000, "date_from": NOW},
+        {"lat": NYC[0], "lng": NYC[1], "radius": 9000, "category_id": 2, "date_from": NOW},
+        {
+            "bbox": BoundingBox(min_lng=179, min_lat=-18, max_lng=-179, max_lat=-16),
+            "date_from": NOW,
+        },
+        {
+            "bbox": BoundingBox(min_lng=-74.1, min_lat=40.7, max_lng=-73.9, max_lat=40.9),
+            "date_from": NOW + timedelta(hours=4),
+        },
+    ]
+    for query in queries:
+        expected = sorted(map(_key, snapshot.query(**query)))
+        assert sorted(map(_key, mapped.query(**query))) == expected
+    bubble = mapped.query(lat=-17.0, lng=179.9, radius=100, date_from=NOW)[0]
+    assert bubble.title == "Café ☕"
+    assert bubble.start_date == NOW
+
+
+def test_empty_snapshot_round_trips(tmp_path) -> None:
+    mapped = MappedSnapshot(write_snapshot(_snapshot(), tmp_path), max_staleness=10)
+    assert len(mapped) == 0
+    assert mapped.query(lat=NYC[0], lng=NYC[1], radius=5000, date_from=NOW) == []
+
+
+def test_watcher_swaps_versions_and_old_files_are_pruned(tmp_path) -> None:
+    watcher = SnapshotWatcher(tmp_path, max_staleness=10)
+    assert watcher.poll() is None
+
+    snapshot = _snapshot(_row(*NYC))
+    write_snapshot(snapshot, tmp_path)
+    first = watcher.poll()
+    assert first is not None and len(first) == 1
+    assert watcher.poll() is first
+
+    for _ in range(KEEP_VERSIONS + 1):
+        snapshot.apply([_row(*NYC)])
+        write_snapshot(snapshot, tmp_path)
+    second = watcher.poll()
+    assert second is not first and len(second) == len(snapshot)
+    assert second.generation > first.generation
+    assert len(list(tmp_path.glob("bubbles-*.snap"))) == KEEP_VERSIONS
+    # The pruned version stays readable while still mapped.
+    assert len(first.query(lat=NYC[0], lng=NYC[1], radius=500, date_from=NOW)) == 1
+
+
+async def test_unchanged_passes_only_refresh_the_heartbeat(tmp_path) -> None:
+    snapshot = _snapshot(_row(*NYC))
+    await publish_snapshot(tmp_path, snapshot, True)
+    pointer = tmp_path / POINTER
+    os.utime(pointer, (time.time() - 60, time.time() - 60))
+
+    watcher = SnapshotWatcher(tmp_path, max_staleness=10)
+    mapped = watcher.poll()
+    assert not mapped.can_serve(NOW)
+
+    await publish_snapshot(tmp_path, snapshot, False)
+    assert watcher.poll() is mapped
+    assert mapped.can_serve(NOW)
+    assert len(list(tmp_path.glob("bubbles-*.snap"))) == 1
+
+
+def test_only_one_holder_gets_the_refresher_lock(tmp_path) -> None:
+    with open(tmp_path / LOCK, "a") as first, open(tmp_path / LOCK, "a") as second:
+        assert _try_lock(first)
+        assert not _try_lock(second)
+        first.close()
+        assert _try_lock(second)
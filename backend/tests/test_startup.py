@@ -0,0 +1,22 @@
+"""Tests for import-time cost of the API entry point."""
+
+import subprocess
+import sys
+
+
+def test_importing_main_is_lazy() -> None:
+    """Importing app.main must not build the app, create engines, or load jose."""
+    code = (
+        "import sys, app.main; "
+        "assert 'asyncpg' not in sys.modules, 'engine built at import'; "
+        "assert 'jose' not in sys.modules, 'jose imported eagerly'; "
+        "assert 'app' not in vars(app.main), 'app built at import'"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_module_level_app_is_built_on_access() -> None:
+    """``uvicorn app.main:app`` keeps working through the lazy attribute."""
+    import app.main
+
+    assert app.main.app is app.main.app
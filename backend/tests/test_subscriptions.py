@@ -0,0 +1,57 @@
+"""Tests for geofenced subscription matching."""
+
+from uuid import UUID
+
+from app.models.subscription import SubscriptionMatchCursor
+from app.services.subscriptions import match_next_batch, match_statement
+from tests.fakes import FakeSession, compile_sql
+
+FIRST = UUID("00000000-0000-0000-0000-000000000001")
+SECOND = UUID("00000000-0000-0000-0000-000000000002")
+
+
+def _session(*answers: object) -> FakeSession:
+    """Answers the matcher's statements in order, from cursor ``(700, FIRST)``."""
+    return FakeSession(*answers, row=SubscriptionMatchCursor(id=1, change_xid=700, event_id=FIRST))
+
+
+def test_match_is_one_index_assisted_spatial_join() -> None:
+    sql = compile_sql(match_statement([FIRST, SECOND]))
+    assert sql.startswith("INSERT INTO notification_queue (subscription_id, event_id) SELECT")
+    assert "subscriptions.area && CAST(events.location AS geometry(POINT,4326))" in sql
+    assert "ST_DWithin(subscriptions.location, events.location, subscriptions.radius_m)" in sql
+    assert "events.category_id = ANY (subscriptions.category_ids)" in sql
+    assert "ON CONFLICT (subscription_id, event_id) DO NOTHING" in sql
+
+
+async def test_batch_is_matched_and_the_cursor_advances() -> None:
+    session = _session(True, [(SECOND, 701), (FIRST, 705)], 7)
+    assert await match_next_batch(session, batch_size=10) == (2, 7)
+    assert "LIMIT" in session.statements[1]
+    assert session.statements[2].startswith("INSERT INTO notification_queue")
+    assert (session.row.change_xid, session.row.event_id) == (705, FIRST)
+
+
+async def test_batch_stops_at_transactions_still_running() -> None:
+    session = _session(True, [])
+    await match_next_batch(session, batch_size=10)
+    sql = session.statements[1]
+    assert "WHERE (events.change_xid, events.id) > (" in sql
+    assert (
+        "events.change_xid < CAST(CAST(pg_snapshot_xmin(pg_current_snapshot()) AS TEXT) AS BIGINT)"
+        in sql
+    )
+    assert "ORDER BY events.change_xid, events.id" in sql
+
+
+async def test_nothing_new_leaves_the_cursor_alone() -> None:
+    session = _session(True, [])
+    assert await match_next_batch(session, batch_size=10) == (0, 0)
+    assert len(session.statements) == 2
+    assert session.row.change_xid == 700
+
+
+async def test_batch_is_left_to_the_worker_holding_the_lock() -> None:
+    session = _session(False)
+    assert await match_next_batch(session, batch_size=10) == (0, 0)
+    assert len(session.statements) == 1